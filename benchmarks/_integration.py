@@ -0,0 +1,16 @@
+"""Make the integration modules and test helpers importable from the benchmarks."""
+
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, 'fixtures', 'rss_en-GB.xml')
+
+# The stand-in session and feed harness of the tests
+sys.path.insert(0, ROOT)
+
+# Load the integration modules without running its Home Assistant setup code
+package = types.ModuleType('fmi_weather_warnings')
+package.__path__ = [os.path.join(ROOT, 'custom_components', 'fmi_weather_warnings')]
+sys.modules.setdefault('fmi_weather_warnings', package)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Measure the sensor attribute payload size in each attribute mode.
+
+Builds the attributes for the recorded feed fixture, scaled up by repeating
+its items, and reports the JSON size the recorder would store per state.
+
+Usage: python benchmarks/bench_attributes.py [repeat ...]
+"""
+
+import json
+import sys
+import time
+
+from _integration import FIXTURE
+from fmi_weather_warnings.attributes import attribute_fields, build_attributes
+from fmi_weather_warnings.const import ATTRIBUTE_MODES
+from fmi_weather_warnings.rss import parse_feed
+
+
+def scaled_feed(repeat):
+    """Return the fixture with its items repeated ``repeat`` times."""
+    with open(FIXTURE, 'rb') as fixture:
+        content = fixture.read()
+    head, _, rest = content.partition(b'<item>')
+    items, _, tail = rest.rpartition(b'</item>')
+    return head + (b'<item>' + items + b'</item>') * repeat + tail
+
+
+def main(repeats):
+    """Run the benchmark for every scale factor."""
+    print(f"{'mode':<10}{'warnings':>10}{'bytes':>10}{'build ms':>10}")
+    for repeat in repeats:
+        warnings = parse_feed(scaled_feed(repeat))
+        for mode in ATTRIBUTE_MODES:
+            start = time.perf_counter()
+            payload = build_attributes(warnings, attribute_fields(mode))
+            seconds = time.perf_counter() - start
+            size = len(json.dumps(payload, ensure_ascii=False).encode())
+            print(f"{mode:<10}{len(warnings):>10}{size:>10}{seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10])
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Micro-benchmark the precompiled area matcher against the original loop.
+
+Matches a few thousand synthetic warnings for a handful of configured areas
+and reports the time per pass for both implementations, then compares one
+matcher per config entry against a single MultiAreaMatcher for all of them.
+
+Usage: python benchmarks/bench_matcher.py [warnings]
+"""
+
+import random
+import sys
+import time
+
+import _integration  # noqa: F401
+from fmi_weather_warnings.matcher import STRIP_SUFFIXES, MultiAreaMatcher
+from fmi_weather_warnings.model import Warning
+
+# Finnish case endings the original loop appended to the configured area
+APPEND_SUFFIXES = ("ssa", "ssä", "sta", "stä", "an", "än", "la", "lä")
+
+PLACES = [
+    "Uusimaa", "Helsinki", "Espoo", "Vantaa", "Turku", "Tampere", "Oulu", "Lapland",
+    "Rovaniemi", "Kuopio", "Jyväskylä", "Pirkanmaa", "Varsinais-Suomi", "Kainuu",
+]
+AREAS = ["Helsinki", "Tampereella", "Oulu", "Lappi", "Jyväskylässä"]
+ROUNDS = 5
+
+
+def synthetic_warnings(count, seed=1):
+    """Return ``count`` warnings mentioning random places."""
+    rng = random.Random(seed)
+    return [
+        Warning(
+            id=str(index),
+            title=f"Yellow wind warning for land areas: {rng.choice(PLACES)}",
+            area=rng.choice(PLACES),
+            summary=f"Wind gusts of 20-25 m/s are expected in {rng.choice(PLACES)} and {rng.choice(PLACES)}.",
+        )
+        for index in range(count)
+    ]
+
+
+def legacy_filter(area, warnings):
+    """Filter the way the coordinator loop did before the compiled matcher."""
+    result = []
+    for warning in warnings:
+        area_desc = warning.area.lower()
+        title_lower = warning.title.lower()
+        summary_lower = warning.summary.lower()
+        search_text = f"{area_desc} {title_lower} {summary_lower}"
+        if area in search_text:
+            result.append(warning)
+            continue
+        area_variants = [area]
+        for suffix in STRIP_SUFFIXES:
+            if area.endswith(suffix) and len(area) > len(suffix) + 2:
+                variant = area[:-len(suffix)]
+                if variant not in area_variants:
+                    area_variants.append(variant)
+        for suffix in APPEND_SUFFIXES:
+            variant = area + suffix
+            if variant not in area_variants:
+                area_variants.append(variant)
+        if any(variant in search_text for variant in area_variants):
+            result.append(warning)
+    return result
+
+
+def matcher_filter(matcher, warnings):
+    """Filter with a precompiled matcher for a single entry."""
+    return [warning for warning in warnings if matcher.match(warning)]
+
+
+def per_entry_filter(matchers, warnings):
+    """Filter the warnings once per config entry."""
+    return {entry_id: matcher_filter(matcher, warnings) for entry_id, matcher in matchers.items()}
+
+
+def best_of(func, *args):
+    """Return (best seconds, result) over ROUNDS runs."""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(count):
+    """Run the benchmark."""
+    warnings = synthetic_warnings(count)
+    print(f"{count} warnings")
+    print(f"{'area':<16}{'matched':>8}{'legacy ms':>12}{'matcher ms':>12}")
+    for area in AREAS:
+        legacy_seconds, legacy = best_of(legacy_filter, area.lower(), warnings)
+        matcher_seconds, matched = best_of(matcher_filter, MultiAreaMatcher({area: area}), warnings)
+        assert len(legacy) == len(matched)
+        print(f"{area:<16}{len(matched):>8}{legacy_seconds * 1000:>12.2f}{matcher_seconds * 1000:>12.2f}")
+
+    areas = {f"entry_{index}": PLACES[index % len(PLACES)] + ("ssa" if index >= len(PLACES) else "") for index in range(40)}
+    per_entry_seconds, _ = best_of(per_entry_filter, {entry_id: MultiAreaMatcher({entry_id: area}) for entry_id, area in areas.items()}, warnings)
+    engine_seconds, _ = best_of(MultiAreaMatcher(areas).match_all, warnings)
+    print(f"\n{len(areas)} areas: per entry {per_entry_seconds * 1000:.2f} ms, single pass {engine_seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
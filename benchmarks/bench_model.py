@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Compare the slotted Warning record against the dictionaries it replaced.
+
+Parses the recorded feed fixture, scaled up to the requested number of
+warnings, and reports the memory retained by the warning list and the time
+to build the sensor attributes of every warning, for both representations.
+
+Usage: python benchmarks/bench_model.py [warnings ...]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from enum import Enum
+
+from _integration import FIXTURE
+from fmi_weather_warnings.attributes import WARNING_ATTRIBUTES, build_warning_attributes
+from fmi_weather_warnings.model import warning_values
+from fmi_weather_warnings.rss import parse_feed
+
+ROUNDS = 5
+
+
+def scaled_feed(count):
+    """Return the fixture with its items repeated to at least ``count`` items."""
+    with open(FIXTURE, 'rb') as fixture:
+        content = fixture.read()
+    head, _, rest = content.partition(b'<item>')
+    items, _, tail = rest.rpartition(b'</item>')
+    repeat = -(-count // (items.count(b'<item>') + 1))
+    return head + (b'<item>' + items + b'</item>') * repeat + tail
+
+
+def _fresh(value):
+    """Return a value the way the dictionary parser stored it."""
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, str):
+        # Every parsed dictionary held its own copy of repeated strings
+        return (value + ' ')[:-1]
+    if isinstance(value, tuple):
+        return [_fresh(item) for item in value]
+    return value
+
+
+def parse_dicts(content):
+    """Parse the feed into mutable dictionaries like the parser used to."""
+    return [
+        {key: _fresh(value) for key, value in warning_values(warning).items()}
+        for warning in parse_feed(content)
+    ]
+
+
+def dict_attributes(warning, fields=WARNING_ATTRIBUTES):
+    """Build attributes from a dictionary the way the sensor used to."""
+    attributes = {}
+    for key, attr in fields:
+        if key in warning:
+            value = warning[key]
+            attributes[attr] = value.isoformat() if isinstance(value, datetime) else value
+    return attributes
+
+
+def retained(func, content, count):
+    """Return the bytes still allocated by the first ``count`` parsed warnings."""
+    gc.collect()
+    tracemalloc.start()
+    warnings = func(content)[:count]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, warnings
+
+
+def best_of(build, warnings):
+    """Return the best time to build the attributes of every warning."""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for warning in warnings:
+            build(warning)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(counts):
+    """Run the benchmark for every warning count."""
+    representations = [
+        ('dict', parse_dicts, dict_attributes),
+        ('Warning', parse_feed, build_warning_attributes),
+    ]
+    print(f"{'model':<10}{'warnings':>10}{'KiB':>10}{'B/warning':>11}{'attrs ms':>10}")
+    for count in counts:
+        content = scaled_feed(count)
+        for name, parse, build in representations:
+            size, warnings = retained(parse, content, count)
+            seconds = best_of(build, warnings)
+            print(
+                f"{name:<10}{len(warnings):>10}{size / 1024:>10.1f}"
+                f"{size // len(warnings):>11}{seconds * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [500])
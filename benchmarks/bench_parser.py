@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark the streaming RSS/CAP parser against feedparser.
+
+Replays the recorded feed fixture, scaled up by repeating its items, and
+reports the best parse time and the peak traced memory for each parser.
+
+Usage: python benchmarks/bench_parser.py [repeat ...]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from _integration import FIXTURE
+from fmi_weather_warnings.rss import parse_feed
+
+try:
+    import feedparser
+except ImportError:  # feedparser is only installed alongside Home Assistant
+    feedparser = None
+
+ROUNDS = 5
+
+
+def scaled_feed(repeat):
+    """Return the fixture with its items repeated ``repeat`` times."""
+    with open(FIXTURE, 'rb') as fixture:
+        content = fixture.read()
+    head, _, rest = content.partition(b'<item>')
+    items, _, tail = rest.rpartition(b'</item>')
+    return head + (b'<item>' + items + b'</item>') * repeat + tail
+
+
+def parse_with_feedparser(content):
+    """Parse with feedparser and probe the CAP fields like the fallback does."""
+    feed = feedparser.parse(content)
+    return [
+        {attr: getattr(entry, attr) for attr in dir(entry) if attr.startswith('cap_')}
+        for entry in feed.entries
+    ]
+
+
+def measure(func, content):
+    """Return (best seconds, peak bytes, item count) for parsing ``content``."""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = func(content)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(result)
+
+
+def main(repeats):
+    """Run the benchmark for every scale factor."""
+    parsers = [('stream', parse_feed)]
+    if feedparser is not None:
+        parsers.append(('feedparser', parse_with_feedparser))
+    else:
+        print('feedparser not installed, benchmarking the streaming parser only')
+
+    print(f"{'parser':<12}{'items':>8}{'bytes':>10}{'ms':>10}{'peak KiB':>10}")
+    for repeat in repeats:
+        content = scaled_feed(repeat)
+        for name, func in parsers:
+            seconds, peak, count = measure(func, content)
+            print(f"{name:<12}{count:>8}{len(content):>10}{seconds * 1000:>10.2f}{peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10, 100])
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Replay recorded and synthetic FMI feeds through the feed service.
+
+The recorded feed fixture, and synthetic feeds scaled from its items to the
+requested sizes, are served by the stand-in session of the test harness to a
+feed service with text, location and geocode entries registered, and run
+through every stage of a poll:
+
+- ``fetch``: the service's conditional GET, body read and content hash,
+  against the replayed response
+- ``pipeline``: the service's executor job, parsing the feed and matching
+  every warning for the registered entries
+- ``parse_entry``: the feedparser fallback's entry normalisation (skipped
+  when feedparser is not installed)
+- ``attributes``: building the sensor attributes of every warning
+
+For each stage the p50/p99 latency over the rounds, the throughput in items
+per second at the median and the peak traced memory of one extra round are
+written as JSON, so results of different versions can be compared with
+``--compare``.
+
+Usage: python benchmarks/bench_replay.py [--rounds N] [--output FILE]
+           [--compare BASELINE] [size ...]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import time
+import tracemalloc
+
+import pytest
+
+from _integration import FIXTURE, ROOT
+from conftest import FakeResponse, FakeSession, FakeStore, FeedHarness
+from fmi_weather_warnings.attributes import attribute_fields, build_attributes
+from fmi_weather_warnings.const import ATTRIBUTE_MODE_FULL, FMI_RSS_FEED
+from fmi_weather_warnings.pipeline import parse_entry, run_pipeline
+
+try:
+    import feedparser
+except ImportError:  # feedparser is only installed alongside Home Assistant
+    feedparser = None
+
+MANIFEST = os.path.join(ROOT, 'custom_components', 'fmi_weather_warnings', 'manifest.json')
+LANGUAGE = 'en-GB'
+FEED_URL = FMI_RSS_FEED.format(language=LANGUAGE)
+
+# Regions the synthetic warnings are spread over
+REGIONS = [
+    "Uusimaa", "Varsinais-Suomi", "Satakunta", "Kanta-Häme", "Pirkanmaa",
+    "Päijät-Häme", "Kymenlaakso", "Etelä-Karjala", "Etelä-Savo", "Pohjois-Savo",
+    "Pohjois-Karjala", "Keski-Suomi", "Etelä-Pohjanmaa", "Pohjanmaa",
+    "Keski-Pohjanmaa", "Pohjois-Pohjanmaa", "Kainuu", "Lapland", "Åland",
+]
+# Config entries matched against every warning
+AREAS = {"helsinki": "Uusimaa", "tampere": "Tampereella", "oulu": "Pohjois-Pohjanmaa",
+         "lappi": "Lappi", "everything": ""}
+LOCATIONS = {"kallio": (60.18, 24.95), "rovaniemi": (66.50, 25.73)}
+GEOCODES = {"pirkanmaa": "6", "uusimaa": "1"}
+
+ITEM_PATTERN = re.compile(rb'<item>.*?</item>', re.DOTALL)
+IDENTIFIER_PATTERN = re.compile(rb'<cap:identifier>(.*?)</cap:identifier>')
+AREA_PATTERN = re.compile(rb'<cap:areaDesc>(.*?)</cap:areaDesc>')
+
+
+def load_fixture():
+    """Return the recorded feed."""
+    with open(FIXTURE, 'rb') as fixture:
+        return fixture.read()
+
+
+def synthetic_feed(recorded, count):
+    """Return a feed of ``count`` distinct items scaled from the recorded ones.
+
+    Items are copied round-robin with a unique identifier each and their
+    area moved to the next region, so every warning is parsed and matched.
+    """
+    items = ITEM_PATTERN.findall(recorded)
+    head = recorded[:recorded.index(items[0])]
+    tail = recorded[recorded.rindex(items[-1]) + len(items[-1]):]
+    scaled = []
+    for index in range(count):
+        item = items[index % len(items)]
+        identifier = IDENTIFIER_PATTERN.search(item).group(1)
+        area = AREA_PATTERN.search(item).group(1)
+        region = REGIONS[index % len(REGIONS)].encode()
+        scaled.append(
+            item.replace(identifier, identifier + b'.%d' % index).replace(area, region)
+        )
+    return head + b'\n    '.join(scaled) + tail
+
+
+def register_entries(harness):
+    """Register the benchmarked config entries with the harness's feed service."""
+    for entry_id, area in AREAS.items():
+        harness.register(entry_id, areas=[area] if area else [])
+    for entry_id, location in LOCATIONS.items():
+        harness.register(entry_id, filter_mode='location', location=location)
+    for entry_id, geocode in GEOCODES.items():
+        harness.register(entry_id, filter_mode='geocode', geocode=geocode)
+
+
+async def fetch(harness, source):
+    """Download a feed through the feed service; return the bytes received."""
+    # Forget the previous body, so every round downloads and hashes a new one
+    source.content_hash = None
+    return await harness.feed._async_fetch_source(harness.session, source)
+
+
+def percentile(samples, fraction):
+    """Return a percentile of the samples by the nearest-rank method."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def measure(func, rounds, items):
+    """Time ``func`` over ``rounds`` runs and trace the memory of one more."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50 = percentile(samples, 0.50)
+    return {
+        'p50_ms': round(p50 * 1000, 4),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 4),
+        'items_per_s': round(items / p50) if p50 else None,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_feed(content, rounds):
+    """Return the stage results for one feed."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        harness = FeedHarness(
+            monkeypatch,
+            FakeSession({FEED_URL: [FakeResponse(body=content, headers={'ETag': '"replay"'})]}),
+            FakeStore(),
+        )
+        register_entries(harness)
+        feed = harness.feed
+        source = feed._async_source(LANGUAGE)
+        matchers = feed._matchers()
+
+        def pipeline():
+            return run_pipeline({LANGUAGE: content}, {LANGUAGE: []}, [], [], [], [], *matchers)
+
+        loop = asyncio.new_event_loop()
+        warnings = pipeline().warnings
+        count = len(warnings)
+        fields = attribute_fields(ATTRIBUTE_MODE_FULL)
+
+        stages = {
+            'fetch': lambda: loop.run_until_complete(fetch(harness, source)),
+            'pipeline': pipeline,
+        }
+        if feedparser is not None:
+            entries = feedparser.parse(content).entries
+            stages['parse_entry'] = lambda: [parse_entry(entry) for entry in entries]
+        stages['attributes'] = lambda: build_attributes(warnings, fields)
+
+        try:
+            results = {name: measure(func, rounds, count) for name, func in stages.items()}
+        finally:
+            loop.close()
+    if feedparser is None:
+        results['parse_entry'] = None
+    return {'items': count, 'bytes': len(content), 'stages': results}
+
+
+def compare(results, baseline):
+    """Print the change of each stage's p50 latency against a baseline run."""
+    print(f"{'feed':<10}{'stage':<12}{'baseline ms':>12}{'ms':>10}{'change':>9}")
+    for feed, result in results['feeds'].items():
+        base = baseline.get('feeds', {}).get(feed)
+        if base is None:
+            continue
+        for stage, current in result['stages'].items():
+            previous = base['stages'].get(stage)
+            if not current or not previous:
+                continue
+            change = current['p50_ms'] / previous['p50_ms'] - 1 if previous['p50_ms'] else 0
+            print(
+                f"{feed:<10}{stage:<12}{previous['p50_ms']:>12.3f}"
+                f"{current['p50_ms']:>10.3f}{change:>+9.0%}"
+            )
+
+
+def main():
+    """Run the benchmark and write its results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sizes', nargs='*', type=int, default=[10, 100, 1000])
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--output', help='write the JSON results to this file')
+    parser.add_argument('--compare', help='JSON results of a previous run')
+    args = parser.parse_args()
+
+    with open(MANIFEST, encoding='utf-8') as manifest:
+        version = json.load(manifest)['version']
+
+    recorded = load_fixture()
+    feeds = {'recorded': recorded}
+    feeds.update((str(size), synthetic_feed(recorded, size)) for size in args.sizes)
+    results = {
+        'version': version,
+        'python': platform.python_version(),
+        'rounds': args.rounds,
+        'feeds': {name: run_feed(content, args.rounds) for name, content in feeds.items()},
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
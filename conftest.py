@@ -0,0 +1,383 @@
+"""Shared test setup for FMI Weather Warnings."""
+
+import asyncio
+import contextlib
+import importlib.util
+import os
+import sys
+import types
+from datetime import datetime, timezone
+
+import pytest
+
+# Load the integration modules without running its Home Assistant setup code
+PACKAGE_DIR = os.path.join(os.path.dirname(__file__), 'custom_components', 'fmi_weather_warnings')
+package = types.ModuleType('fmi_weather_warnings')
+package.__path__ = [PACKAGE_DIR]
+sys.modules.setdefault('fmi_weather_warnings', package)
+
+
+def _module(name, **attributes):
+    """Register a stand-in module with the given attributes."""
+    module = sys.modules.setdefault(name, types.ModuleType(name))
+    for key, value in attributes.items():
+        setattr(module, key, value)
+    parent, _, child = name.rpartition('.')
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+def _install_home_assistant():
+    """Stand in for the parts of Home Assistant the integration modules import.
+
+    Only the names are provided; the tests patch in the helpers they drive,
+    such as the timer, the HTTP session, the store and the entity registry.
+    """
+
+    class UpdateFailed(Exception):
+        pass
+
+    class DataUpdateCoordinator:
+        def __init__(self, hass, logger, *, name, update_interval=None):
+            self.hass = hass
+            self.logger = logger
+            self.name = name
+            self.update_interval = update_interval
+            self.data = None
+            self.last_update_success = True
+            self.last_exception = None
+            self._listeners = []
+
+        def async_add_listener(self, update_callback):
+            self._listeners.append(update_callback)
+            return lambda: self._listeners.remove(update_callback)
+
+        async def async_refresh(self):
+            previous_success = self.last_update_success
+            try:
+                self.data = await self._async_update_data()
+            except Exception as err:
+                self.logger.debug("Error refreshing %s: %s", self.name, err)
+                self.last_exception = err
+                self.last_update_success = False
+            else:
+                self.last_exception = None
+                self.last_update_success = True
+            # Listeners are not told about a failure that persists
+            if self.last_update_success or previous_success:
+                for update_callback in list(self._listeners):
+                    update_callback()
+
+    class Entity:
+        hass = None
+        entity_id = None
+
+        @property
+        def unique_id(self):
+            return self._attr_unique_id
+
+    class SensorEntity(Entity):
+        @property
+        def native_value(self):
+            return self._attr_native_value
+
+    class CoordinatorEntity(Entity):
+        def __init__(self, coordinator):
+            self.coordinator = coordinator
+
+    class Names:
+        """Enum stand-in whose members are their lowercased names."""
+
+        def __getattr__(self, name):
+            return name.lower()
+
+    def unavailable(*_args, **_kwargs):
+        raise RuntimeError("patch this helper in the test")
+
+    class FlowHandler:
+        def async_show_form(self, *, step_id, data_schema=None, errors=None, **_kwargs):
+            return {'type': 'form', 'step_id': step_id, 'data_schema': data_schema, 'errors': errors}
+
+        def async_create_entry(self, *, title, data):
+            return {'type': 'create_entry', 'title': title, 'data': data}
+
+    class ConfigFlow(FlowHandler):
+        def __init_subclass__(cls, domain=None, **kwargs):
+            super().__init_subclass__(**kwargs)
+
+    _module('homeassistant')
+    _module(
+        'homeassistant.config_entries',
+        ConfigEntry=object,
+        ConfigFlow=ConfigFlow,
+        OptionsFlow=FlowHandler,
+    )
+    _module('homeassistant.data_entry_flow', FlowResult=dict)
+    _module(
+        'homeassistant.const',
+        CONF_LATITUDE='latitude',
+        CONF_LONGITUDE='longitude',
+        EntityCategory=Names(),
+        UnitOfInformation=Names(),
+        UnitOfTime=Names(),
+    )
+    _module('homeassistant.core', CALLBACK_TYPE=object, HomeAssistant=object, callback=lambda func: func)
+    _module('homeassistant.components')
+    _module(
+        'homeassistant.components.sensor',
+        SensorDeviceClass=Names(),
+        SensorEntity=SensorEntity,
+        SensorEntityDescription=types.SimpleNamespace,
+        SensorStateClass=Names(),
+    )
+    _module('homeassistant.helpers')
+    _module(
+        'homeassistant.helpers.config_validation',
+        boolean=bool,
+        latitude=float,
+        longitude=float,
+        string=str,
+    )
+    _module('homeassistant.helpers.entity', DeviceInfo=dict)
+    _module('homeassistant.helpers.entity_platform', AddEntitiesCallback=object)
+    _module(
+        'homeassistant.helpers.entity_registry',
+        async_entries_for_config_entry=unavailable,
+        async_get=unavailable,
+    )
+    _module('homeassistant.helpers.aiohttp_client', async_get_clientsession=unavailable)
+    _module('homeassistant.helpers.event', async_call_later=unavailable)
+    _module('homeassistant.helpers.storage', Store=unavailable)
+    _module(
+        'homeassistant.helpers.update_coordinator',
+        CoordinatorEntity=CoordinatorEntity,
+        DataUpdateCoordinator=DataUpdateCoordinator,
+        UpdateFailed=UpdateFailed,
+    )
+    _module('homeassistant.util')
+    _module('homeassistant.util.dt', utcnow=lambda: datetime.now(timezone.utc))
+
+
+def _install_aiohttp():
+    """Stand in for the aiohttp names the feed service imports."""
+
+    class ClientError(Exception):
+        pass
+
+    hdrs = types.SimpleNamespace(
+        ETAG='ETag',
+        IF_MODIFIED_SINCE='If-Modified-Since',
+        IF_NONE_MATCH='If-None-Match',
+        LAST_MODIFIED='Last-Modified',
+    )
+    _module('aiohttp', ClientError=ClientError, ClientSession=object, hdrs=hdrs)
+
+
+def _install_voluptuous():
+    """Stand in for the voluptuous names the config flow builds its forms with.
+
+    Schemas keep their keys, whose defaults are callables as in voluptuous,
+    and validators accept anything.
+    """
+
+    class Marker(str):
+        def __new__(cls, schema, default=None, **_kwargs):
+            marker = super().__new__(cls, schema)
+            marker.schema = schema
+            marker.default = None if default is None else (lambda: default)
+            return marker
+
+    class Optional(Marker):
+        pass
+
+    class Required(Marker):
+        pass
+
+    def validator(*_args, **_kwargs):
+        return lambda value: value
+
+    _module(
+        'voluptuous',
+        All=validator,
+        Coerce=validator,
+        In=validator,
+        Optional=Optional,
+        Range=validator,
+        Required=Required,
+        Schema=lambda schema: types.SimpleNamespace(schema=schema),
+    )
+
+
+if importlib.util.find_spec('homeassistant') is None:
+    _install_home_assistant()
+if importlib.util.find_spec('aiohttp') is None:
+    _install_aiohttp()
+if importlib.util.find_spec('voluptuous') is None:
+    _install_voluptuous()
+if importlib.util.find_spec('async_timeout') is None:
+    _module('async_timeout', timeout=lambda _delay: contextlib.nullcontext())
+
+
+class FakeResponse:
+    """A canned response of the stand-in HTTP session."""
+
+    def __init__(self, status=200, body=b"", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc):
+        return False
+
+    async def read(self):
+        return self.body
+
+
+class FakeSession:
+    """HTTP session answering each URL from a queue of responses.
+
+    The last response of a queue keeps being served once the others are used.
+    """
+
+    def __init__(self, responses=None):
+        self.responses = {url: list(queue) for url, queue in (responses or {}).items()}
+        self.requests = []
+        # Request headers, in the order of the requests
+        self.headers = []
+
+    def get(self, url, headers=None):
+        self.requests.append(url)
+        self.headers.append(dict(headers or {}))
+        queue = self.responses.get(url)
+        if not queue:
+            return FakeResponse(404)
+        response = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+
+class FakeStore:
+    """Store holding the feed snapshot in memory."""
+
+    def __init__(self, data=None):
+        self.data = data
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, _delay):
+        self.data = data_func()
+
+
+class FakeHass:
+    """Just enough of Home Assistant for the feed service and coordinators."""
+
+    def __init__(self):
+        # Fired events as (event type, data)
+        self.events = []
+        self.bus = types.SimpleNamespace(
+            async_fire=lambda event_type, data: self.events.append((event_type, data))
+        )
+
+    async def async_add_executor_job(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+class FakeCoordinator:
+    """Config entry settings the feed service reads, refreshing from the feed."""
+
+    def __init__(self, feed, entry_id="entry", **config):
+        from fmi_weather_warnings.filters import WarningFilter
+
+        self.feed = feed
+        self.entry_id = entry_id
+        self.areas = config.get("areas", [])
+        self.filter_mode = config.get("filter_mode", "text")
+        self.language = config.get("language", "en-GB")
+        self.cap_documents = config.get("cap_documents", False)
+        self.location = config.get("location")
+        self.geocode = config.get("geocode")
+        self.prefilter = WarningFilter()
+        self.min_scan_interval = 60
+        self.max_scan_interval = 900
+        self.refreshes = 0
+        self.last_exception = None
+
+    async def async_refresh(self):
+        # Like DataUpdateCoordinator, failures are recorded rather than raised
+        self.refreshes += 1
+        try:
+            await self.feed.async_get_warnings()
+        except Exception as err:
+            self.last_exception = err
+        else:
+            self.last_exception = None
+
+
+class FeedHarness:
+    """A feed service wired to a stand-in session, store and timer."""
+
+    def __init__(self, monkeypatch, session, store):
+        from fmi_weather_warnings import feed as feed_module
+
+        self.session = session
+        self.store = store
+        self.entries = {}
+        # Armed timers as [delay, callback, cancelled]
+        self.timers = []
+
+        def call_later(_hass, delay, action):
+            timer = [delay, action, False]
+            self.timers.append(timer)
+
+            def cancel():
+                timer[2] = True
+
+            return cancel
+
+        monkeypatch.setattr(feed_module, "async_call_later", call_later)
+        monkeypatch.setattr(feed_module, "async_get_clientsession", lambda _hass: session)
+        monkeypatch.setattr(feed_module, "Store", lambda _hass, _version, _key: store)
+        self.feed = feed_module.FMIFeedService(FakeHass())
+
+    def armed(self):
+        """Return the timers that have neither fired nor been cancelled."""
+        return [timer for timer in self.timers if not timer[2]]
+
+    async def fire(self):
+        """Run the single armed timer."""
+        (timer,) = self.armed()
+        timer[2] = True
+        await timer[1](datetime.now(timezone.utc))
+
+    def register(self, entry_id="entry", **config):
+        """Register a coordinator with the feed service and return it."""
+        coordinator = FakeCoordinator(self.feed, entry_id, **config)
+        self.feed.async_register(coordinator)
+        return coordinator
+
+    def add_entry(self, entry_id="entry", **data):
+        """Set up the coordinator of a config entry with the feed service."""
+        from fmi_weather_warnings.coordinator import FMIWeatherWarningsCoordinator
+
+        entry = self.entries[entry_id] = types.SimpleNamespace(
+            entry_id=entry_id, data=data, options={}
+        )
+        coordinator = FMIWeatherWarningsCoordinator(self.feed.hass, entry, self.feed)
+        self.feed.async_register(coordinator)
+        return coordinator
+
+
+@pytest.fixture
+def feed_harness(monkeypatch):
+    """Return a factory for feed services answering from a stand-in session."""
+
+    def make(responses=None, snapshot=None):
+        return FeedHarness(monkeypatch, FakeSession(responses), FakeStore(snapshot))
+
+    return make
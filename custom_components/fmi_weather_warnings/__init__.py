@@ -1,39 +1,168 @@
 """The FMI Weather Warnings integration."""
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 import logging
-from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .coordinator import FMIWeatherWarningsCoordinator
+from .attributes import DETAIL_WARNING_ATTRIBUTES, build_attributes
+from .changes import filter_change_event
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_WARNING_IDS,
+    DATA_FEED,
+    DOMAIN,
+    EVENT_WARNINGS_CHANGED,
+    SERVICE_GET_WARNING_DETAILS,
+)
+from .coordinator import FMIWeatherWarningsCoordinator, device_name
+from .feed import FMIFeedService
+from .merge import localize
+from .model import Warning
+from .places import place_index
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+GET_WARNING_DETAILS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_WARNING_IDS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+@callback
+def async_subscribe_warning_changes(
+    hass: HomeAssistant,
+    action: Callable[[dict[str, Any]], None],
+    *,
+    entry_id: str | None = None,
+    severities: Iterable[str] | None = None,
+    events: Iterable[str] | None = None,
+) -> CALLBACK_TYPE:
+    """Call ``action`` with the warning changes of interest; return the unsubscriber.
+
+    ``action`` receives the data of each ``fmi_weather_warnings_changed``
+    event, limited to one config entry, to warnings of the given CAP
+    severities and to the given event types.  Events left without any
+    warning are skipped.  ``action`` runs in the event loop.
+    """
+
+    @callback
+    def _async_handle_event(event: Event) -> None:
+        if (data := filter_change_event(event.data, entry_id, severities, events)):
+            action(data)
+
+    return hass.bus.async_listen(EVENT_WARNINGS_CHANGED, _async_handle_event)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the FMI Weather Warnings actions."""
+
+    async def async_get_warning_details(call: ServiceCall) -> ServiceResponse:
+        """Return the full text of active warnings.
+
+        Compact attribute mode keeps this text out of the recorder, so it is
+        only available on demand.
+        """
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        warning_ids = set(call.data.get(ATTR_WARNING_IDS, []))
+        warnings: dict[str, Warning] = {}
+        for key, coordinator in hass.data.get(DOMAIN, {}).items():
+            if not isinstance(coordinator, FMIWeatherWarningsCoordinator):
+                continue
+            if entry_id and key != entry_id:
+                continue
+            for warning in (*coordinator.data["warnings"], *coordinator.data["upcoming"]):
+                if not warning_ids or warning.id in warning_ids:
+                    # In the language of the first entry that has the warning
+                    warnings.setdefault(
+                        warning.id, localize(warning, coordinator.language)
+                    )
+        return build_attributes(warnings.values(), DETAIL_WARNING_ATTRIBUTES)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_WARNING_DETAILS,
+        async_get_warning_details,
+        schema=GET_WARNING_DETAILS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up FMI Weather Warnings from a config entry."""
-    coordinator = FMIWeatherWarningsCoordinator(hass, entry)
+    hass.data.setdefault(DOMAIN, {})
+    if (feed := hass.data[DOMAIN].get(DATA_FEED)) is None:
+        feed = hass.data[DOMAIN][DATA_FEED] = FMIFeedService(hass)
+    # Serve the cached warnings right away instead of waiting for the feed
+    await feed.async_load()
+    # Read the place index once per process, outside the event loop
+    await hass.async_add_executor_job(place_index)
+
+    coordinator = FMIWeatherWarningsCoordinator(hass, entry, feed)
+    feed.async_register(coordinator)
     
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        _async_release_feed(hass, coordinator)
+        raise
     
-    hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
     
     return True
 
 
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running entry instead of reloading it."""
+    coordinator: FMIWeatherWarningsCoordinator = hass.data[DOMAIN][entry.entry_id]
+    await coordinator.async_apply_options(entry)
+
+    # The device is named after the areas, which the options may change
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)}):
+        device_registry.async_update_device(device.id, name=device_name(entry))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        _async_release_feed(hass, coordinator)
     
     return unload_ok
+
+
+def _async_release_feed(
+    hass: HomeAssistant, coordinator: FMIWeatherWarningsCoordinator
+) -> None:
+    """Release the coordinator's reference on the shared feed service."""
+    if coordinator.feed.async_unregister(coordinator):
+        hass.data[DOMAIN].pop(DATA_FEED, None)
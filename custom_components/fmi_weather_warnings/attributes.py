@@ -0,0 +1,140 @@
+"""State attribute payloads for FMI Weather Warnings."""
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from .const import (
+    ATTRIBUTE_MODE_COMPACT,
+    ATTR_AREA,
+    ATTR_CERTAINTY,
+    ATTR_DESCRIPTION,
+    ATTR_EFFECTIVE,
+    ATTR_EVENT,
+    ATTR_EXPIRES,
+    ATTR_HEADLINE,
+    ATTR_ID,
+    ATTR_INSTRUCTION,
+    ATTR_SENDER,
+    ATTR_SEVERITY,
+    ATTR_URGENCY,
+)
+from .model import Warning
+
+# Warning keys copied into the state attributes, and their attribute names
+WARNING_ATTRIBUTES = (
+    ("title", "title"),
+    ("link", "link"),
+    ("published", "published"),
+    ("summary", "summary"),
+    ("event", ATTR_EVENT),
+    ("headline", ATTR_HEADLINE),
+    ("description", ATTR_DESCRIPTION),
+    ("instruction", ATTR_INSTRUCTION),
+    ("severity", ATTR_SEVERITY),
+    ("certainty", ATTR_CERTAINTY),
+    ("urgency", ATTR_URGENCY),
+    ("effective", ATTR_EFFECTIVE),
+    ("expires", ATTR_EXPIRES),
+    ("area", ATTR_AREA),
+    ("sender", ATTR_SENDER),
+)
+
+
+# Warning keys returned by the get_warning_details action
+DETAIL_WARNING_ATTRIBUTES = (("id", ATTR_ID), *WARNING_ATTRIBUTES)
+
+# Warning keys kept in compact mode; the full text is left out of the recorder
+COMPACT_WARNING_ATTRIBUTES = (
+    ("id", ATTR_ID),
+    ("severity", ATTR_SEVERITY),
+    ("event", ATTR_EVENT),
+    ("effective", ATTR_EFFECTIVE),
+    ("expires", ATTR_EXPIRES),
+)
+
+
+def build_warning_attributes(
+    warning: Warning,
+    fields: tuple[tuple[str, str], ...] = WARNING_ATTRIBUTES,
+    language: str | None = None,
+) -> dict[str, Any]:
+    """Return the state attributes of a single warning, in ``language``.
+
+    Fields the warning does not have are left out.
+    """
+    translation = warning.translations.get(language) if warning.translations else None
+    attributes = {}
+    for key, attr in fields:
+        if translation and key in translation:
+            value = translation[key]
+        else:
+            value = getattr(warning, key)
+        if value is None:
+            continue
+        if value.__class__ is not str:
+            if isinstance(value, datetime):
+                # Times are parsed once by the feed parser and shown as ISO 8601
+                value = value.isoformat()
+            elif isinstance(value, Enum):
+                value = value.value
+        attributes[attr] = value
+    return attributes
+
+
+def build_attributes(
+    warnings: Iterable[Warning],
+    fields: tuple[tuple[str, str], ...] = WARNING_ATTRIBUTES,
+    upcoming: Iterable[Warning] | None = None,
+    language: str | None = None,
+    area_counts: Mapping[str, int] | None = None,
+) -> dict[str, Any]:
+    """Return the state attributes for a list of warnings.
+
+    Warnings that are not in effect yet are listed under ``upcoming`` when given,
+    and the number of warnings for each of several areas under ``areas``.
+    """
+    attributes: dict[str, Any] = {
+        "warnings": [
+            build_warning_attributes(warning, fields, language) for warning in warnings
+        ]
+    }
+    if upcoming is not None:
+        attributes["upcoming"] = [
+            build_warning_attributes(warning, fields, language) for warning in upcoming
+        ]
+    if area_counts is not None:
+        attributes["areas"] = dict(area_counts)
+    return attributes
+
+
+def attribute_fields(attribute_mode: str) -> tuple[tuple[str, str], ...]:
+    """Return the warning fields exposed in an attribute mode."""
+    if attribute_mode == ATTRIBUTE_MODE_COMPACT:
+        return COMPACT_WARNING_ATTRIBUTES
+    return WARNING_ATTRIBUTES
+
+
+class AttributeCache:
+    """Memoize an attribute payload against a data version.
+
+    The payload is only rebuilt when the version changes; otherwise the very
+    same object is returned, so Home Assistant can skip re-serializing it.
+    """
+
+    def __init__(self, build: Callable[..., dict[str, Any]]) -> None:
+        """Initialize."""
+        self._build = build
+        self._version: Hashable | None = None
+        self._payload: dict[str, Any] | None = None
+        self.builds = 0
+
+    def get(self, version: Hashable, *args: Any) -> dict[str, Any]:
+        """Return the payload for ``version``, building it if needed."""
+        if self._payload is None or version != self._version:
+            self._payload = self._build(*args)
+            self._version = version
+            self.builds += 1
+        return self._payload
@@ -0,0 +1,145 @@
+"""Full CAP documents linked from the FMI feed."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import replace
+from typing import Any, Generic, TypeVar
+from xml.etree.ElementTree import Element, ParseError, fromstring
+
+from .model import Warning
+from .rss import parse_polygon, parse_timestamp
+
+_V = TypeVar("_V")
+
+
+class CapFormatError(ValueError):
+    """Raised when the content is not a CAP alert this parser understands."""
+
+
+def _local_name(element: Element) -> str:
+    """Return the tag of an element without its namespace."""
+    return element.tag.rpartition("}")[2]
+
+
+def _child_text(element: Element, name: str) -> str | None:
+    """Return the stripped text of the first child called ``name``."""
+    for child in element:
+        if _local_name(child) == name and child.text:
+            return child.text.strip()
+    return None
+
+
+def parse_cap_document(content: bytes) -> dict[str, Any]:
+    """Parse a CAP alert into the details missing from the RSS item.
+
+    Polygons and geocodes are collected from the areas of every ``<info>``
+    block, and the parameters of all blocks are combined with the first one
+    taking precedence.
+    """
+    try:
+        root = fromstring(content)
+    except ParseError as err:
+        raise CapFormatError(f"Invalid XML: {err}") from err
+    if _local_name(root) != "alert":
+        raise CapFormatError(f"Unexpected root element: {root.tag}")
+
+    polygons: list[tuple[tuple[float, float], ...]] = []
+    geocodes: list[str] = []
+    parameters: dict[str, str] = {}
+    languages: list[str] = []
+    expires = None
+
+    for info in root:
+        if _local_name(info) != "info":
+            continue
+        if (language := _child_text(info, "language")) and language not in languages:
+            languages.append(language)
+        if expires is None:
+            expires = parse_timestamp(_child_text(info, "expires"))
+        for child in info:
+            name = _local_name(child)
+            if name == "parameter":
+                key = _child_text(child, "valueName")
+                if key and key not in parameters:
+                    parameters[key] = _child_text(child, "value") or ""
+            elif name == "area":
+                for area_child in child:
+                    area_name = _local_name(area_child)
+                    if area_name == "polygon" and area_child.text:
+                        polygon = parse_polygon(area_child.text)
+                        if polygon and polygon not in polygons:
+                            polygons.append(polygon)
+                    elif area_name == "geocode":
+                        code = _child_text(area_child, "value")
+                        if code and code not in geocodes:
+                            geocodes.append(code)
+
+    return {
+        "polygons": polygons,
+        "geocodes": geocodes,
+        "parameters": parameters,
+        "languages": languages,
+        "expires": expires,
+    }
+
+
+def enrich_warning(warning: Warning, document: dict[str, Any]) -> Warning:
+    """Return the warning with the polygons, geocodes and parameters of a CAP document.
+
+    The enriched warning remembers the warning it was made from.  None of
+    the fields shown by config entries change, so coordinators keep the
+    warning they already have and report no update.
+    """
+    polygons = list(warning.polygons)
+    polygons.extend(
+        polygon for polygon in document["polygons"] if polygon not in polygons
+    )
+    geocodes = list(warning.geocodes)
+    geocodes.extend(code for code in document["geocodes"] if code not in geocodes)
+
+    return replace(
+        warning,
+        polygons=tuple(polygons),
+        geocodes=tuple(geocodes),
+        parameters=tuple(document["parameters"].items()) or warning.parameters,
+        derived_from=(warning,),
+    )
+
+
+class LRUCache(Generic[_V]):
+    """Size-bounded mapping that drops the least recently used entry."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize."""
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, _V] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> _V | None:
+        """Return a cached value and mark it as recently used."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: _V) -> None:
+        """Cache a value, evicting the least recently used ones if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def evict(self, predicate: Callable[[Hashable, _V], bool]) -> int:
+        """Drop every entry the predicate is true for; return how many."""
+        keys = [key for key, value in self._entries.items() if predicate(key, value)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
@@ -0,0 +1,123 @@
+"""Changes between two versions of a config entry's warnings."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .attributes import (
+    COMPACT_WARNING_ATTRIBUTES,
+    DETAIL_WARNING_ATTRIBUTES,
+    build_warning_attributes,
+)
+from .const import ATTR_EVENT, ATTR_SEVERITY, ATTRIBUTE_MODE_COMPACT
+from .model import Warning
+
+# Keys of the fmi_weather_warnings_changed event holding warning lists
+CHANGE_KEYS = ("added", "updated", "removed")
+
+
+@dataclass(frozen=True, slots=True)
+class WarningChanges:
+    """Warnings added, updated and removed since the previous refresh."""
+
+    added: list[Warning]
+    updated: list[Warning]
+    # Removed warnings as they were last seen
+    removed: list[Warning]
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.added or self.updated or self.removed)
+
+
+def diff_warnings(
+    previous: Mapping[str, Warning], current: Mapping[str, Warning]
+) -> WarningChanges:
+    """Compare two versions of the warnings, by ID.
+
+    Unchanged warnings are the same objects across refreshes, so a warning
+    counts as updated when its object differs.
+    """
+    return WarningChanges(
+        added=[warning for key, warning in current.items() if key not in previous],
+        updated=[
+            warning
+            for key, warning in current.items()
+            if key in previous and previous[key] is not warning
+        ],
+        removed=[warning for key, warning in previous.items() if key not in current],
+    )
+
+
+def same_content(warning: Warning, other: Warning, language: str | None) -> bool:
+    """Return True if both warnings show the same fields in ``language``.
+
+    Merging in the feed of another language, or enriching a warning from its
+    CAP document, makes a new record that a config entry shows unchanged.
+    """
+    return build_warning_attributes(
+        warning, DETAIL_WARNING_ATTRIBUTES, language
+    ) == build_warning_attributes(other, DETAIL_WARNING_ATTRIBUTES, language)
+
+
+def event_fields(attribute_mode: str) -> tuple[tuple[str, str], ...]:
+    """Return the warning fields carried by change events in an attribute mode.
+
+    Events are stored by the recorder like state attributes, so compact mode
+    keeps the warning text out of them too.
+    """
+    if attribute_mode == ATTRIBUTE_MODE_COMPACT:
+        return COMPACT_WARNING_ATTRIBUTES
+    return DETAIL_WARNING_ATTRIBUTES
+
+
+def change_event_data(
+    entry_id: str,
+    changes: WarningChanges,
+    fields: tuple[tuple[str, str], ...] = DETAIL_WARNING_ATTRIBUTES,
+    language: str | None = None,
+) -> dict[str, Any]:
+    """Return the data of a change event for a config entry."""
+    return {
+        "config_entry_id": entry_id,
+        **{
+            key: [
+                build_warning_attributes(warning, fields, language)
+                for warning in getattr(changes, key)
+            ]
+            for key in CHANGE_KEYS
+        },
+    }
+
+
+def filter_change_event(
+    data: Mapping[str, Any],
+    entry_id: str | None = None,
+    severities: Iterable[str] | None = None,
+    events: Iterable[str] | None = None,
+) -> dict[str, Any] | None:
+    """Return the change event data with only the warnings of interest.
+
+    ``severities`` are CAP severities such as ``Severe`` and ``events`` the
+    warning event types, compared case-insensitively in the entry's
+    language.  Returns None when no warning is left or the event is for
+    another config entry.
+    """
+    if entry_id is not None and data.get("config_entry_id") != entry_id:
+        return None
+    severities = {str(severity) for severity in severities} if severities else None
+    events = {event.casefold() for event in events} if events else None
+
+    def wanted(warning: Mapping[str, Any]) -> bool:
+        if severities is not None and warning.get(ATTR_SEVERITY) not in severities:
+            return False
+        return events is None or (warning.get(ATTR_EVENT) or "").casefold() in events
+
+    filtered = {
+        key: [warning for warning in data.get(key, []) if wanted(warning)]
+        for key in CHANGE_KEYS
+    }
+    if not any(filtered.values()):
+        return None
+    return {**data, **filtered}
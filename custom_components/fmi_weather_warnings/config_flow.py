@@ -7,30 +7,100 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
-from .const import CONF_AREA, DOMAIN
+from .const import (
+    ATTRIBUTE_MODE_FULL,
+    ATTRIBUTE_MODES,
+    CONF_AREA,
+    CONF_CAP_DOCUMENTS,
+    CONF_ALLOW_EVENTS,
+    CONF_ATTRIBUTE_MODE,
+    CONF_DENY_EVENTS,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_FILTER_MODE,
+    CONF_GEOCODE,
+    CONF_LANGUAGE,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_CERTAINTY,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MIN_SEVERITY,
+    CONF_MIN_URGENCY,
+    CONF_WARNING_ENTITIES,
+    CERTAINTIES,
+    DEFAULT_LANGUAGE,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DOMAIN,
+    FILTER_MODE_GEOCODE,
+    FILTER_MODE_LOCATION,
+    FILTER_MODE_TEXT,
+    FILTER_ANY,
+    FILTER_MODES,
+    LANGUAGES,
+    SEVERITIES,
+    URGENCIES,
+)
+from .matcher import parse_areas
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _valid_scan_intervals(user_input: dict[str, Any]) -> bool:
+    """Return True if the minimum update interval is not above the maximum."""
+    return user_input.get(
+        CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+    ) <= user_input.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+
+
 class FMIWeatherWarningsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for FMI Weather Warnings."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> FMIWeatherWarningsOptionsFlow:
+        """Return the options flow."""
+        return FMIWeatherWarningsOptionsFlow(config_entry)
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._data: dict[str, Any] = {}
+
+    def _unique_id(self, base: str) -> str:
+        """Return the unique ID, telling languages other than the default apart."""
+        language = self._data.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
+        return base if language == DEFAULT_LANGUAGE else f"{base}_{language}"
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
         errors = {}
 
-        if user_input is not None:
-            # Create a unique ID based on the area (or use default if no area)
-            area = user_input.get(CONF_AREA, "all_finland")
-            await self.async_set_unique_id(f"fmi_warnings_{area.lower().replace(' ', '_')}")
+        if user_input is not None and not _valid_scan_intervals(user_input):
+            errors["base"] = "invalid_scan_interval"
+        elif user_input is not None:
+            areas = parse_areas(user_input.get(CONF_AREA))
+            user_input[CONF_AREA] = ", ".join(areas)
+            self._data = user_input
+            filter_mode = user_input.get(CONF_FILTER_MODE, FILTER_MODE_TEXT)
+            if filter_mode == FILTER_MODE_LOCATION:
+                return await self.async_step_location()
+            if filter_mode == FILTER_MODE_GEOCODE:
+                return await self.async_step_geocode()
+
+            # Create a unique ID based on the areas (or use default if no area)
+            area = "_".join(areas) or "all_finland"
+            await self.async_set_unique_id(
+                self._unique_id(f"fmi_warnings_{area.lower().replace(' ', '_')}")
+            )
             self._abort_if_unique_id_configured()
 
             return self.async_create_entry(
@@ -41,6 +111,27 @@ class FMIWeatherWarningsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         data_schema = vol.Schema(
             {
                 vol.Optional(CONF_AREA, default=""): cv.string,
+                vol.Optional(CONF_FILTER_MODE, default=FILTER_MODE_TEXT): vol.In(
+                    FILTER_MODES
+                ),
+                vol.Optional(CONF_LANGUAGE, default=DEFAULT_LANGUAGE): vol.In(LANGUAGES),
+                vol.Optional(CONF_MIN_SEVERITY, default=FILTER_ANY): vol.In(SEVERITIES),
+                vol.Optional(CONF_MIN_URGENCY, default=FILTER_ANY): vol.In(URGENCIES),
+                vol.Optional(CONF_MIN_CERTAINTY, default=FILTER_ANY): vol.In(CERTAINTIES),
+                vol.Optional(CONF_ALLOW_EVENTS, default=""): cv.string,
+                vol.Optional(CONF_DENY_EVENTS, default=""): cv.string,
+                vol.Optional(CONF_ATTRIBUTE_MODE, default=ATTRIBUTE_MODE_FULL): vol.In(
+                    ATTRIBUTE_MODES
+                ),
+                vol.Optional(CONF_WARNING_ENTITIES, default=False): cv.boolean,
+                vol.Optional(CONF_CAP_DOCUMENTS, default=False): cv.boolean,
+                vol.Optional(CONF_DIAGNOSTIC_SENSORS, default=False): cv.boolean,
+                vol.Optional(
+                    CONF_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL
+                ): vol.All(vol.Coerce(int), vol.Range(min=30)),
+                vol.Optional(
+                    CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL
+                ): vol.All(vol.Coerce(int), vol.Range(min=30)),
             }
         )
 
@@ -49,6 +140,139 @@ class FMIWeatherWarningsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=data_schema,
             errors=errors,
             description_placeholders={
-                "area_help": "Optional: Enter a location name to filter warnings (e.g., 'Helsinki', 'Uusimaa', 'Lapland', 'Turku'). The system will match variations of the name. Leave empty for all warnings in Finland."
+                "area_help": "Optional: Enter a location name to filter warnings (e.g., 'Helsinki', 'Uusimaa', 'Lapland', 'Turku'), or several separated by commas. The system will match variations of the name. Leave empty for all warnings in Finland."
             },
         )
+
+    async def async_step_location(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Filter warnings by the CAP polygons containing a point."""
+        if user_input is not None:
+            latitude = user_input[CONF_LATITUDE]
+            longitude = user_input[CONF_LONGITUDE]
+            await self.async_set_unique_id(
+                self._unique_id(f"fmi_warnings_{latitude:.4f}_{longitude:.4f}")
+            )
+            self._abort_if_unique_id_configured()
+
+            return self.async_create_entry(
+                title=f"FMI Weather Warnings - {latitude:.4f}, {longitude:.4f}",
+                data={**self._data, CONF_FILTER_MODE: FILTER_MODE_LOCATION, **user_input},
+            )
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_LATITUDE, default=self.hass.config.latitude): cv.latitude,
+                vol.Required(CONF_LONGITUDE, default=self.hass.config.longitude): cv.longitude,
+            }
+        )
+
+        return self.async_show_form(step_id="location", data_schema=data_schema)
+
+    async def async_step_geocode(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Filter warnings by a CAP geocode such as a municipality code."""
+        if user_input is not None:
+            geocode = user_input[CONF_GEOCODE].strip()
+            await self.async_set_unique_id(
+                self._unique_id(f"fmi_warnings_geocode_{geocode}")
+            )
+            self._abort_if_unique_id_configured()
+
+            return self.async_create_entry(
+                title=f"FMI Weather Warnings - {geocode}",
+                data={**self._data, CONF_FILTER_MODE: FILTER_MODE_GEOCODE, CONF_GEOCODE: geocode},
+            )
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_GEOCODE): cv.string,
+            }
+        )
+
+        return self.async_show_form(step_id="geocode", data_schema=data_schema)
+
+
+class FMIWeatherWarningsOptionsFlow(config_entries.OptionsFlow):
+    """Change the area and tuning of an entry.
+
+    The options are applied to the running entry without reloading it, so
+    only the matchers are recompiled and the warnings already fetched are
+    matched again.
+    """
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        errors = {}
+        config = {**self._entry.data, **self._entry.options}
+
+        if user_input is not None and not _valid_scan_intervals(user_input):
+            errors["base"] = "invalid_scan_interval"
+        elif user_input is not None:
+            if CONF_AREA in user_input:
+                user_input[CONF_AREA] = ", ".join(parse_areas(user_input[CONF_AREA]))
+            if CONF_GEOCODE in user_input:
+                user_input[CONF_GEOCODE] = user_input[CONF_GEOCODE].strip()
+            return self.async_create_entry(title="", data=user_input)
+
+        # The filter mode decides which area setting there is to change
+        filter_mode = config.get(CONF_FILTER_MODE, FILTER_MODE_TEXT)
+        if filter_mode == FILTER_MODE_LOCATION:
+            area_schema = {
+                vol.Required(CONF_LATITUDE, default=config[CONF_LATITUDE]): cv.latitude,
+                vol.Required(CONF_LONGITUDE, default=config[CONF_LONGITUDE]): cv.longitude,
+            }
+        elif filter_mode == FILTER_MODE_GEOCODE:
+            area_schema = {
+                vol.Required(CONF_GEOCODE, default=config[CONF_GEOCODE]): cv.string,
+            }
+        else:
+            area_schema = {
+                vol.Optional(CONF_AREA, default=config.get(CONF_AREA, "")): cv.string,
+            }
+
+        data_schema = vol.Schema(
+            {
+                **area_schema,
+                vol.Optional(
+                    CONF_LANGUAGE, default=config.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
+                ): vol.In(LANGUAGES),
+                vol.Optional(
+                    CONF_MIN_SEVERITY, default=config.get(CONF_MIN_SEVERITY, FILTER_ANY)
+                ): vol.In(SEVERITIES),
+                vol.Optional(
+                    CONF_MIN_URGENCY, default=config.get(CONF_MIN_URGENCY, FILTER_ANY)
+                ): vol.In(URGENCIES),
+                vol.Optional(
+                    CONF_MIN_CERTAINTY, default=config.get(CONF_MIN_CERTAINTY, FILTER_ANY)
+                ): vol.In(CERTAINTIES),
+                vol.Optional(
+                    CONF_ALLOW_EVENTS, default=config.get(CONF_ALLOW_EVENTS, "")
+                ): cv.string,
+                vol.Optional(
+                    CONF_DENY_EVENTS, default=config.get(CONF_DENY_EVENTS, "")
+                ): cv.string,
+                vol.Optional(
+                    CONF_ATTRIBUTE_MODE,
+                    default=config.get(CONF_ATTRIBUTE_MODE, ATTRIBUTE_MODE_FULL),
+                ): vol.In(ATTRIBUTE_MODES),
+                vol.Optional(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=config.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30)),
+                vol.Optional(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=config.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30)),
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=data_schema, errors=errors)
@@ -2,12 +2,75 @@
 
 DOMAIN = "fmi_weather_warnings"
 
+DATA_FEED = "feed"
+
+STORAGE_KEY = f"{DOMAIN}.feed"
+STORAGE_VERSION = 1
+
 CONF_AREA = "area"
+CONF_FILTER_MODE = "filter_mode"
+CONF_GEOCODE = "geocode"
+CONF_ATTRIBUTE_MODE = "attribute_mode"
+CONF_WARNING_ENTITIES = "warning_entities"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_LANGUAGE = "language"
+CONF_CAP_DOCUMENTS = "cap_documents"
+CONF_DIAGNOSTIC_SENSORS = "diagnostic_sensors"
+CONF_MIN_SEVERITY = "min_severity"
+CONF_MIN_URGENCY = "min_urgency"
+CONF_MIN_CERTAINTY = "min_certainty"
+CONF_ALLOW_EVENTS = "allow_events"
+CONF_DENY_EVENTS = "deny_events"
+
+FILTER_MODE_TEXT = "text"
+FILTER_MODE_LOCATION = "location"
+FILTER_MODE_GEOCODE = "geocode"
+FILTER_MODES = [FILTER_MODE_TEXT, FILTER_MODE_LOCATION, FILTER_MODE_GEOCODE]
+
+ATTRIBUTE_MODE_FULL = "full"
+ATTRIBUTE_MODE_COMPACT = "compact"
+ATTRIBUTE_MODES = [ATTRIBUTE_MODE_FULL, ATTRIBUTE_MODE_COMPACT]
+
+# Minimum CAP values of the warning filters, least significant first
+FILTER_ANY = "any"
+SEVERITIES = [FILTER_ANY, "Minor", "Moderate", "Severe", "Extreme"]
+URGENCIES = [FILTER_ANY, "Past", "Future", "Expected", "Immediate"]
+CERTAINTIES = [FILTER_ANY, "Unlikely", "Possible", "Likely", "Observed"]
+
+# Languages of the FMI feed, the first one is preferred for shared fields
+LANGUAGE_ENGLISH = "en-GB"
+LANGUAGE_FINNISH = "fi-FI"
+LANGUAGE_SWEDISH = "sv-FI"
+LANGUAGES = [LANGUAGE_ENGLISH, LANGUAGE_FINNISH, LANGUAGE_SWEDISH]
+DEFAULT_LANGUAGE = LANGUAGE_ENGLISH
+
+EVENT_WARNINGS_CHANGED = f"{DOMAIN}_changed"
+
+SERVICE_GET_WARNING_DETAILS = "get_warning_details"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_WARNING_IDS = "warning_ids"
 
 DEFAULT_SCAN_INTERVAL = 300  # 5 minutes
+DEFAULT_MIN_SCAN_INTERVAL = 60  # 1 minute
+DEFAULT_MAX_SCAN_INTERVAL = 900  # 15 minutes
+
+FETCH_RETRIES = 2
+FETCH_BACKOFF_BASE = 2  # seconds
+FETCH_BACKOFF_MAX = 30  # seconds
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 300  # 5 minutes
+
+CAP_DOCUMENT_CACHE_SIZE = 256
+CAP_FETCH_CONCURRENCY = 4
+CAP_FETCH_TIMEOUT = 10  # seconds
+
+SNAPSHOT_MAX_AGE = 21600  # 6 hours
+SNAPSHOT_SAVE_DELAY = 10  # seconds
 
-FMI_RSS_FEED = "https://alerts.fmi.fi/cap/feed/rss_en-GB.rss"
+FMI_RSS_FEED = "https://alerts.fmi.fi/cap/feed/rss_{language}.rss"
 
+ATTR_ID = "id"
 ATTR_AREA = "area"
 ATTR_SEVERITY = "severity"
 ATTR_EVENT = "event"
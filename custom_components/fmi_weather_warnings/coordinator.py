@@ -1,208 +1,282 @@
 """Data update coordinator for FMI Weather Warnings."""
 from __future__ import annotations
 
+import heapq
 import logging
-from datetime import timedelta
+from datetime import datetime
+from collections.abc import Mapping
 from typing import Any
 
-import async_timeout
-import feedparser
-
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
-from .const import CONF_AREA, DEFAULT_SCAN_INTERVAL, DOMAIN, FMI_RSS_FEED
+from .attributes import attribute_fields
+from .changes import change_event_data, diff_warnings, event_fields, same_content
+from .const import (
+    ATTRIBUTE_MODE_FULL,
+    CONF_AREA,
+    CONF_ATTRIBUTE_MODE,
+    CONF_CAP_DOCUMENTS,
+    CONF_FILTER_MODE,
+    CONF_GEOCODE,
+    CONF_LANGUAGE,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    DEFAULT_LANGUAGE,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_WARNINGS_CHANGED,
+    FILTER_MODE_GEOCODE,
+    FILTER_MODE_LOCATION,
+    FILTER_MODE_TEXT,
+)
+from .feed import FMIFeedService
+from .filters import warning_filter
+from .matcher import parse_areas
+from .model import Warning
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def entry_config(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the settings of a config entry, its options taking precedence."""
+    return {**entry.data, **entry.options}
+
+
+def device_name(entry: ConfigEntry) -> str:
+    """Return the name of the device of a config entry, naming its areas."""
+    area = ", ".join(parse_areas(entry_config(entry).get(CONF_AREA)))
+    return f"FMI Weather Warnings{' - ' + area if area else ''}"
+
+
+def _same_warnings(
+    warnings: list[Warning], previous: list[Warning]
+) -> bool:
+    """Return True if both lists hold the same Warning records."""
+    return len(warnings) == len(previous) and all(
+        warning is other for warning, other in zip(warnings, previous)
+    )
+
+
 class FMIWeatherWarningsCoordinator(DataUpdateCoordinator):
     """Class to manage fetching FMI weather warnings data."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, feed: FMIFeedService
+    ) -> None:
         """Initialize."""
-        self.area = entry.data.get(CONF_AREA, "").lower()
+        self.entry_id = entry.entry_id
+        self.feed = feed
+        # Bumped when the options change how warnings are presented
+        self.config_version = 0
+        self._configure(entry_config(entry))
+        self._feed_version: int | None = None
+        self._next_boundary: datetime | None = None
+        # Matched warnings by ID, split by whether they are in effect yet
+        self._active: dict[str, Warning] = {}
+        self._upcoming: dict[str, Warning] = {}
+        # Min-heaps of (time, warning ID) for expiry and for becoming effective
+        self._expiry_heap: list[tuple[datetime, str]] = []
+        self._effective_heap: list[tuple[datetime, str]] = []
+        # Bumped whenever this entry's warnings change, for memoizing consumers
+        self.warnings_version = 0
+        # Feed warnings that matched this entry on the last match
+        self.matched = 0
+        # Areas of each matched warning by its ID, with several areas
+        self._warning_areas: dict[str, frozenset[str]] = {}
         
+        # Polling is driven by the shared feed service, which refreshes
+        # every registered coordinator after each fetch and at warning
+        # boundaries.
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=None,
+        )
+
+    def _configure(self, config: Mapping[str, Any]) -> None:
+        """Read the settings of the config entry."""
+        self.areas = parse_areas(config.get(CONF_AREA))
+        self.filter_mode = config.get(CONF_FILTER_MODE, FILTER_MODE_TEXT)
+        # Several areas are counted separately, from the feed's area matches
+        self._counts_areas = self.filter_mode == FILTER_MODE_TEXT and len(self.areas) > 1
+        self.language = config.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
+        self.cap_documents = config.get(CONF_CAP_DOCUMENTS, False)
+        attribute_mode = config.get(CONF_ATTRIBUTE_MODE, ATTRIBUTE_MODE_FULL)
+        self.attribute_fields = attribute_fields(attribute_mode)
+        self.event_fields = event_fields(attribute_mode)
+        self.prefilter = warning_filter(config)
+        self.location: tuple[float, float] | None = None
+        self.geocode: str | None = None
+        if self.filter_mode == FILTER_MODE_LOCATION:
+            self.location = (config[CONF_LATITUDE], config[CONF_LONGITUDE])
+        elif self.filter_mode == FILTER_MODE_GEOCODE:
+            self.geocode = config[CONF_GEOCODE]
+        self.min_scan_interval = config.get(
+            CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+        )
+        self.max_scan_interval = config.get(
+            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+        )
+
+    async def async_apply_options(self, entry: ConfigEntry) -> None:
+        """Apply changed options without reloading the entry.
+
+        The shared feed recompiles its matchers and matches the warnings it
+        already has again; the feed is only fetched if the entry switched to
+        a language no other entry uses.  Entities stay in place and render
+        the new warnings and attributes on the refresh that follows.
+        """
+        self._configure(entry_config(entry))
+        self.config_version += 1
+        # Index the warnings again from the new matches
+        self._feed_version = None
+        self.feed.async_reconfigure()
+        await self.async_refresh()
+
+    def _async_index_warnings(self, matched: list[Warning], now: datetime) -> None:
+        """Split the matched warnings into active and upcoming heaps.
+
+        Both heaps are keyed by the time the warning next changes state, so
+        boundaries between polls only need to look at their tops.  A warning
+        that is a new record but shows the same in this entry's language
+        keeps its previous one, so it does not count as updated.
+        """
+        known = {**self._upcoming, **self._active}
+        self._active = {}
+        self._upcoming = {}
+        self._expiry_heap = []
+        self._effective_heap = []
+        self.matched = len(matched)
+        self._warning_areas = (
+            self.feed.async_areas_for(self.entry_id) if self._counts_areas else {}
         )
+        for warning in matched:
+            expires = warning.expires
+            if expires is not None and expires <= now:
+                continue
+            if (
+                (previous := known.get(warning.id)) is not None
+                and previous is not warning
+                and same_content(previous, warning, self.language)
+            ):
+                warning = previous
+            effective = warning.effective
+            if effective is not None and effective > now:
+                self._upcoming[warning.id] = warning
+                heapq.heappush(self._effective_heap, (effective, warning.id))
+            else:
+                self._active[warning.id] = warning
+            if expires is not None:
+                heapq.heappush(self._expiry_heap, (expires, warning.id))
+
+    def _async_advance(self, now: datetime) -> None:
+        """Move warnings that became effective or expired by ``now``."""
+        while self._effective_heap and self._effective_heap[0][0] <= now:
+            _, key = heapq.heappop(self._effective_heap)
+            warning = self._upcoming.pop(key, None)
+            if warning is not None:
+                self._active[key] = warning
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, key = heapq.heappop(self._expiry_heap)
+            self._active.pop(key, None)
+            self._upcoming.pop(key, None)
+
+    def _area_counts(self, warnings: list[Warning]) -> dict[str, int] | None:
+        """Return the number of active warnings concerning each configured area.
+
+        A warning concerning several areas counts for each of them, while the
+        entry's own count holds every warning once.
+        """
+        if not self._counts_areas:
+            return None
+        counts = dict.fromkeys(self.areas, 0)
+        for warning in warnings:
+            for area in self._warning_areas.get(warning.id, ()):
+                counts[area] += 1
+        return counts
+
+    def _async_next_boundary(self) -> datetime | None:
+        """Return the next time a warning becomes effective or expires."""
+        tops = [heap[0][0] for heap in (self._effective_heap, self._expiry_heap) if heap]
+        return min(tops) if tops else None
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from FMI RSS feed."""
-        try:
-            async with async_timeout.timeout(30):
-                session = async_get_clientsession(self.hass)
-                response = await session.get(FMI_RSS_FEED)
-                
-                if response.status != 200:
-                    raise UpdateFailed(f"Error fetching data: {response.status}")
-                
-                content = await response.text()
-                
-                # Parse RSS feed
-                feed = await self.hass.async_add_executor_job(
-                    feedparser.parse, content
-                )
-                
-                if not feed or not feed.entries:
-                    _LOGGER.debug("No warnings found in feed")
-                    return {"warnings": [], "active_warnings": 0}
-                
-                warnings = []
-                all_warnings = []  # Keep track of all warnings for debugging
-                
-                for entry in feed.entries:
-                    warning = self._parse_entry(entry)
-                    all_warnings.append(warning)
-                    
-                    # Filter by area if specified
-                    if self.area:
-                        area_desc = warning.get("area", "").lower()
-                        title_lower = warning.get("title", "").lower()
-                        summary_lower = warning.get("summary", "").lower()
-                        
-                        _LOGGER.debug(f"Checking area filter: configured='{self.area}', warning_area='{area_desc}', title='{warning.get('title', '')}'")
-                        
-                        # If there's no meaningful content, include the warning
-                        # This handles cases where the RSS feed doesn't have proper area fields
-                        if not area_desc and not title_lower and not summary_lower:
-                            _LOGGER.debug(f"No content found, including warning: {warning.get('title', '')}")
-                        else:
-                            # Check if the configured area matches in any of the text fields
-                            area_found = False
-                            search_text = f"{area_desc} {title_lower} {summary_lower}"
-                            
-                            # Log the search text for debugging (first 200 chars)
-                            if search_text.strip():
-                                _LOGGER.debug(f"Search text (first 200 chars): '{search_text[:200]}...'")
-                            
-                            if self.area in search_text:
-                                area_found = True
-                                _LOGGER.debug(f"Direct match found for '{self.area}'")
-                            else:
-                                # Try more flexible matching for Finnish place names
-                                # Remove common Finnish suffixes/prefixes for matching
-                                area_variants = [self.area]
-                                
-                                # Add variant without common Finnish suffixes
-                                for suffix in ['n', 'ssa', 'ssä', 'sta', 'stä', 'an', 'än', 'la', 'lä', 'lla', 'llä', 'lta', 'ltä', 'lle']:
-                                    if self.area.endswith(suffix) and len(self.area) > len(suffix) + 2:
-                                        variant = self.area[:-len(suffix)]
-                                        if variant not in area_variants:
-                                            area_variants.append(variant)
-                                
-                                # Also try adding common suffixes if the base doesn't match
-                                for suffix in ['ssa', 'ssä', 'sta', 'stä', 'an', 'än', 'la', 'lä']:
-                                    variant = self.area + suffix
-                                    if variant not in area_variants:
-                                        area_variants.append(variant)
-                                
-                                _LOGGER.debug(f"Trying area variants: {area_variants}")
-                                
-                                # Check if any variant matches
-                                for variant in area_variants:
-                                    if variant in search_text:
-                                        area_found = True
-                                        _LOGGER.debug(f"Variant match found: '{variant}'")
-                                        break
-                            
-                            if not area_found:
-                                _LOGGER.debug(f"Filtered out warning (no area match): {warning.get('title', '')}")
-                                continue
-                            else:
-                                _LOGGER.debug(f"Area match found, including: {warning.get('title', '')}")
-                    
-                    warnings.append(warning)
-                
-                _LOGGER.debug(f"Total warnings found: {len(all_warnings)}, after filtering: {len(warnings)}, configured area: '{self.area}'")
-                
-                return {
-                    "warnings": warnings,
-                    "active_warnings": len(warnings),
-                }
-                
-        except Exception as err:
-            _LOGGER.error("Error fetching FMI weather warnings: %s", err)
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
-
-    def _parse_entry(self, entry: Any) -> dict[str, Any]:
-        """Parse a single RSS entry into a warning dictionary."""
-        warning = {
-            "title": entry.get("title", ""),
-            "link": entry.get("link", ""),
-            "published": entry.get("published", ""),
-            "summary": entry.get("summary", ""),
+        """Look up the shared FMI feed warnings for the configured area."""
+        await self.feed.async_get_warnings()
+        now = dt_util.utcnow()
+
+        # The feed has not changed and no warning has started or expired since
+        # the last update, keep the filtered result
+        if (
+            self.data is not None
+            and self._feed_version == self.feed.version
+            and (self._next_boundary is None or now < self._next_boundary)
+        ):
+            if self.data["added"] or self.data["updated"] or self.data["removed"]:
+                return {**self.data, "added": set(), "updated": set(), "removed": set()}
+            return self.data
+
+        if self._feed_version != self.feed.version:
+            # Area matching for every entry has already run once in the feed service
+            self._feed_version = self.feed.version
+            self._async_index_warnings(self.feed.async_warnings_for(self.entry_id), now)
+        else:
+            # Only a boundary has passed, evaluate it locally without refetching
+            self._async_advance(now)
+        self._next_boundary = self._async_next_boundary()
+        warnings = list(self._active.values())
+        upcoming = list(self._upcoming.values())
+
+        _LOGGER.debug(
+            "Total warnings found: %d, active: %d, upcoming: %d, configured areas: %s",
+            len(self.feed.warnings),
+            len(warnings),
+            len(upcoming),
+            self.areas,
+        )
+
+        # Unchanged warnings keep the same Warning record across polls
+        previous = {
+            warning.id: warning
+            for warning in (self.data["warnings"] if self.data is not None else [])
+        }
+        changes = diff_warnings(previous, self._active)
+        added = {warning.id for warning in changes.added}
+        updated = {warning.id for warning in changes.updated}
+        removed = {warning.id for warning in changes.removed}
+
+        if changes and self.data is not None:
+            # Not fired for the warnings found by the first refresh, so a
+            # restart does not announce the current warnings again
+            self.hass.bus.async_fire(
+                EVENT_WARNINGS_CHANGED,
+                change_event_data(
+                    self.entry_id, changes, self.event_fields, self.language
+                ),
+            )
+
+        if self.data is not None and not changes:
+            # Same warnings for this entry, keep the list so consumers can skip work
+            warnings = self.data["warnings"]
+            if _same_warnings(upcoming, self.data["upcoming"]):
+                upcoming = self.data["upcoming"]
+            else:
+                self.warnings_version += 1
+        else:
+            self.warnings_version += 1
+
+        return {
+            "warnings": warnings,
+            "upcoming": upcoming,
+            "active_warnings": len(warnings),
+            "area_counts": self._area_counts(warnings),
+            "added": added,
+            "updated": updated,
+            "removed": removed,
         }
-        
-        _LOGGER.debug(f"Parsing entry: {warning['title']}")
-        
-        # Log available CAP attributes for debugging
-        cap_attrs = [attr for attr in dir(entry) if attr.startswith('cap_')]
-        if cap_attrs:
-            _LOGGER.debug(f"Available CAP attributes: {cap_attrs}")
-        
-        # Parse CAP elements if available
-        if hasattr(entry, "cap_event"):
-            warning["event"] = entry.cap_event
-        
-        if hasattr(entry, "cap_headline"):
-            warning["headline"] = entry.cap_headline
-        
-        if hasattr(entry, "cap_description"):
-            warning["description"] = entry.cap_description
-        
-        if hasattr(entry, "cap_instruction"):
-            warning["instruction"] = entry.cap_instruction
-        
-        if hasattr(entry, "cap_severity"):
-            warning["severity"] = entry.cap_severity
-        
-        if hasattr(entry, "cap_certainty"):
-            warning["certainty"] = entry.cap_certainty
-        
-        if hasattr(entry, "cap_urgency"):
-            warning["urgency"] = entry.cap_urgency
-        
-        if hasattr(entry, "cap_effective"):
-            warning["effective"] = entry.cap_effective
-        
-        if hasattr(entry, "cap_expires"):
-            warning["expires"] = entry.cap_expires
-        
-        # Handle area information from multiple sources
-        area_info = []
-        
-        if hasattr(entry, "cap_areadesc"):
-            area_info.append(entry.cap_areadesc)
-            warning["area"] = entry.cap_areadesc
-        
-        # Check for other area-related CAP fields
-        if hasattr(entry, "cap_area"):
-            area_info.append(entry.cap_area)
-        
-        if hasattr(entry, "cap_geocode"):
-            area_info.append(entry.cap_geocode)
-        
-        if hasattr(entry, "cap_sender"):
-            warning["sender"] = entry.cap_sender
-        
-        # Try to extract area from title or summary if not in CAP fields
-        if not area_info:
-            # Sometimes the area is mentioned in the title or summary
-            title_lower = warning.get("title", "").lower()
-            summary_lower = warning.get("summary", "").lower()
-            
-            # Look for common Finnish location patterns in title/summary
-            combined_text = f"{title_lower} {summary_lower}"
-            warning["area"] = combined_text
-        
-        # Combine all area information if we have multiple sources
-        if area_info:
-            warning["area"] = " ".join(str(area) for area in area_info if area)
-        
-        return warning
@@ -0,0 +1,40 @@
+"""Diagnostics support for FMI Weather Warnings."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import FMIWeatherWarningsCoordinator
+from .places import place_index
+
+TO_REDACT = {CONF_LATITUDE, CONF_LONGITUDE}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: FMIWeatherWarningsCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data or {}
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "warnings": {
+            "active": len(data.get("warnings", [])),
+            "upcoming": len(data.get("upcoming", [])),
+            "matched": coordinator.matched,
+            "areas": data.get("area_counts"),
+            # Canonical place of each configured area, None for free text
+            "places": place_index().resolve_all(coordinator.areas),
+        },
+        "prefilter": coordinator.prefilter.stats(coordinator.feed.warnings)
+        if coordinator.prefilter
+        else None,
+        "feed": coordinator.feed.async_diagnostics(),
+    }
@@ -0,0 +1,822 @@
+"""Shared FMI feed service for FMI Weather Warnings."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+import async_timeout
+
+from aiohttp import ClientError, ClientSession, hdrs
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .cap import LRUCache
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    CAP_DOCUMENT_CACHE_SIZE,
+    CAP_FETCH_CONCURRENCY,
+    CAP_FETCH_TIMEOUT,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    FETCH_BACKOFF_BASE,
+    FETCH_BACKOFF_MAX,
+    FETCH_RETRIES,
+    FILTER_MODE_TEXT,
+    FMI_RSS_FEED,
+    LANGUAGES,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .filters import MultiWarningFilter
+from .geo import GeoMatcher
+from .matcher import AreaKey, MultiAreaMatcher
+from .metrics import PollMetrics
+from .model import Warning
+from .places import place_index
+from .pipeline import (
+    CapKey,
+    PipelineResult,
+    cap_key,
+    finish_pipeline,
+    match_warnings,
+    parse_feeds,
+    run_pipeline,
+)
+from .retry import RETRYABLE_STATUSES, CircuitBreaker, async_retry
+from .scheduler import PollScheduler, next_boundary
+from .snapshot import dump_snapshot, load_snapshot
+
+if TYPE_CHECKING:
+    from .coordinator import FMIWeatherWarningsCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FeedFetchError(UpdateFailed):
+    """Raised when the feed could not be downloaded."""
+
+    def __init__(self, message: str, retryable: bool = True) -> None:
+        """Initialize."""
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _is_retryable(err: Exception) -> bool:
+    """Return True if a failed fetch is worth retrying."""
+    return isinstance(err, FeedFetchError) and err.retryable
+
+
+def _ordered(languages: Iterable[str]) -> list[str]:
+    """Return the languages with the preferred ones first."""
+    return sorted(
+        languages,
+        key=lambda language: (
+            LANGUAGES.index(language) if language in LANGUAGES else len(LANGUAGES),
+            language,
+        ),
+    )
+
+
+class FeedSource:
+    """The parsed warnings and request validators of one language feed."""
+
+    def __init__(self, language: str) -> None:
+        """Initialize."""
+        self.language = language
+        self.url = FMI_RSS_FEED.format(language=language)
+        self.warnings: list[Warning] = []
+        # Downloaded body that has not been parsed yet
+        self.content: bytes | None = None
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.content_hash: str | None = None
+
+
+class FMIFeedService:
+    """Fetch and parse the FMI feed once and share it with every config entry.
+
+    The service is stored in ``hass.data[DOMAIN]`` and reference-counted by the
+    coordinators registered with it.  It owns the single poll timer, matches
+    each warning once for all of their areas, and hands every coordinator the
+    warnings that matched its entry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        # Adapts the poll interval to how often the feed changes
+        self.scheduler = PollScheduler(
+            DEFAULT_MIN_SCAN_INTERVAL,
+            DEFAULT_MAX_SCAN_INTERVAL,
+            initial_interval=DEFAULT_SCAN_INTERVAL,
+        )
+        self.warnings: list[Warning] = []
+        self.matches: list[frozenset[str]] = []
+        self.area_matches: list[frozenset[AreaKey]] = []
+        self.version = 0
+        self.not_modified_hits = 0
+        self.hash_skip_hits = 0
+        self.cap_fetches = 0
+        self.cap_cache_hits = 0
+        self.metrics = PollMetrics()
+        # Opened by repeated fetch failures; while open no requests are made
+        # and the last known good warnings are served
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        # Wall clock time the warnings were last confirmed by the feed
+        self.fetched_at: datetime | None = None
+        # One source per language in use, fetched concurrently and merged by
+        # CAP identifier
+        self._sources: dict[str, FeedSource] = {}
+        self._languages: list[str] = []
+        # Set when a feed was parsed or the languages changed since the last merge
+        self._dirty = False
+        # Merged warnings before enrichment, reused by the next merge
+        self._merged: list[Warning] = []
+        self._enrich = False
+        # Parsed CAP documents by warning ID and fingerprint, kept until the
+        # warning expires or leaves the feed
+        self._cap_documents: LRUCache[dict[str, Any]] = LRUCache(CAP_DOCUMENT_CACHE_SIZE)
+        self._cap_semaphore = asyncio.Semaphore(CAP_FETCH_CONCURRENCY)
+        self._last_fetch: float | None = None
+        self._inflight: asyncio.Future[list[Warning]] | None = None
+        self._coordinators: list[FMIWeatherWarningsCoordinator] = []
+        # The areas, locations and filters of every registered entry, so each
+        # warning is matched once per fetch; filters are checked first so
+        # warnings no entry wants are not area matched at all
+        self._matcher = MultiAreaMatcher({})
+        self._geo_matcher = GeoMatcher({}, {})
+        self._prefilter = MultiWarningFilter({})
+        # The matchers the current matches were computed with
+        self._matched_with: (
+            tuple[MultiAreaMatcher, GeoMatcher, MultiWarningFilter] | None
+        ) = None
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        # Warnings and validators served at startup, and while the feed cannot
+        # be reached until they are older than SNAPSHOT_MAX_AGE
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._saved_at: datetime | None = None
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    @property
+    def refcount(self) -> int:
+        """Return the number of coordinators using the service."""
+        return len(self._coordinators)
+
+    async def async_load(self) -> None:
+        """Restore the warnings from the on-disk snapshot, once.
+
+        A snapshot that is recent enough is treated as fresh, so the first
+        coordinator refresh does not wait for the network.  The poll timer
+        armed by the first registration revalidates it right after.
+        """
+        async with self._load_lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if (data := await self._store.async_load()) is None:
+                return
+            if (snapshot := load_snapshot(data)) is None:
+                _LOGGER.debug("Ignoring unreadable feed snapshot")
+                return
+            if self._is_stale(snapshot["fetched_at"]):
+                _LOGGER.debug(
+                    "Ignoring feed snapshot from %s", snapshot["fetched_at"]
+                )
+                return
+
+            for language, feed in snapshot["feeds"].items():
+                source = self._async_source(language)
+                source.warnings = feed["warnings"]
+                source.etag = feed["etag"]
+                source.last_modified = feed["last_modified"]
+                source.content_hash = feed["content_hash"]
+            self._languages = _ordered(snapshot["feeds"])
+            parsed = await self.hass.async_add_executor_job(
+                parse_feeds, {}, self._feeds(), []
+            )
+            self.warnings = self._merged = parsed.merged
+            # Matched for the registered areas before the warnings are used
+            self.matches = []
+            self.area_matches = []
+            self._matched_with = None
+            self.version += 1
+            self.fetched_at = self._saved_at = snapshot["fetched_at"]
+            self._last_fetch = time.monotonic()
+            _LOGGER.debug(
+                "Restored %d warnings from %s", len(self.warnings), self.fetched_at
+            )
+
+    def _is_stale(self, fetched_at: datetime | None = None) -> bool:
+        """Return True if warnings confirmed at ``fetched_at`` are too old to serve."""
+        fetched_at = fetched_at or self.fetched_at
+        return (
+            fetched_at is None
+            or (dt_util.utcnow() - fetched_at).total_seconds() > SNAPSHOT_MAX_AGE
+        )
+
+    async def _async_fetched(self, changed: bool) -> None:
+        """Record a successful fetch and persist the warnings.
+
+        Unchanged polls only rewrite the snapshot when its timestamp is half
+        way to going stale, to keep disk writes rare.  The snapshot is
+        serialized in the executor, as the store would do it on the loop.
+        """
+        self._last_fetch = time.monotonic()
+        self.fetched_at = dt_util.utcnow()
+        if (
+            changed
+            or self._saved_at is None
+            or (self.fetched_at - self._saved_at).total_seconds() > SNAPSHOT_MAX_AGE / 2
+        ):
+            self._saved_at = self.fetched_at
+            data = await self.hass.async_add_executor_job(
+                dump_snapshot, self._snapshot_feeds(), self.fetched_at
+            )
+            self._store.async_delay_save(lambda: data, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _snapshot_feeds(self) -> dict[str, dict[str, Any]]:
+        """Return the feeds written to the on-disk snapshot."""
+        return {
+            language: {
+                "warnings": source.warnings,
+                "etag": source.etag,
+                "last_modified": source.last_modified,
+                "content_hash": source.content_hash,
+            }
+            for language in self._languages
+            if (source := self._sources.get(language)) is not None
+        }
+
+    @callback
+    def async_diagnostics(self) -> dict[str, Any]:
+        """Return the fetch and cache state for diagnostics."""
+        return {
+            "version": self.version,
+            "warnings": len(self.warnings),
+            "languages": self._languages,
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+            "poll_interval": self.scheduler.interval,
+            "not_modified_hits": self.not_modified_hits,
+            "hash_skip_hits": self.hash_skip_hits,
+            "circuit_breaker": self.breaker.as_dict(),
+            "metrics": self.metrics.as_dict(),
+            "cap_documents": {
+                "enabled": self._enrich,
+                "cached": len(self._cap_documents),
+                "fetches": self.cap_fetches,
+                "cache_hits": self.cap_cache_hits,
+            },
+            "config_entries": self.refcount,
+        }
+
+    @callback
+    def async_register(self, coordinator: FMIWeatherWarningsCoordinator) -> None:
+        """Add a reference and start polling with the first one."""
+        self._coordinators.append(coordinator)
+        self._async_update_languages(prune=False)
+        self._async_update_enrichment()
+        self._async_rebuild_matcher()
+        self._async_update_bounds()
+        if self._unsub_refresh is None:
+            self._async_schedule_refresh()
+
+    @callback
+    def async_unregister(self, coordinator: FMIWeatherWarningsCoordinator) -> bool:
+        """Drop a reference; return True when the last one is gone."""
+        if coordinator in self._coordinators:
+            self._coordinators.remove(coordinator)
+        if self._coordinators:
+            self._async_update_languages(prune=True)
+            self._async_update_enrichment()
+            self._async_rebuild_matcher()
+            self._async_update_bounds()
+            return False
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+        return True
+
+    @callback
+    def async_reconfigure(self) -> None:
+        """Apply changed settings of the registered coordinators.
+
+        Only the matchers are recompiled: the current warnings are matched
+        again in the executor on the next refresh, without a fetch unless a
+        language not fetched yet is now needed.
+        """
+        self._async_update_languages(prune=True)
+        self._async_update_enrichment()
+        self._async_rebuild_matcher()
+        self._async_update_bounds()
+        if self._unsub_refresh is not None:
+            # Wake up within the new bounds
+            self._async_schedule_refresh()
+
+    @callback
+    def _async_source(self, language: str) -> FeedSource:
+        """Return the feed source of a language, creating it if needed."""
+        if (source := self._sources.get(language)) is None:
+            source = self._sources[language] = FeedSource(language)
+        return source
+
+    @callback
+    def _async_update_languages(self, prune: bool) -> None:
+        """Fetch the languages the registered coordinators need.
+
+        Languages are only dropped when a coordinator goes away, so entries
+        set up one after another keep the languages restored from the
+        snapshot.  A change makes the next refresh fetch and merge again.
+        """
+        needed = {coordinator.language for coordinator in self._coordinators}
+        if not prune:
+            needed.update(self._languages)
+        languages = _ordered(needed)
+        if languages == self._languages:
+            return
+        for language in set(self._sources) - needed:
+            del self._sources[language]
+        self._languages = languages
+        self._dirty = True
+        self._last_fetch = None
+
+    @callback
+    def _async_update_enrichment(self) -> None:
+        """Fetch CAP documents while any coordinator asks for them."""
+        enrich = any(coordinator.cap_documents for coordinator in self._coordinators)
+        if enrich and not self._enrich:
+            # Enrich the current warnings on the next refresh
+            self._dirty = True
+            self._last_fetch = None
+        elif not enrich:
+            self._cap_documents.clear()
+        self._enrich = enrich
+
+    @callback
+    def _async_rebuild_matcher(self) -> None:
+        """Recompile the matchers and filters for the registered entries.
+
+        The warnings are matched again in the executor before they are next
+        handed out.
+        """
+        self._matcher = MultiAreaMatcher(
+            {
+                coordinator.entry_id: coordinator.areas
+                for coordinator in self._coordinators
+                if coordinator.filter_mode == FILTER_MODE_TEXT
+            },
+            place_index(),
+        )
+        self._geo_matcher = GeoMatcher(
+            {
+                coordinator.entry_id: coordinator.location
+                for coordinator in self._coordinators
+                if coordinator.location is not None
+            },
+            {
+                coordinator.entry_id: coordinator.geocode
+                for coordinator in self._coordinators
+                if coordinator.geocode is not None
+            },
+        )
+        self._prefilter = MultiWarningFilter(
+            {coordinator.entry_id: coordinator.prefilter for coordinator in self._coordinators}
+        )
+
+    def _matchers(self) -> tuple[MultiAreaMatcher, GeoMatcher, MultiWarningFilter]:
+        """Return the current matchers and filters, in pipeline argument order."""
+        return (self._matcher, self._geo_matcher, self._prefilter)
+
+    def _is_matched(self) -> bool:
+        """Return True if the matches are up to date with the registered entries."""
+        return self._matched_with is not None and all(
+            used is current for used, current in zip(self._matched_with, self._matchers())
+        )
+
+    async def _async_rematch(self) -> None:
+        """Match the current warnings for the registered entries in the executor."""
+        while not self._is_matched():
+            matcher, geo_matcher, prefilter = matchers = self._matchers()
+            warnings = self.warnings
+            matches, area_matches = await self.hass.async_add_executor_job(
+                match_warnings, matcher, geo_matcher, warnings, prefilter
+            )
+            if warnings is self.warnings:
+                self.matches = matches
+                self.area_matches = area_matches
+                self._matched_with = matchers
+
+    @callback
+    def async_warnings_for(self, entry_id: str) -> list[Warning]:
+        """Return the current warnings matching a config entry's area."""
+        return [
+            warning
+            for warning, entry_ids in zip(self.warnings, self.matches)
+            if entry_id in entry_ids
+        ]
+
+    @callback
+    def async_areas_for(self, entry_id: str) -> dict[str, frozenset[str]]:
+        """Return the areas of a config entry each of its warnings concerns, by ID."""
+        return {
+            warning.id: frozenset(area for key, area in area_keys if key == entry_id)
+            for warning, entry_ids, area_keys in zip(
+                self.warnings, self.matches, self.area_matches
+            )
+            if entry_id in entry_ids
+        }
+
+    @callback
+    def _async_update_bounds(self) -> None:
+        """Poll as often as the most demanding config entry asks for."""
+        self.scheduler.set_bounds(
+            min(coordinator.min_scan_interval for coordinator in self._coordinators),
+            min(coordinator.max_scan_interval for coordinator in self._coordinators),
+        )
+
+    @callback
+    def _async_schedule_refresh(self) -> None:
+        """Arm the timer for the next poll or warning boundary."""
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+        boundary = next_boundary(self.warnings, dt_util.utcnow())
+        delay, fetch = self.scheduler.next_wakeup(boundary)
+        self._unsub_refresh = async_call_later(
+            self.hass,
+            delay,
+            self._async_scheduled_refresh if fetch else self._async_boundary_refresh,
+        )
+
+    async def _async_scheduled_refresh(self, _now: datetime) -> None:
+        """Refetch the feed and fan it out to every coordinator."""
+        self._unsub_refresh = None
+        try:
+            if self._inflight is not None:
+                # A refresh started before the poll may only rematch, so let it
+                # finish instead of joining it
+                await asyncio.wait({self._inflight})
+            self._last_fetch = None
+            # Refreshing concurrently lets every coordinator share one in-flight fetch.
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in list(self._coordinators))
+            )
+        finally:
+            # The fetch arms the next poll; keep polling if nothing fetched
+            if self._unsub_refresh is None and self._coordinators:
+                self._async_schedule_refresh()
+
+    async def _async_boundary_refresh(self, _now: datetime) -> None:
+        """Refresh every coordinator from the current warnings without a fetch."""
+        self._unsub_refresh = None
+        self._async_evict_documents()
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in list(self._coordinators))
+        )
+        if self._coordinators:
+            self._async_schedule_refresh()
+
+    def _is_fresh(self) -> bool:
+        """Return True if the warnings can be used without a fetch.
+
+        Scheduled polls invalidate the warnings explicitly, so this only
+        bounds how old they may get for refreshes outside the schedule.
+        """
+        return (
+            self._last_fetch is not None
+            and time.monotonic() - self._last_fetch < self.scheduler.max_interval
+        )
+
+    async def async_get_warnings(self) -> list[Warning]:
+        """Return the parsed warnings, fetching them if they are stale.
+
+        Concurrent callers share a single in-flight request.
+        """
+        if self._is_fresh() and self._is_matched():
+            return self.warnings
+
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._async_refresh_warnings())
+        inflight = self._inflight
+        try:
+            return await asyncio.shield(inflight)
+        finally:
+            if self._inflight is inflight and inflight.done():
+                self._inflight = None
+
+    async def _async_refresh_warnings(self) -> list[Warning]:
+        """Fetch the warnings if they are stale and match them for every area."""
+        if not self._is_fresh():
+            await self._async_fetch()
+        await self._async_rematch()
+        return self.warnings
+
+    async def _async_fetch(self) -> list[Warning]:
+        """Fetch the feed and schedule the next poll."""
+        changed = False
+        try:
+            version = self.version
+            warnings = await self._async_fetch_with_retry()
+            changed = self.version != version
+            return warnings
+        except UpdateFailed as err:
+            if self._is_stale():
+                raise
+            # Keep serving the last warnings until they go stale
+            _LOGGER.warning(
+                "Using warnings from %s, the feed could not be fetched: %s",
+                self.fetched_at,
+                err,
+            )
+            return self.warnings
+        finally:
+            # Failures are retried like unchanged polls
+            self.scheduler.record_poll(changed)
+            if self._coordinators:
+                self._async_schedule_refresh()
+
+    async def _async_fetch_with_retry(self) -> list[Warning]:
+        """Fetch the feed through the circuit breaker, retrying transient errors."""
+        if not self.breaker.allow_request():
+            raise UpdateFailed("FMI feed requests are paused after repeated failures")
+
+        try:
+            warnings = await async_retry(
+                self._async_fetch_feed,
+                FETCH_RETRIES,
+                FETCH_BACKOFF_BASE,
+                FETCH_BACKOFF_MAX,
+                _is_retryable,
+            )
+        except UpdateFailed:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return warnings
+
+    async def _async_fetch_feed(self) -> list[Warning]:
+        """Fetch every language feed in use concurrently and process them."""
+        session = async_get_clientsession(self.hass)
+        start = time.monotonic()
+        results = await asyncio.gather(
+            *(
+                self._async_fetch_source(session, self._async_source(language))
+                for language in self._languages
+            ),
+            return_exceptions=True,
+        )
+        # Feeds fetched before the failure keep their state, so a retry only
+        # needs to fetch the rest
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        self.metrics.record_fetch(time.monotonic() - start, sum(results))
+
+        if not self._dirty:
+            await self._async_fetched(False)
+            return self.warnings
+
+        # Changes made while the pipeline runs mark the feeds dirty again
+        self._dirty = False
+        try:
+            result = await self._async_process()
+        except Exception as err:
+            self._dirty = True
+            _LOGGER.error("Error processing FMI weather warnings: %s", err)
+            raise UpdateFailed(f"Error processing warnings: {err}") from err
+
+        self._async_apply(result)
+        await self._async_fetched(True)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Fetched %d warnings in %s for %d config entries, %d new or changed",
+                len(self.warnings),
+                ", ".join(self._languages),
+                self.refcount,
+                result.changed,
+            )
+        return self.warnings
+
+    async def _async_fetch_source(self, session: ClientSession, source: FeedSource) -> int:
+        """Download one language feed if it has changed; return the bytes received."""
+        # A 304, or a body with the previous hash, keeps the current warnings
+        # and version, so coordinators can skip filtering as well
+        headers = {}
+        if source.etag:
+            headers[hdrs.IF_NONE_MATCH] = source.etag
+        if source.last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = source.last_modified
+
+        try:
+            async with async_timeout.timeout(30):
+                async with session.get(source.url, headers=headers) as response:
+                    if response.status == 304 and source.content_hash is not None:
+                        self.not_modified_hits += 1
+                        _LOGGER.debug(
+                            "%s feed not modified, reusing %d warnings",
+                            source.language,
+                            len(source.warnings),
+                        )
+                        return 0
+
+                    if response.status != 200:
+                        raise FeedFetchError(
+                            f"Error fetching data: {response.status}",
+                            retryable=response.status in RETRYABLE_STATUSES,
+                        )
+
+                    content = await response.read()
+                    etag = response.headers.get(hdrs.ETAG)
+                    last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+        except UpdateFailed:
+            raise
+        except (asyncio.TimeoutError, ClientError) as err:
+            _LOGGER.debug("Error fetching FMI weather warnings: %s", err)
+            raise FeedFetchError(f"Error communicating with API: {err}") from err
+        except Exception as err:
+            _LOGGER.error("Error fetching FMI weather warnings: %s", err)
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+        # Backup for servers that ignore the validators
+        content_hash = hashlib.sha256(content).hexdigest()
+        if content_hash == source.content_hash:
+            self.hash_skip_hits += 1
+            _LOGGER.debug(
+                "%s feed content unchanged, reusing %d warnings",
+                source.language,
+                len(source.warnings),
+            )
+            return len(content)
+
+        # Parsed by the next pipeline run
+        source.content = content
+        source.content_hash = content_hash
+        source.etag = etag
+        source.last_modified = last_modified
+        self._dirty = True
+        return len(content)
+
+    def _feeds(self) -> dict[str, list[Warning]]:
+        """Return the current warnings of every feed in use, by language."""
+        return {
+            language: self._async_source(language).warnings
+            for language in self._languages
+        }
+
+    async def _async_process(self) -> PipelineResult:
+        """Run the downloaded feeds through the pipeline in the executor.
+
+        Only network I/O runs on the event loop.  Without CAP documents this
+        is a single executor job.  Otherwise the feeds are parsed first, the
+        documents of the new or changed warnings are downloaded, and a second
+        job enriches and matches the warnings.
+        """
+        contents = {
+            language: source.content
+            for language in self._languages
+            if (source := self._async_source(language)).content is not None
+        }
+        feeds = self._feeds()
+        matchers = self._matchers()
+        # Unchanged warnings keep their previous Warning and matches, so only
+        # new or changed ones are parsed and matched
+
+        if not self._enrich:
+            result = await self.hass.async_add_executor_job(
+                run_pipeline,
+                contents,
+                feeds,
+                self._merged,
+                self.warnings,
+                self.matches if self._is_matched() else [],
+                self.area_matches if self._is_matched() else [],
+                *matchers,
+            )
+        else:
+            parsed = await self.hass.async_add_executor_job(
+                parse_feeds, contents, feeds, self._merged
+            )
+            documents, cap_contents = await self._async_fetch_documents(parsed.merged)
+            result = await self.hass.async_add_executor_job(
+                finish_pipeline,
+                parsed,
+                self.warnings,
+                self.matches if self._is_matched() else [],
+                self.area_matches if self._is_matched() else [],
+                *matchers,
+                documents,
+                cap_contents,
+            )
+        self._matched_with = matchers
+        return result
+
+    @callback
+    def _async_apply(self, result: PipelineResult) -> None:
+        """Publish the result of a pipeline run."""
+        for language, warnings in result.feeds.items():
+            # The language may have been dropped while the pipeline ran
+            if (source := self._sources.get(language)) is not None:
+                source.warnings = warnings
+                source.content = None
+        for key, document in result.documents.items():
+            self._cap_documents.put(key, document)
+
+        self._merged = result.merged
+        self.warnings = result.warnings
+        self.matches = result.matches
+        self.area_matches = result.area_matches
+        self.version += 1
+        self.metrics.record_pipeline(
+            result.parse_seconds,
+            result.match_seconds,
+            len(result.warnings),
+            result.changed,
+        )
+        self._async_evict_documents()
+
+    async def _async_fetch_documents(
+        self, warnings: list[Warning]
+    ) -> tuple[dict[CapKey, dict[str, Any]], dict[CapKey, bytes]]:
+        """Return the CAP documents the new or changed warnings need.
+
+        Cached documents are returned parsed, the others are downloaded and
+        returned as bytes for the pipeline to parse.  Warnings enriched on an
+        earlier poll from the same version need no document.
+        """
+        enriched = {
+            id(warning.derived_from[0]) for warning in self.warnings if warning.derived_from
+        }
+        documents = {}
+        missing = []
+        for warning in warnings:
+            if not warning.link or id(warning) in enriched:
+                continue
+            if (document := self._cap_documents.get(cap_key(warning))) is not None:
+                self.cap_cache_hits += 1
+                documents[cap_key(warning)] = document
+            else:
+                missing.append(warning)
+
+        if not missing:
+            return documents, {}
+        session = async_get_clientsession(self.hass)
+        contents = await asyncio.gather(
+            *(self._async_cap_content(session, warning) for warning in missing)
+        )
+        _LOGGER.debug(
+            "Fetched CAP documents for %d of %d warnings", len(missing), len(warnings)
+        )
+        return documents, {
+            cap_key(warning): content
+            for warning, content in zip(missing, contents)
+            if content is not None
+        }
+
+    async def _async_cap_content(
+        self, session: ClientSession, warning: Warning
+    ) -> bytes | None:
+        """Download the CAP document of a warning."""
+        async with self._cap_semaphore:
+            try:
+                async with async_timeout.timeout(CAP_FETCH_TIMEOUT):
+                    async with session.get(warning.link) as response:
+                        if response.status != 200:
+                            _LOGGER.debug(
+                                "Error fetching CAP document %s: %s",
+                                warning.link,
+                                response.status,
+                            )
+                            return None
+                        content = await response.read()
+            except (asyncio.TimeoutError, ClientError) as err:
+                _LOGGER.debug("Error fetching CAP document %s: %s", warning.link, err)
+                return None
+
+        self.cap_fetches += 1
+        return content
+
+    @callback
+    def _async_evict_documents(self) -> None:
+        """Drop the CAP documents of warnings that expired or left the feed."""
+        if not len(self._cap_documents):
+            return
+        now = dt_util.utcnow()
+        current = {warning.id for warning in self.warnings}
+        self._cap_documents.evict(
+            lambda key, document: key[0] not in current
+            or (document["expires"] is not None and document["expires"] <= now)
+        )
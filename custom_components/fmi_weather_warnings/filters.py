@@ -0,0 +1,168 @@
+"""Filters on the CAP fields of warnings, applied before area matching."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    CONF_ALLOW_EVENTS,
+    CONF_DENY_EVENTS,
+    CONF_MIN_CERTAINTY,
+    CONF_MIN_SEVERITY,
+    CONF_MIN_URGENCY,
+    FILTER_ANY,
+)
+from .model import Severity, Urgency
+
+if TYPE_CHECKING:
+    from .model import Warning
+
+# CAP values from least to most significant; missing and unknown values rank lowest
+SEVERITY_ORDER = (
+    Severity.UNKNOWN,
+    Severity.MINOR,
+    Severity.MODERATE,
+    Severity.SEVERE,
+    Severity.EXTREME,
+)
+URGENCY_ORDER = (
+    Urgency.UNKNOWN,
+    Urgency.PAST,
+    Urgency.FUTURE,
+    Urgency.EXPECTED,
+    Urgency.IMMEDIATE,
+)
+CERTAINTY_ORDER = ("Unknown", "Unlikely", "Possible", "Likely", "Observed")
+
+# Reasons a warning is rejected, in the order they are checked
+FILTER_REASONS = ("severity", "urgency", "certainty", "event")
+
+
+def _rank(order: tuple[str, ...], value: str | None) -> int:
+    """Return the position of a CAP value in its order, 0 if unknown."""
+    try:
+        return order.index(value)
+    except ValueError:
+        return 0
+
+
+def parse_event_types(value: str | Iterable[str] | None) -> frozenset[str]:
+    """Return the event types of a comma separated list, casefolded."""
+    if not value:
+        return frozenset()
+    if isinstance(value, str):
+        value = value.split(",")
+    return frozenset(event.strip().casefold() for event in value if event.strip())
+
+
+@dataclass(frozen=True, slots=True)
+class WarningFilter:
+    """Minimum severity, urgency and certainty, and allowed or denied event types.
+
+    Event types are compared case-insensitively with the event of every
+    language version of a warning.  An empty allow list allows every event.
+    """
+
+    min_severity: str | None = None
+    min_urgency: str | None = None
+    min_certainty: str | None = None
+    allow_events: frozenset[str] = frozenset()
+    deny_events: frozenset[str] = frozenset()
+
+    def __bool__(self) -> bool:
+        """Return True if the filter can reject anything."""
+        return bool(
+            self.min_severity
+            or self.min_urgency
+            or self.min_certainty
+            or self.allow_events
+            or self.deny_events
+        )
+
+    def rejection(self, warning: Warning) -> str | None:
+        """Return why the warning is rejected, or None if it passes."""
+        if self.min_severity and _rank(SEVERITY_ORDER, warning.severity) < _rank(
+            SEVERITY_ORDER, self.min_severity
+        ):
+            return "severity"
+        if self.min_urgency and _rank(URGENCY_ORDER, warning.urgency) < _rank(
+            URGENCY_ORDER, self.min_urgency
+        ):
+            return "urgency"
+        if self.min_certainty and _rank(CERTAINTY_ORDER, warning.certainty) < _rank(
+            CERTAINTY_ORDER, self.min_certainty
+        ):
+            return "certainty"
+        if self.allow_events or self.deny_events:
+            events = _event_types(warning)
+            if self.allow_events and self.allow_events.isdisjoint(events):
+                return "event"
+            if not self.deny_events.isdisjoint(events):
+                return "event"
+        return None
+
+    def accepts(self, warning: Warning) -> bool:
+        """Return True if the warning passes the filter."""
+        return self.rejection(warning) is None
+
+    def stats(self, warnings: Iterable[Warning]) -> dict[str, Any]:
+        """Return how many warnings pass the filter and why the others do not."""
+        rejected = dict.fromkeys(FILTER_REASONS, 0)
+        evaluated = 0
+        for warning in warnings:
+            evaluated += 1
+            if (reason := self.rejection(warning)) is not None:
+                rejected[reason] += 1
+        passed = evaluated - sum(rejected.values())
+        return {
+            "evaluated": evaluated,
+            "passed": passed,
+            "rejected": rejected,
+            "pass_ratio": round(passed / evaluated, 3) if evaluated else None,
+        }
+
+
+def warning_filter(config: Mapping[str, Any]) -> WarningFilter:
+    """Return the filter configured for a config entry."""
+
+    def minimum(key: str) -> str | None:
+        value = config.get(key)
+        return None if value in (None, "", FILTER_ANY) else value
+
+    return WarningFilter(
+        min_severity=minimum(CONF_MIN_SEVERITY),
+        min_urgency=minimum(CONF_MIN_URGENCY),
+        min_certainty=minimum(CONF_MIN_CERTAINTY),
+        allow_events=parse_event_types(config.get(CONF_ALLOW_EVENTS)),
+        deny_events=parse_event_types(config.get(CONF_DENY_EVENTS)),
+    )
+
+
+def _event_types(warning: Warning) -> set[str]:
+    """Return the event of every language version of a warning, casefolded."""
+    events = {warning.event.casefold()} if warning.event else set()
+    for translation in (warning.translations or {}).values():
+        if event := translation.get("event"):
+            events.add(event.casefold())
+    return events
+
+
+class MultiWarningFilter:
+    """Apply the filters of many config entries to each warning at once."""
+
+    def __init__(self, filters: Mapping[str, WarningFilter]) -> None:
+        """Initialize from a mapping of entry ID to filter."""
+        self.filters = {entry_id: flt for entry_id, flt in filters.items() if flt}
+
+    def __bool__(self) -> bool:
+        """Return True if any entry filters warnings."""
+        return bool(self.filters)
+
+    def rejected_by(self, warning: Warning) -> frozenset[str]:
+        """Return the IDs of the entries whose filter rejects the warning."""
+        return frozenset(
+            entry_id
+            for entry_id, flt in self.filters.items()
+            if not flt.accepts(warning)
+        )
@@ -0,0 +1,112 @@
+"""Geometric area matching for FMI Weather Warnings."""
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .model import Warning
+
+# Grid cell size in degrees used to prefilter polygons by bounding box
+GRID_CELL_SIZE = 0.5
+
+Point = tuple[float, float]
+Polygon = Sequence[Point]
+
+
+def point_in_polygon(lat: float, lon: float, polygon: Polygon) -> bool:
+    """Return True if the point is inside the polygon (ray casting)."""
+    inside = False
+    count = len(polygon)
+    for index in range(count):
+        lat1, lon1 = polygon[index]
+        lat2, lon2 = polygon[index - 1]
+        if (lat1 > lat) != (lat2 > lat) and lon < (lon2 - lon1) * (lat - lat1) / (
+            lat2 - lat1
+        ) + lon1:
+            inside = not inside
+    return inside
+
+
+def _bounding_box(polygon: Polygon) -> tuple[float, float, float, float]:
+    """Return (min_lat, min_lon, max_lat, max_lon) of a polygon."""
+    lats = [lat for lat, _ in polygon]
+    lons = [lon for _, lon in polygon]
+    return min(lats), min(lons), max(lats), max(lons)
+
+
+def _cell(value: float) -> int:
+    """Return the grid cell index of a coordinate."""
+    return math.floor(value / GRID_CELL_SIZE)
+
+
+class PolygonIndex:
+    """Uniform grid over the bounding boxes of warning polygons.
+
+    Built once per feed refresh.  A point query only runs the exact
+    point-in-polygon test for polygons whose bounding box contains it.
+    """
+
+    def __init__(self, warnings: Sequence[Warning]) -> None:
+        """Index the polygons of the warnings by their position in the list."""
+        self._cells: dict[tuple[int, int], list[tuple[int, Polygon, tuple[float, ...]]]] = {}
+        for index, warning in enumerate(warnings):
+            for polygon in warning.polygons:
+                if len(polygon) < 3:
+                    continue
+                bbox = _bounding_box(polygon)
+                for row in range(_cell(bbox[0]), _cell(bbox[2]) + 1):
+                    for col in range(_cell(bbox[1]), _cell(bbox[3]) + 1):
+                        self._cells.setdefault((row, col), []).append(
+                            (index, polygon, bbox)
+                        )
+
+    def query(self, lat: float, lon: float) -> set[int]:
+        """Return the positions of the warnings whose polygons contain the point."""
+        found: set[int] = set()
+        for index, polygon, bbox in self._cells.get((_cell(lat), _cell(lon)), ()):
+            if index in found:
+                continue
+            if not (bbox[0] <= lat <= bbox[2] and bbox[1] <= lon <= bbox[3]):
+                continue
+            if point_in_polygon(lat, lon, polygon):
+                found.add(index)
+        return found
+
+
+class GeoMatcher:
+    """Match warnings against config entries by location or geocode.
+
+    Entries configured with a point match warnings whose CAP polygons contain
+    it; entries configured with a geocode match warnings carrying that code.
+    """
+
+    def __init__(
+        self,
+        locations: Mapping[str, Point],
+        geocodes: Mapping[str, str],
+    ) -> None:
+        """Initialize from entry ID to point and entry ID to geocode mappings."""
+        self.locations = dict(locations)
+        self.geocodes = dict(geocodes)
+
+    def match_all(self, warnings: Sequence[Warning]) -> list[set[str]]:
+        """Return the matching entry IDs for each warning, in order."""
+        matches: list[set[str]] = [set() for _ in warnings]
+
+        if self.locations:
+            index = PolygonIndex(warnings)
+            for entry_id, (lat, lon) in self.locations.items():
+                for position in index.query(lat, lon):
+                    matches[position].add(entry_id)
+
+        if self.geocodes:
+            entries_for_code: dict[str, set[str]] = {}
+            for entry_id, code in self.geocodes.items():
+                entries_for_code.setdefault(code, set()).add(entry_id)
+            for position, warning in enumerate(warnings):
+                for code in warning.geocodes:
+                    matches[position].update(entries_for_code.get(code, ()))
+
+        return matches
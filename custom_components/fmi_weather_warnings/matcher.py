@@ -0,0 +1,181 @@
+"""Area matching for FMI Weather Warnings."""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING
+
+from .places import normalize_name
+
+if TYPE_CHECKING:
+    from .model import Warning
+    from .places import PlaceIndex
+
+# An entry ID and one of the areas configured for it
+AreaKey = tuple[str, str]
+
+# Finnish case endings stripped from a configured area, e.g. "Helsingissä"
+STRIP_SUFFIXES = (
+    "n", "ssa", "ssä", "sta", "stä", "an", "än", "la", "lä", "lla", "llä", "lta", "ltä", "lle",
+)
+
+
+def parse_areas(value: str | Iterable[str] | None) -> list[str]:
+    """Return the areas of a comma separated list, without blanks and repeats."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    areas: list[str] = []
+    for area in value:
+        area = area.strip()
+        if area and area.lower() not in (known.lower() for known in areas):
+            areas.append(area)
+    return areas
+
+
+def area_stem(area: str) -> str:
+    """Return the shortest text that every Finnish case form of ``area`` contains.
+
+    Forms with an ending stripped are prefixes of the area and forms with an
+    ending appended extend it, so a warning mentions any of the forms exactly
+    when it contains the stem.
+    """
+    area = area.lower()
+    stem = area
+    for suffix in STRIP_SUFFIXES:
+        if area.endswith(suffix) and len(area) > len(suffix) + 2:
+            variant = area[: -len(suffix)]
+            if len(variant) < len(stem):
+                stem = variant
+    return stem
+
+
+def _has_content(warning: Warning) -> bool:
+    """Return True if the warning has any text to match against."""
+    return bool(warning.area or warning.title or warning.summary)
+
+
+def _search_text(warning: Warning) -> str:
+    """Return the text searched for area names, in every language available."""
+    if not warning.translations:
+        return f"{warning.area} {warning.title} {warning.summary}"
+    return " ".join(
+        f"{text.get('area', '')} {text.get('title', '')} {text.get('summary', '')}"
+        for text in warning.translations.values()
+    )
+
+
+class MultiAreaMatcher:
+    """Match warnings against the areas of many config entries at once.
+
+    Areas found in the ``places`` index are resolved to their canonical
+    place, and match warnings naming that place or a region containing it
+    as a whole word or part of a hyphenated compound, in any of their
+    languages and case forms.  The stems of the other areas are combined
+    into another pattern.  An entry may have several areas and matches
+    warnings concerning any of them, which are also reported by area.
+    Entries without an area match every warning, and so does every entry
+    for warnings without any text.
+    """
+
+    def __init__(
+        self,
+        areas: Mapping[str, str | Iterable[str]],
+        places: PlaceIndex | None = None,
+    ) -> None:
+        """Initialize from a mapping of entry ID to its configured area or areas."""
+        self.entry_ids = frozenset(areas)
+        entry_areas = {
+            entry_id: [area] if isinstance(area, str) else list(area)
+            for entry_id, area in areas.items()
+        }
+        self.match_everything = frozenset(
+            entry_id
+            for entry_id, names in entry_areas.items()
+            if not names or not all(names)
+        )
+        self.area_keys = frozenset(
+            (entry_id, area)
+            for entry_id, names in entry_areas.items()
+            for area in names
+            if area
+        )
+
+        stems: dict[str, set[AreaKey]] = {}
+        keys_for_place: dict[str, set[AreaKey]] = {}
+        for key in self.area_keys:
+            area = key[1]
+            if places is not None and (place_id := places.resolve(area)):
+                # A municipality also matches warnings for its region
+                for containing in places.lineage(place_id):
+                    keys_for_place.setdefault(containing, set()).add(key)
+            else:
+                stems.setdefault(area_stem(area), set()).add(key)
+        # Every name of the places, longest first, as whole words.  Hyphens
+        # separate words, so "Helsinki-Vantaa" names both towns; compound
+        # names of other places are in the pattern and win as the longer name.
+        self._keys_for_name: dict[str, frozenset[AreaKey]] = {}
+        self._place_pattern = None
+        if keys_for_place:
+            for name, place_id in places.names_for(keys_for_place).items():
+                self._keys_for_name[name] = frozenset(keys_for_place.get(place_id, ()))
+            self._place_pattern = re.compile(
+                r"(?<!\w)(%s)(?!\w)"
+                % "|".join(
+                    re.escape(name).replace(r"\ ", r"\s+")
+                    for name in sorted(self._keys_for_name, key=len, reverse=True)
+                ),
+                re.IGNORECASE,
+            )
+
+        # Only the longest stem starting at a position is reported, and every
+        # stem that is a prefix of it matches there too.
+        self._keys_for_stem = {
+            stem: frozenset().union(
+                *(keys for other, keys in stems.items() if stem.startswith(other))
+            )
+            for stem in stems
+        }
+        self._pattern = (
+            re.compile(
+                "(?=(%s))"
+                % "|".join(map(re.escape, sorted(stems, key=len, reverse=True))),
+                re.IGNORECASE,
+            )
+            if stems
+            else None
+        )
+
+    def match_areas(self, warning: Warning) -> frozenset[AreaKey]:
+        """Return the (entry ID, area) pairs of the areas the warning concerns."""
+        if not _has_content(warning):
+            return self.area_keys
+        if self._pattern is None and self._place_pattern is None:
+            return frozenset()
+
+        text = _search_text(warning)
+        matched: set[AreaKey] = set()
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                matched.update(self._keys_for_stem[match.group(1).lower()])
+        if self._place_pattern is not None:
+            for match in self._place_pattern.finditer(text):
+                matched.update(self._keys_for_name[normalize_name(match.group(1))])
+        return frozenset(matched)
+
+    def entries_for(self, area_keys: Iterable[AreaKey]) -> frozenset[str]:
+        """Return the IDs of the entries matching along with the given areas."""
+        return self.match_everything.union(entry_id for entry_id, _ in area_keys)
+
+    def match(self, warning: Warning) -> frozenset[str]:
+        """Return the IDs of the entries whose area the warning concerns."""
+        return self.entries_for(self.match_areas(warning))
+
+    def match_all(self, warnings: list[Warning]) -> list[frozenset[str]]:
+        """Return the matching entry IDs for each warning, in order."""
+        return [self.match(warning) for warning in warnings]
+
+    def match_all_areas(self, warnings: list[Warning]) -> list[frozenset[AreaKey]]:
+        """Return the matching (entry ID, area) pairs for each warning, in order."""
+        return [self.match_areas(warning) for warning in warnings]
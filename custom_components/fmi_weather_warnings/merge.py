@@ -0,0 +1,79 @@
+"""Merge the language versions of the FMI feed into one warning list."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import replace
+
+from .model import Warning
+
+# Warning keys whose text depends on the feed language
+TRANSLATED_FIELDS = (
+    "title",
+    "link",
+    "summary",
+    "event",
+    "headline",
+    "description",
+    "instruction",
+    "area",
+)
+
+
+def localize(warning: Warning, language: str | None) -> Warning:
+    """Return the warning with its text in ``language``, where available."""
+    translation = (warning.translations or {}).get(language)
+    if not translation:
+        return warning
+    return replace(warning, **translation)
+
+
+def merge_feeds(
+    feeds: Mapping[str, list[Warning]],
+    previous: Mapping[str, Warning] | None = None,
+) -> list[Warning]:
+    """Combine the warnings of several language feeds by CAP identifier.
+
+    ``feeds`` maps a language to the warnings parsed from its feed, the
+    preferred language first.  Each merged warning is a copy of the first
+    language version found, with the text of every language version under
+    ``translations``, so matching and diffing run once per warning.
+
+    ``previous`` maps warning IDs to the merged warnings of the previous
+    poll.  A merged warning whose language versions are all unchanged is
+    reused as is, so callers can keep detecting changes by identity.
+    """
+    versions: dict[str, dict[str, Warning]] = {}
+    for language, warnings in feeds.items():
+        for warning in warnings:
+            versions.setdefault(warning.id, {})[language] = warning
+
+    merged = []
+    for key, by_language in versions.items():
+        sources = tuple(by_language.values())
+        cached = previous.get(key) if previous else None
+        if cached is not None and _same_sources(cached.derived_from, sources):
+            merged.append(cached)
+            continue
+
+        merged.append(
+            replace(
+                sources[0],
+                translations={
+                    language: {
+                        field: value
+                        for field in TRANSLATED_FIELDS
+                        if (value := getattr(version, field)) is not None
+                    }
+                    for language, version in by_language.items()
+                },
+                derived_from=sources,
+            )
+        )
+    return merged
+
+
+def _same_sources(cached: tuple[Warning, ...], sources: tuple[Warning, ...]) -> bool:
+    """Return True if both tuples hold the same parsed warnings."""
+    return len(cached) == len(sources) and all(
+        a is b for a, b in zip(cached, sources)
+    )
@@ -0,0 +1,49 @@
+"""Timing and size metrics of the feed polls."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class PollMetrics:
+    """Measurements of the most recent feed poll that fetched the feed.
+
+    Durations are in milliseconds; a poll answered from the cache or with a
+    304 leaves the parse and match times of the last processed feed.
+    """
+
+    # Time to download every language feed in use
+    fetch_ms: float | None = None
+    # Bytes of the feed bodies received, 0 when none had changed
+    bytes_received: int = 0
+    # Time to parse and merge the changed feeds
+    parse_ms: float | None = None
+    # Time to match the new or changed warnings against every area
+    match_ms: float | None = None
+    # Warnings in the merged feed
+    warnings: int = 0
+    # Warnings that were new or changed and so parsed and matched again
+    changed: int = 0
+    polls: int = 0
+    total_bytes_received: int = 0
+
+    def record_fetch(self, seconds: float, received: int) -> None:
+        """Record the download of the feeds."""
+        self.fetch_ms = round(seconds * 1000, 3)
+        self.bytes_received = received
+        self.total_bytes_received += received
+        self.polls += 1
+
+    def record_pipeline(
+        self, parse_seconds: float, match_seconds: float, warnings: int, changed: int
+    ) -> None:
+        """Record a run of the pipeline over the downloaded feeds."""
+        self.parse_ms = round(parse_seconds * 1000, 3)
+        self.match_ms = round(match_seconds * 1000, 3)
+        self.warnings = warnings
+        self.changed = changed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return asdict(self)
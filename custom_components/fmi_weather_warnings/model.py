@@ -0,0 +1,139 @@
+"""Warning record for FMI Weather Warnings."""
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+try:
+    from enum import StrEnum
+except ImportError:  # Python 3.10, still supported by Home Assistant 2023.7
+
+    class StrEnum(str, Enum):  # type: ignore[no-redef]
+        """Enum whose members are also strings."""
+
+        def __str__(self) -> str:
+            """Return the value, as the standard StrEnum does."""
+            return str.__str__(self)
+
+Point = tuple[float, float]
+Polygon = tuple[Point, ...]
+
+
+class Severity(StrEnum):
+    """CAP severity of a warning."""
+
+    EXTREME = "Extreme"
+    SEVERE = "Severe"
+    MODERATE = "Moderate"
+    MINOR = "Minor"
+    UNKNOWN = "Unknown"
+
+
+class Urgency(StrEnum):
+    """CAP urgency of a warning."""
+
+    IMMEDIATE = "Immediate"
+    EXPECTED = "Expected"
+    FUTURE = "Future"
+    PAST = "Past"
+    UNKNOWN = "Unknown"
+
+
+# Text fields that repeat across warnings and are interned to share one copy
+INTERNED_FIELDS = ("event", "certainty", "sender")
+
+
+@dataclass(frozen=True, slots=True)
+class Warning:  # noqa: A001 - the name used throughout the CAP specification
+    """A single weather warning.
+
+    Warnings are immutable: a changed warning is a new object, so consumers
+    detect changes by identity.  Optional CAP fields the item did not carry
+    are None.
+    """
+
+    id: str
+    fingerprint: int | None = None
+    title: str = ""
+    link: str = ""
+    published: str = ""
+    summary: str = ""
+    area: str = ""
+    event: str | None = None
+    headline: str | None = None
+    description: str | None = None
+    instruction: str | None = None
+    severity: Severity | None = None
+    certainty: str | None = None
+    urgency: Urgency | None = None
+    sender: str | None = None
+    effective: datetime | None = None
+    expires: datetime | None = None
+    geocodes: tuple[str, ...] = ()
+    polygons: tuple[Polygon, ...] = ()
+    parameters: tuple[tuple[str, str], ...] = ()
+    # Text of every language version, by language, for merged warnings
+    translations: Mapping[str, Mapping[str, str]] | None = None
+    # The warnings this one was merged or enriched from
+    derived_from: tuple[Warning, ...] = field(default=(), compare=False, repr=False)
+
+
+WARNING_FIELDS = tuple(
+    warning_field.name for warning_field in fields(Warning) if warning_field.compare
+)
+
+
+def _intern(value: str | None) -> str | None:
+    """Return the interned copy of a string."""
+    return sys.intern(value) if value else value
+
+
+def _enum(enum: type[StrEnum], value: str | StrEnum | None) -> StrEnum | None:
+    """Return the enum member for a CAP value, or UNKNOWN for other values."""
+    if value is None or isinstance(value, enum):
+        return value
+    try:
+        return enum(value.strip())
+    except ValueError:
+        return enum("Unknown")
+
+
+def make_warning(values: Mapping[str, Any]) -> Warning:
+    """Build a ``Warning`` from parsed values.
+
+    Unknown keys are ignored, enum values are converted, repeated strings are
+    interned and lists become tuples.
+    """
+    kwargs = {key: values[key] for key in WARNING_FIELDS if key in values}
+    for key in INTERNED_FIELDS:
+        if key in kwargs:
+            kwargs[key] = _intern(kwargs[key])
+    if "severity" in kwargs:
+        kwargs["severity"] = _enum(Severity, kwargs["severity"])
+    if "urgency" in kwargs:
+        kwargs["urgency"] = _enum(Urgency, kwargs["urgency"])
+    if "geocodes" in kwargs:
+        kwargs["geocodes"] = tuple(_intern(code) for code in kwargs["geocodes"])
+    if "polygons" in kwargs:
+        kwargs["polygons"] = tuple(
+            tuple(tuple(point) for point in polygon) for polygon in kwargs["polygons"]
+        )
+    if "parameters" in kwargs:
+        parameters = kwargs["parameters"]
+        if isinstance(parameters, Mapping):
+            parameters = parameters.items()
+        kwargs["parameters"] = tuple((key, value) for key, value in parameters)
+    return Warning(**kwargs)
+
+
+def warning_values(warning: Warning, keys: Iterable[str] = WARNING_FIELDS) -> dict[str, Any]:
+    """Return the fields of a warning that are set, by name."""
+    return {
+        key: value
+        for key in keys
+        if (value := getattr(warning, key)) is not None
+    }
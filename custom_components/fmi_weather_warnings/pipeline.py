@@ -0,0 +1,356 @@
+"""Processing pipeline from the downloaded feed bytes to matched warnings.
+
+The functions in this module are pure: they only read their arguments and
+return new, immutable results, so they can run in the executor while the
+event loop keeps serving Home Assistant.  The feed service only does the
+network I/O on the loop and swaps in the finished ``PipelineResult``.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .cap import CapFormatError, enrich_warning, parse_cap_document
+from .filters import MultiWarningFilter
+from .geo import GeoMatcher
+from .matcher import AreaKey, MultiAreaMatcher
+from .merge import merge_feeds
+from .model import Warning, make_warning
+from .rss import FeedFormatError, parse_feed, parse_polygon, parse_timestamp, warning_id
+
+_LOGGER = logging.getLogger(__name__)
+
+# CAP documents are cached by warning ID and fingerprint
+CapKey = tuple[str, int | None]
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedFeeds:
+    """The parsed language feeds and their merged warnings."""
+
+    # Warnings of every language feed in use, preferred language first
+    feeds: dict[str, list[Warning]]
+    # Warnings merged by CAP identifier, before enrichment
+    merged: list[Warning]
+    # Time spent parsing and merging, in seconds
+    parse_seconds: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineResult:
+    """Everything the feed service needs to publish a new version."""
+
+    feeds: dict[str, list[Warning]]
+    merged: list[Warning]
+    warnings: list[Warning]
+    # Matching entry IDs for each warning, in order
+    matches: list[frozenset[str]]
+    # Matching (entry ID, area) pairs for each warning, in order
+    area_matches: list[frozenset[AreaKey]]
+    # Number of warnings that were new or changed, and so matched again
+    changed: int
+    # CAP documents parsed by this run, by warning ID and fingerprint
+    documents: dict[CapKey, dict[str, Any]]
+    # Time spent in each stage, in seconds
+    parse_seconds: float = 0.0
+    match_seconds: float = 0.0
+
+
+def cap_key(warning: Warning) -> CapKey:
+    """Return the key of a warning's CAP document."""
+    return (warning.id, warning.fingerprint)
+
+
+def parse_content(content: bytes, known: list[Warning]) -> list[Warning]:
+    """Parse a feed, falling back to feedparser for unexpected formats.
+
+    ``known`` holds the warnings of the previous version of the feed, which
+    are reused for unchanged items.
+    """
+    try:
+        return parse_feed(content, {warning.id: warning for warning in known})
+    except FeedFormatError as err:
+        _LOGGER.debug("Falling back to feedparser: %s", err)
+
+    # Only imported for the rare feeds the streaming parser does not understand
+    import feedparser  # pylint: disable=import-outside-toplevel
+
+    feed = feedparser.parse(content)
+    if not feed or not feed.entries:
+        return []
+    return [parse_entry(entry) for entry in feed.entries]
+
+
+def parse_entry(entry: Any) -> Warning:
+    """Parse a single feedparser entry into a warning."""
+    warning = {
+        "title": entry.get("title", ""),
+        "link": entry.get("link", ""),
+        "published": entry.get("published", ""),
+        "summary": entry.get("summary", ""),
+    }
+    warning["id"] = warning_id(
+        entry.get("cap_identifier"), warning["link"], warning["published"]
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        # Log available CAP attributes for debugging
+        _LOGGER.debug(
+            "Parsing entry %s with CAP attributes %s",
+            warning["title"],
+            [attr for attr in dir(entry) if attr.startswith("cap_")],
+        )
+
+    # Parse CAP elements if available
+    if hasattr(entry, "cap_event"):
+        warning["event"] = entry.cap_event
+
+    if hasattr(entry, "cap_headline"):
+        warning["headline"] = entry.cap_headline
+
+    if hasattr(entry, "cap_description"):
+        warning["description"] = entry.cap_description
+
+    if hasattr(entry, "cap_instruction"):
+        warning["instruction"] = entry.cap_instruction
+
+    if hasattr(entry, "cap_severity"):
+        warning["severity"] = entry.cap_severity
+
+    if hasattr(entry, "cap_certainty"):
+        warning["certainty"] = entry.cap_certainty
+
+    if hasattr(entry, "cap_urgency"):
+        warning["urgency"] = entry.cap_urgency
+
+    if hasattr(entry, "cap_effective"):
+        warning["effective"] = parse_timestamp(entry.cap_effective)
+
+    if hasattr(entry, "cap_expires"):
+        warning["expires"] = parse_timestamp(entry.cap_expires)
+
+    # Handle area information from multiple sources
+    area_info = []
+
+    if hasattr(entry, "cap_areadesc"):
+        area_info.append(entry.cap_areadesc)
+        warning["area"] = entry.cap_areadesc
+
+    # Check for other area-related CAP fields
+    if hasattr(entry, "cap_area"):
+        area_info.append(entry.cap_area)
+
+    if hasattr(entry, "cap_geocode"):
+        area_info.append(entry.cap_geocode)
+
+    if hasattr(entry, "cap_polygon"):
+        warning["polygons"] = [parse_polygon(entry.cap_polygon)]
+
+    if hasattr(entry, "cap_sender"):
+        warning["sender"] = entry.cap_sender
+
+    # Try to extract area from title or summary if not in CAP fields
+    if not area_info:
+        # Sometimes the area is mentioned in the title or summary
+        title_lower = warning["title"].lower()
+        summary_lower = warning["summary"].lower()
+
+        # Look for common Finnish location patterns in title/summary
+        combined_text = f"{title_lower} {summary_lower}"
+        warning["area"] = combined_text
+
+    # Combine all area information if we have multiple sources
+    if area_info:
+        warning["area"] = " ".join(str(area) for area in area_info if area)
+
+    return make_warning(warning)
+
+
+def parse_feeds(
+    contents: Mapping[str, bytes],
+    feeds: Mapping[str, list[Warning]],
+    merged: list[Warning],
+) -> ParsedFeeds:
+    """Parse the feeds that changed and merge every language feed in use.
+
+    ``feeds`` maps each language in use to its current warnings, preferred
+    language first, and ``contents`` the languages that changed to their new
+    body.  ``merged`` is the previous merge, whose unchanged warnings are
+    reused.
+    """
+    start = time.perf_counter()
+    parsed = {
+        language: parse_content(contents[language], warnings)
+        if language in contents
+        else warnings
+        for language, warnings in feeds.items()
+    }
+    if len(parsed) == 1:
+        merged = next(iter(parsed.values()))
+    else:
+        merged = merge_feeds(parsed, {warning.id: warning for warning in merged})
+    return ParsedFeeds(parsed, merged, time.perf_counter() - start)
+
+
+def enrich_warnings(
+    warnings: list[Warning],
+    previous: list[Warning],
+    documents: Mapping[CapKey, dict[str, Any]],
+) -> list[Warning]:
+    """Return the warnings with the details of their CAP documents.
+
+    Warnings enriched on an earlier poll from the same version are reused
+    from ``previous``, so only new or changed warnings need their document.
+    """
+    # Keyed by the identity of the warning each one was enriched from
+    enriched = {
+        id(warning.derived_from[0]): warning
+        for warning in previous
+        if warning.derived_from
+    }
+    for warning in warnings:
+        if id(warning) in enriched:
+            continue
+        if (document := documents.get(cap_key(warning))) is not None:
+            enriched[id(warning)] = enrich_warning(warning, document)
+    return [enriched.get(id(warning), warning) for warning in warnings]
+
+
+def match_warnings(
+    matcher: MultiAreaMatcher,
+    geo_matcher: GeoMatcher,
+    warnings: list[Warning],
+    prefilter: MultiWarningFilter | None = None,
+) -> tuple[list[frozenset[str]], list[frozenset[AreaKey]]]:
+    """Return the matching entry IDs and (entry ID, area) pairs for each warning.
+
+    The ``prefilter`` of the entries is applied to the CAP fields first:
+    entries never match a warning their filter rejects, and warnings that
+    every entry rejects skip area matching altogether.
+    """
+    if not prefilter:
+        area_matches = matcher.match_all_areas(warnings)
+        return [
+            matcher.entries_for(area_keys).union(geo_matches)
+            for area_keys, geo_matches in zip(area_matches, geo_matcher.match_all(warnings))
+        ], area_matches
+
+    entry_ids = matcher.entry_ids.union(geo_matcher.locations, geo_matcher.geocodes)
+    rejected = [prefilter.rejected_by(warning) for warning in warnings]
+    candidates = [
+        position
+        for position, entries in enumerate(rejected)
+        if not entry_ids <= entries
+    ]
+    candidate_warnings = [warnings[position] for position in candidates]
+    matches = [frozenset()] * len(warnings)
+    area_matches: list[frozenset[AreaKey]] = [frozenset()] * len(warnings)
+    for position, area_keys, geo_matches in zip(
+        candidates,
+        matcher.match_all_areas(candidate_warnings),
+        geo_matcher.match_all(candidate_warnings),
+    ):
+        if entries := rejected[position]:
+            area_keys = frozenset(key for key in area_keys if key[0] not in entries)
+        matches[position] = (
+            matcher.entries_for(area_keys).union(geo_matches).difference(entries)
+        )
+        area_matches[position] = area_keys
+    return matches, area_matches
+
+
+def finish_pipeline(
+    parsed: ParsedFeeds,
+    previous: list[Warning],
+    previous_matches: list[frozenset[str]],
+    previous_area_matches: list[frozenset[AreaKey]],
+    matcher: MultiAreaMatcher,
+    geo_matcher: GeoMatcher,
+    prefilter: MultiWarningFilter | None = None,
+    documents: Mapping[CapKey, dict[str, Any]] | None = None,
+    cap_contents: Mapping[CapKey, bytes] | None = None,
+) -> PipelineResult:
+    """Enrich and match the merged warnings.
+
+    ``documents`` holds the cached CAP documents to enrich the warnings with,
+    and ``cap_contents`` the downloaded ones still to be parsed; without
+    ``documents`` the warnings are not enriched.  Only warnings that are not
+    in ``previous`` are matched, the others keep their ``previous_matches``
+    and ``previous_area_matches``.
+    """
+    new_documents = {}
+    for key, content in (cap_contents or {}).items():
+        try:
+            new_documents[key] = parse_cap_document(content)
+        except CapFormatError as err:
+            _LOGGER.debug("Invalid CAP document for warning %s: %s", key[0], err)
+
+    warnings = parsed.merged
+    if documents is not None:
+        warnings = enrich_warnings(warnings, previous, {**documents, **new_documents})
+
+    known = {
+        warning.id: (warning, entry_ids, area_keys)
+        for warning, entry_ids, area_keys in zip(
+            previous, previous_matches, previous_area_matches
+        )
+    }
+    changed = [
+        warning for warning in warnings if known.get(warning.id, (None,))[0] is not warning
+    ]
+    start = time.perf_counter()
+    changed_matches = dict(
+        zip(
+            map(id, changed),
+            zip(*match_warnings(matcher, geo_matcher, changed, prefilter)),
+        )
+    )
+    match_seconds = time.perf_counter() - start
+    matches = [
+        changed_matches[id(warning)]
+        if id(warning) in changed_matches
+        else known[warning.id][1:]
+        for warning in warnings
+    ]
+    return PipelineResult(
+        feeds=parsed.feeds,
+        merged=parsed.merged,
+        warnings=warnings,
+        matches=[entry_ids for entry_ids, _ in matches],
+        area_matches=[area_keys for _, area_keys in matches],
+        changed=len(changed),
+        documents=new_documents,
+        parse_seconds=parsed.parse_seconds,
+        match_seconds=match_seconds,
+    )
+
+
+def run_pipeline(
+    contents: Mapping[str, bytes],
+    feeds: Mapping[str, list[Warning]],
+    merged: list[Warning],
+    previous: list[Warning],
+    previous_matches: list[frozenset[str]],
+    previous_area_matches: list[frozenset[AreaKey]],
+    matcher: MultiAreaMatcher,
+    geo_matcher: GeoMatcher,
+    prefilter: MultiWarningFilter | None = None,
+) -> PipelineResult:
+    """Run the whole chain from feed bytes to matched warnings in one call.
+
+    This is the single executor job of a poll.  When CAP documents are used,
+    the service runs ``parse_feeds`` and ``finish_pipeline`` as two jobs
+    instead, to download the documents of the parsed warnings in between.
+    """
+    return finish_pipeline(
+        parse_feeds(contents, feeds, merged),
+        previous,
+        previous_matches,
+        previous_area_matches,
+        matcher,
+        geo_matcher,
+        prefilter,
+    )
@@ -0,0 +1,94 @@
+"""Index of Finnish regions, municipalities and sea areas by name.
+
+The index is built by ``scripts/build_place_index.py`` and shipped as
+``places.json``: every place with its parent region, and a sorted array of
+casefolded names in Finnish, Swedish and English, including the Finnish
+case forms used in warning texts ("Tampereella", "Uudellamaalla").
+"""
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+PLACE_INDEX_FILE = Path(__file__).with_name("places.json")
+
+# Words of a text, keeping hyphenated names such as "Etelä-Pohjanmaa" whole
+WORD_PATTERN = re.compile(r"\w+(?:-\w+)*")
+# Separators between the parts of a name of several words or a compound
+PART_SEPARATOR = re.compile(r"[ -]")
+
+
+def normalize_name(name: str) -> str:
+    """Return a name the way it is stored in the index."""
+    return " ".join(WORD_PATTERN.findall(name.casefold()))
+
+
+@dataclass(frozen=True, slots=True)
+class PlaceIndex:
+    """Canonical place IDs by name, with each place's parent."""
+
+    # Place IDs such as "municipality:helsinki", by position
+    ids: tuple[str, ...]
+    # Position of each place's parent, or None
+    parents: tuple[int | None, ...]
+    # Position of the place of each normalized name
+    names: dict[str, int]
+
+    @classmethod
+    def from_json(cls, data: dict) -> PlaceIndex:
+        """Build the index from the contents of ``places.json``."""
+        return cls(
+            ids=tuple(place_id for place_id, _ in data["places"]),
+            parents=tuple(parent for _, parent in data["places"]),
+            names=dict(data["names"]),
+        )
+
+    def resolve(self, name: str) -> str | None:
+        """Return the ID of the place with this name or name form, or None."""
+        position = self.names.get(normalize_name(name))
+        return None if position is None else self.ids[position]
+
+    def lineage(self, place_id: str) -> list[str]:
+        """Return the place and the places containing it, innermost first."""
+        position: int | None = self.ids.index(place_id)
+        lineage = []
+        while position is not None:
+            lineage.append(self.ids[position])
+            position = self.parents[position]
+        return lineage
+
+    def names_for(self, place_ids: Iterable[str]) -> dict[str, str]:
+        """Return the names of the places, mapped to their place ID.
+
+        Longer names containing one of them, such as "Norra Österbotten"
+        for "Österbotten" or "Etelä-Pohjanmaa" for "Pohjanmaa", are included
+        with their own place, so a search for the names that prefers the
+        longest one does not mistake them.
+        """
+        wanted = {self.ids.index(place_id) for place_id in place_ids}
+        names = {name: position for name, position in self.names.items() if position in wanted}
+        words = {word for name in names for word in PART_SEPARATOR.split(name)}
+        names.update(
+            (name, position)
+            for name, position in self.names.items()
+            if len(parts := PART_SEPARATOR.split(name)) > 1 and not words.isdisjoint(parts)
+        )
+        return {name: self.ids[position] for name, position in names.items()}
+
+    def resolve_all(self, names: Iterable[str]) -> dict[str, str | None]:
+        """Return the place ID of each name, None for unknown names."""
+        return {name: self.resolve(name) for name in names}
+
+
+@cache
+def place_index() -> PlaceIndex:
+    """Return the place index, loading it on first use.
+
+    This reads a file, so the first call should be made in the executor.
+    """
+    with PLACE_INDEX_FILE.open(encoding="utf-8") as file:
+        return PlaceIndex.from_json(json.load(file))
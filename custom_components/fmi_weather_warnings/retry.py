@@ -0,0 +1,121 @@
+"""Retries with jittered backoff and a circuit breaker for feed fetches."""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+# HTTP statuses worth retrying, everything else fails right away
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """Return the delay before retry ``attempt`` (0-based), with full jitter.
+
+    The delay is drawn uniformly between zero and the exponential backoff
+    for the attempt, so clients that failed together do not retry together.
+    """
+    return rng() * min(max_delay, base_delay * 2**attempt)
+
+
+async def async_retry(
+    call: Callable[[], Awaitable[_T]],
+    retries: int,
+    base_delay: float,
+    max_delay: float,
+    is_retryable: Callable[[Exception], bool],
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    rng: Callable[[], float] = random.random,
+) -> _T:
+    """Await ``call``, retrying retryable failures up to ``retries`` times."""
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except Exception as err:  # noqa: BLE001 - filtered by is_retryable
+            if attempt >= retries or not is_retryable(err):
+                raise
+        await sleep(backoff_delay(attempt, base_delay, max_delay, rng))
+        attempt += 1
+
+
+class CircuitBreaker:
+    """Stop calling a failing service for a while.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    ``allow_request`` returns False until ``reset_timeout`` seconds have
+    passed.  It then lets a single trial request through (half open): a
+    success closes the breaker again, a failure reopens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.rejected_requests = 0
+        self.opened_at: float | None = None
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be made now."""
+        if self.state == STATE_OPEN:
+            if self._clock() - self.opened_at < self.reset_timeout:
+                self.rejected_requests += 1
+                return False
+            self.state = STATE_HALF_OPEN
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.total_successes += 1
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the breaker if needed."""
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        if (
+            self.state == STATE_HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = STATE_OPEN
+            self.opened_at = self._clock()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "total_successes": self.total_successes,
+            "rejected_requests": self.rejected_requests,
+            "seconds_until_retry": (
+                max(0.0, self.opened_at + self.reset_timeout - self._clock())
+                if self.state == STATE_OPEN
+                else None
+            ),
+        }
@@ -0,0 +1,192 @@
+"""Streaming parser for the FMI CAP RSS feed."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Any
+import zlib
+from xml.etree.ElementTree import Element, ParseError, iterparse
+
+from .model import Warning, make_warning
+
+CAP_NAMESPACE_PREFIX = "{urn:oasis:names:tc:emergency:cap:"
+
+# RSS item children copied into the warning as-is
+RSS_FIELDS = {
+    "title": "title",
+    "link": "link",
+    "pubDate": "published",
+    "description": "summary",
+}
+
+# CAP extension elements copied into the warning, keyed by local name
+CAP_FIELDS = {
+    "event": "event",
+    "headline": "headline",
+    "description": "description",
+    "instruction": "instruction",
+    "severity": "severity",
+    "certainty": "certainty",
+    "urgency": "urgency",
+    "sender": "sender",
+}
+
+# CAP extension elements parsed into timezone-aware datetimes
+CAP_TIME_FIELDS = {
+    "effective": "effective",
+    "expires": "expires",
+}
+
+# CAP extension elements that together describe the affected area
+CAP_AREA_FIELDS = ("areaDesc", "area", "geocode")
+
+
+def parse_timestamp(value: str | None) -> datetime | None:
+    """Parse a CAP timestamp into a timezone-aware datetime.
+
+    Timestamps without an offset are taken to be UTC.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value[-1:] in ("Z", "z"):
+        # Python 3.10 does not read the UTC designator
+        value = f"{value[:-1]}+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def parse_polygon(text: str) -> tuple[tuple[float, float], ...]:
+    """Parse a CAP polygon, a space separated list of "lat,lon" pairs."""
+    points = []
+    for pair in text.split():
+        lat, _, lon = pair.partition(",")
+        try:
+            points.append((float(lat), float(lon)))
+        except ValueError:
+            continue
+    return tuple(points)
+
+
+def warning_id(identifier: str | None, link: str, published: str) -> str:
+    """Return the cache key of a warning.
+
+    This is the CAP identifier, or the link and publish time for items
+    without one.
+    """
+    return identifier or f"{link}|{published}"
+
+
+def _item_key(item: Element) -> tuple[str, int]:
+    """Return the cache key and a content fingerprint of an ``<item>``."""
+    identifier = link = published = ""
+    texts = []
+    for child in item:
+        tag = child.tag
+        text = "".join(child.itertext())
+        texts.append(f"{tag}\0{text}")
+        if tag == "link":
+            link = text
+        elif tag == "pubDate":
+            published = text
+        elif tag.startswith(CAP_NAMESPACE_PREFIX) and tag.endswith("}identifier"):
+            identifier = text.strip()
+    fingerprint = zlib.crc32("\0".join(texts).encode())
+    return warning_id(identifier, link, published), fingerprint
+
+
+class FeedFormatError(ValueError):
+    """Raised when the content is not an RSS feed this parser understands."""
+
+
+def parse_feed(
+    content: bytes, known: Mapping[str, Warning] | None = None
+) -> list[Warning]:
+    """Parse FMI RSS/CAP content into warnings.
+
+    Items are streamed with ``iterparse`` and every ``<item>`` element is
+    cleared and detached as soon as its fields have been read, so memory use
+    stays flat regardless of the feed size.
+
+    ``known`` maps warning IDs to the warnings of the previous poll.  Items
+    whose content fingerprint is unchanged reuse that very warning instead
+    of being parsed again, so callers can detect changes by identity.
+    """
+    warnings: list[Warning] = []
+    stack: list[Element] = []
+
+    try:
+        for event, elem in iterparse(BytesIO(content), events=("start", "end")):
+            if event == "start":
+                if not stack and elem.tag != "rss":
+                    raise FeedFormatError(f"Unexpected root element: {elem.tag}")
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if elem.tag == "item":
+                key, fingerprint = _item_key(elem)
+                cached = known.get(key) if known else None
+                if cached is None or cached.fingerprint != fingerprint:
+                    cached = _parse_item(elem, key, fingerprint)
+                warnings.append(cached)
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+    except ParseError as err:
+        raise FeedFormatError(f"Invalid XML: {err}") from err
+
+    return warnings
+
+
+def _parse_item(item: Element, key: str, fingerprint: int) -> Warning:
+    """Build a warning from a single ``<item>`` element."""
+    warning: dict[str, Any] = {
+        "id": key,
+        "fingerprint": fingerprint,
+        "title": "",
+        "link": "",
+        "published": "",
+        "summary": "",
+    }
+    area_info: dict[str, str] = {}
+
+    for child in item:
+        tag = child.tag
+        if tag.startswith(CAP_NAMESPACE_PREFIX):
+            name = tag.rpartition("}")[2]
+            if name in CAP_FIELDS:
+                warning[CAP_FIELDS[name]] = child.text or ""
+            elif name in CAP_TIME_FIELDS:
+                warning[CAP_TIME_FIELDS[name]] = parse_timestamp(child.text)
+            elif name in CAP_AREA_FIELDS:
+                area_info[name] = " ".join(
+                    text.strip() for text in child.itertext() if text.strip()
+                )
+                if name == "geocode":
+                    warning.setdefault("geocodes", []).extend(
+                        value.text.strip()
+                        for value in child
+                        if value.tag.rpartition("}")[2] == "value" and value.text
+                    )
+            elif name == "polygon" and child.text:
+                warning.setdefault("polygons", []).append(parse_polygon(child.text))
+        elif tag in RSS_FIELDS:
+            warning[RSS_FIELDS[tag]] = child.text or ""
+
+    if area_info:
+        # Combine all area information in the same order as the CAP fields
+        warning["area"] = " ".join(
+            area_info[name] for name in CAP_AREA_FIELDS if area_info.get(name)
+        )
+    else:
+        # Sometimes the area is only mentioned in the title or summary
+        warning["area"] = f"{warning['title'].lower()} {warning['summary'].lower()}"
+
+    return make_warning(warning)
@@ -0,0 +1,84 @@
+"""Adaptive poll scheduling for FMI Weather Warnings."""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .model import Warning
+
+# Warning fields whose timestamps change the set of active warnings
+BOUNDARY_FIELDS = ("effective", "expires")
+
+
+def next_boundary(warnings: Iterable[Warning], now: datetime) -> datetime | None:
+    """Return the earliest effective or expires time after ``now``."""
+    earliest = None
+    for warning in warnings:
+        for field in BOUNDARY_FIELDS:
+            moment = getattr(warning, field)
+            if moment is not None and moment > now and (earliest is None or moment < earliest):
+                earliest = moment
+    return earliest
+
+
+class PollScheduler:
+    """Decide when to poll the feed next.
+
+    The interval drops to the minimum whenever the feed changes and doubles
+    on every unchanged poll up to the maximum.  Warning boundaries that fall
+    before the next poll are handled with a local refresh that needs no
+    network request.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        initial_interval: float | None = None,
+        backoff: float = 2.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._clock = clock
+        self.interval = self._clamp(initial_interval or min_interval)
+        self.next_poll = clock()
+
+    def _clamp(self, interval: float) -> float:
+        """Limit an interval to the configured bounds."""
+        return max(self.min_interval, min(interval, self.max_interval))
+
+    def set_bounds(self, min_interval: float, max_interval: float) -> None:
+        """Change the interval bounds, keeping the current interval within them.
+
+        A pending poll further away than the new interval is brought forward.
+        """
+        last_poll = self.next_poll - self.interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = self._clamp(self.interval)
+        self.next_poll = min(self.next_poll, last_poll + self.interval)
+
+    def record_poll(self, changed: bool) -> float:
+        """Record a poll result and return the interval until the next one."""
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = self._clamp(self.interval * self.backoff)
+        self.next_poll = self._clock() + self.interval
+        return self.interval
+
+    def next_wakeup(self, boundary: datetime | None = None) -> tuple[float, bool]:
+        """Return the delay until the next wakeup and whether it needs a fetch.
+
+        A warning boundary before the next poll wakes up early without a fetch.
+        """
+        now = self._clock()
+        if boundary is not None and boundary.timestamp() < self.next_poll:
+            return max(0.0, boundary.timestamp() - now), False
+        return max(0.0, self.next_poll - now), True
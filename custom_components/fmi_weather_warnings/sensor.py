@@ -2,33 +2,102 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .attributes import (
+    AttributeCache,
+    build_attributes,
+    build_warning_attributes,
+)
 from .const import (
-    ATTR_AREA,
-    ATTR_CERTAINTY,
-    ATTR_DESCRIPTION,
-    ATTR_EFFECTIVE,
-    ATTR_EVENT,
-    ATTR_EXPIRES,
-    ATTR_HEADLINE,
-    ATTR_INSTRUCTION,
-    ATTR_SENDER,
-    ATTR_SEVERITY,
-    ATTR_URGENCY,
-    CONF_AREA,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_WARNING_ENTITIES,
     DOMAIN,
 )
-from .coordinator import FMIWeatherWarningsCoordinator
+from .coordinator import FMIWeatherWarningsCoordinator, device_name, entry_config
+from .merge import localize
+from .model import Warning
 
 _LOGGER = logging.getLogger(__name__)
 
+# Feed metrics exposed by the optional diagnostic sensors, with the function
+# reading each one from the coordinator
+DIAGNOSTIC_SENSORS: tuple[
+    tuple[SensorEntityDescription, Callable[[FMIWeatherWarningsCoordinator], Any]], ...
+] = (
+    (
+        SensorEntityDescription(
+            key="fetch_time",
+            name="Fetch time",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        ),
+        lambda coordinator: coordinator.feed.metrics.fetch_ms,
+    ),
+    (
+        SensorEntityDescription(
+            key="bytes_received",
+            name="Bytes received",
+            icon="mdi:download-network",
+            device_class=SensorDeviceClass.DATA_SIZE,
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+        ),
+        lambda coordinator: coordinator.feed.metrics.bytes_received,
+    ),
+    (
+        SensorEntityDescription(
+            key="parse_time",
+            name="Parse time",
+            icon="mdi:timer-cog-outline",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        ),
+        lambda coordinator: coordinator.feed.metrics.parse_ms,
+    ),
+    (
+        SensorEntityDescription(
+            key="match_time",
+            name="Match time",
+            icon="mdi:timer-search-outline",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        ),
+        lambda coordinator: coordinator.feed.metrics.match_ms,
+    ),
+    (
+        SensorEntityDescription(
+            key="feed_warnings",
+            name="Feed warnings",
+            icon="mdi:rss",
+        ),
+        lambda coordinator: len(coordinator.feed.warnings),
+    ),
+    (
+        SensorEntityDescription(
+            key="matched_warnings",
+            name="Matched warnings",
+            icon="mdi:filter-outline",
+        ),
+        lambda coordinator: coordinator.matched,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -37,6 +106,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up FMI Weather Warnings sensor based on a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    config = entry_config(entry)
     
     async_add_entities(
         [
@@ -44,10 +114,123 @@ async def async_setup_entry(
         ],
         True,
     )
+    
+    if config.get(CONF_DIAGNOSTIC_SENSORS, False):
+        async_add_entities(
+            FMIDiagnosticSensor(coordinator, entry, description, value_fn)
+            for description, value_fn in DIAGNOSTIC_SENSORS
+        )
+
+    _async_remove_orphaned_warning_entities(hass, coordinator, entry)
+    if config.get(CONF_WARNING_ENTITIES, False):
+        manager = WarningEntityManager(hass, coordinator, entry, async_add_entities)
+        manager.async_sync()
+        entry.async_on_unload(coordinator.async_add_listener(manager.async_sync))
+
+
+def _device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device shared by the entities of a config entry."""
+    return {
+        "identifiers": {(DOMAIN, entry.entry_id)},
+        "name": device_name(entry),
+        "manufacturer": "Finnish Meteorological Institute",
+        "model": "Weather Warnings",
+    }
+
+
+def _warning_unique_id(entry: ConfigEntry, warning_id: str) -> str:
+    """Return the unique ID of the entity of a single warning."""
+    return f"{entry.entry_id}_{warning_id}"
+
+
+@callback
+def _async_remove_orphaned_warning_entities(
+    hass: HomeAssistant, coordinator: FMIWeatherWarningsCoordinator, entry: ConfigEntry
+) -> None:
+    """Remove the registry entries of warnings that ended while Home Assistant was stopped.
+
+    Every entity of the entry other than the main and diagnostic sensors is
+    the entity of a warning, kept only while that warning is active.
+    """
+    keep = {f"{entry.entry_id}_active_warnings"}
+    keep.update(
+        f"{entry.entry_id}_{description.key}" for description, _ in DIAGNOSTIC_SENSORS
+    )
+    if entry_config(entry).get(CONF_WARNING_ENTITIES, False):
+        keep.update(
+            _warning_unique_id(entry, warning.id)
+            for warning in coordinator.data["warnings"]
+        )
+
+    registry = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity_entry.unique_id not in keep:
+            _LOGGER.debug("Removing %s of an expired warning", entity_entry.entity_id)
+            registry.async_remove(entity_entry.entity_id)
+
+
+class WarningEntityManager:
+    """Keep one entity per active warning in sync with the coordinator.
+
+    Entities are added and removed as warnings appear and expire, and only
+    the entities whose warning changed write a new state.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: FMIWeatherWarningsCoordinator,
+        entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.entry = entry
+        self._async_add_entities = async_add_entities
+        self._entities: dict[str, FMIWarningSensor] = {}
+        self._available = coordinator.last_update_success
+
+    @callback
+    def async_sync(self) -> None:
+        """Apply the coordinator's current warnings to the entities."""
+        current = {warning.id: warning for warning in self.coordinator.data["warnings"]}
+
+        for warning_id in self._entities.keys() - current.keys():
+            self._async_remove(self._entities.pop(warning_id))
+
+        available_changed = self._available != self.coordinator.last_update_success
+        self._available = self.coordinator.last_update_success
+        for warning_id, entity in self._entities.items():
+            changed = entity.async_set_warning(current[warning_id])
+            if (changed or available_changed) and entity.hass is not None:
+                entity.async_write_ha_state()
+
+        new_entities = [
+            FMIWarningSensor(self.coordinator, self.entry, warning)
+            for warning_id, warning in current.items()
+            if warning_id not in self._entities
+        ]
+        if new_entities:
+            self._entities.update((entity.warning_id, entity) for entity in new_entities)
+            self._async_add_entities(new_entities)
+
+    @callback
+    def _async_remove(self, entity: FMIWarningSensor) -> None:
+        """Remove an entity of an expired warning, including its registry entry."""
+        registry = er.async_get(self.hass)
+        if entity.entity_id and registry.async_get(entity.entity_id):
+            registry.async_remove(entity.entity_id)
+        else:
+            self.hass.async_create_task(entity.async_remove())
 
 
 class FMIWeatherWarningsSensor(CoordinatorEntity, SensorEntity):
-    """Representation of FMI Weather Warnings sensor."""
+    """The active warnings of a config entry.
+
+    With several areas each warning is listed and counted once, however many
+    of the areas it concerns, and the count per area is in ``areas``.
+    """
 
     _attr_has_entity_name = True
     _attr_icon = "mdi:alert"
@@ -60,13 +243,8 @@ class FMIWeatherWarningsSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._attr_unique_id = f"{entry.entry_id}_active_warnings"
         self._attr_name = "Active warnings"
-        area = entry.data.get(CONF_AREA, "")
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": f"FMI Weather Warnings{' - ' + area if area else ''}",
-            "manufacturer": "Finnish Meteorological Institute",
-            "model": "Weather Warnings",
-        }
+        self._attr_device_info = _device_info(entry)
+        self._attributes = AttributeCache(build_attributes)
 
     @property
     def native_value(self) -> int:
@@ -76,61 +254,91 @@ class FMIWeatherWarningsSensor(CoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
-        warnings = self.coordinator.data.get("warnings", [])
-        
-        attributes = {
-            "warnings": [],
-        }
-        
-        for warning in warnings:
-            warning_attrs = {}
-            
-            # Add all available warning attributes
-            if "title" in warning:
-                warning_attrs["title"] = warning["title"]
-            
-            if "link" in warning:
-                warning_attrs["link"] = warning["link"]
-            
-            if "published" in warning:
-                warning_attrs["published"] = warning["published"]
-            
-            if "summary" in warning:
-                warning_attrs["summary"] = warning["summary"]
-            
-            if "event" in warning:
-                warning_attrs[ATTR_EVENT] = warning["event"]
-            
-            if "headline" in warning:
-                warning_attrs[ATTR_HEADLINE] = warning["headline"]
-            
-            if "description" in warning:
-                warning_attrs[ATTR_DESCRIPTION] = warning["description"]
-            
-            if "instruction" in warning:
-                warning_attrs[ATTR_INSTRUCTION] = warning["instruction"]
-            
-            if "severity" in warning:
-                warning_attrs[ATTR_SEVERITY] = warning["severity"]
-            
-            if "certainty" in warning:
-                warning_attrs[ATTR_CERTAINTY] = warning["certainty"]
-            
-            if "urgency" in warning:
-                warning_attrs[ATTR_URGENCY] = warning["urgency"]
-            
-            if "effective" in warning:
-                warning_attrs[ATTR_EFFECTIVE] = warning["effective"]
-            
-            if "expires" in warning:
-                warning_attrs[ATTR_EXPIRES] = warning["expires"]
-            
-            if "area" in warning:
-                warning_attrs[ATTR_AREA] = warning["area"]
-            
-            if "sender" in warning:
-                warning_attrs[ATTR_SENDER] = warning["sender"]
-            
-            attributes["warnings"].append(warning_attrs)
-        
-        return attributes
+        return self._attributes.get(
+            (self.coordinator.warnings_version, self.coordinator.config_version),
+            self.coordinator.data.get("warnings", []),
+            self.coordinator.attribute_fields,
+            self.coordinator.data.get("upcoming", []),
+            self.coordinator.language,
+            self.coordinator.data.get("area_counts"),
+        )
+
+
+class FMIDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """A metric of the shared feed or of this entry's matching."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: FMIWeatherWarningsCoordinator,
+        entry: ConfigEntry,
+        description: SensorEntityDescription,
+        value_fn: Callable[[FMIWeatherWarningsCoordinator], Any],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._value_fn = value_fn
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = _device_info(entry)
+
+    @property
+    def native_value(self) -> Any:
+        """Return the current value of the metric."""
+        return self._value_fn(self.coordinator)
+
+
+class FMIWarningSensor(SensorEntity):
+    """A single active FMI weather warning.
+
+    The state is the warning's severity.  Updates are pushed by the
+    ``WarningEntityManager`` only when the warning itself changed.
+    """
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:alert-circle"
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: FMIWeatherWarningsCoordinator,
+        entry: ConfigEntry,
+        warning: Warning,
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.warning_id: str = warning.id
+        self._attr_unique_id = _warning_unique_id(entry, self.warning_id)
+        self._attr_device_info = _device_info(entry)
+        self._warning: Warning | None = None
+        self._config_version: int | None = None
+        self.async_set_warning(warning)
+
+    @property
+    def available(self) -> bool:
+        """Return if the warning data is current."""
+        return self.coordinator.last_update_success
+
+    @callback
+    def async_set_warning(self, warning: Warning) -> bool:
+        """Update the warning; return True if it changed."""
+        # Unchanged warnings keep the same Warning record across polls
+        if (
+            warning is self._warning
+            and self._config_version == self.coordinator.config_version
+        ):
+            return False
+        self._warning = warning
+        self._config_version = self.coordinator.config_version
+        localized = localize(warning, self.coordinator.language)
+        self._attr_name = (
+            localized.headline or localized.title or self.warning_id
+        )
+        self._attr_native_value = warning.severity.value if warning.severity else None
+        self._attr_extra_state_attributes = build_warning_attributes(
+            warning, self.coordinator.attribute_fields, self.coordinator.language
+        )
+        return True
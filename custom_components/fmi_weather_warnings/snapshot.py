@@ -0,0 +1,118 @@
+"""Compact serialization of the parsed feed for the on-disk cache."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from .model import WARNING_FIELDS, Warning, make_warning
+from .rss import parse_timestamp
+
+# Warning fields stored in the snapshot, in row order; merged translations
+# are rebuilt from the language feeds when the snapshot is loaded
+SNAPSHOT_FIELDS = tuple(key for key in WARNING_FIELDS if key != "translations")
+
+# Snapshot fields holding datetimes, stored as ISO 8601 strings
+SNAPSHOT_TIME_FIELDS = frozenset({"effective", "expires"})
+
+
+def _dump_value(key: str, value: Any) -> Any:
+    """Return a JSON serializable form of a warning value."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if key == "polygons":
+        return [[list(point) for point in polygon] for polygon in value] or None
+    if isinstance(value, tuple):
+        return [list(item) if isinstance(item, tuple) else item for item in value] or None
+    return value
+
+
+def _load_value(key: str, value: Any) -> Any:
+    """Restore a warning value from its serialized form."""
+    if key in SNAPSHOT_TIME_FIELDS:
+        return parse_timestamp(value)
+    return value
+
+
+def _dump_warnings(warnings: list[Warning]) -> list[list[Any]]:
+    """Serialize warnings as rows of values in ``SNAPSHOT_FIELDS`` order."""
+    return [
+        [
+            _dump_value(key, value) if (value := getattr(warning, key)) is not None else None
+            for key in SNAPSHOT_FIELDS
+        ]
+        for warning in warnings
+    ]
+
+
+def _load_warnings(fields: list[str], rows: list[list[Any]]) -> list[Warning] | None:
+    """Restore warnings from rows of values in ``fields`` order."""
+    warnings = []
+    for row in rows:
+        values = {
+            key: _load_value(key, value)
+            for key, value in zip(fields, row)
+            if value is not None
+        }
+        if "id" not in values:
+            return None
+        warnings.append(make_warning(values))
+    return warnings
+
+
+def dump_snapshot(
+    feeds: Mapping[str, Mapping[str, Any]], fetched_at: datetime
+) -> dict[str, Any]:
+    """Serialize the parsed feeds and their validators.
+
+    ``feeds`` maps a language to its ``warnings``, ``etag``, ``last_modified``
+    and ``content_hash``.  Each warning is stored as a row of values in
+    ``SNAPSHOT_FIELDS`` order instead of a dictionary, so keys are not
+    repeated for every warning.  Missing values are stored as None.
+    """
+    return {
+        "fetched_at": fetched_at.isoformat(),
+        "fields": list(SNAPSHOT_FIELDS),
+        "feeds": {
+            language: {
+                "etag": feed.get("etag"),
+                "last_modified": feed.get("last_modified"),
+                "content_hash": feed.get("content_hash"),
+                "warnings": _dump_warnings(feed["warnings"]),
+            }
+            for language, feed in feeds.items()
+        },
+    }
+
+
+def load_snapshot(data: Mapping[str, Any]) -> dict[str, Any] | None:
+    """Restore a snapshot written by ``dump_snapshot``.
+
+    Returns None if the snapshot is incomplete.  Rows are read by the field
+    names stored alongside them, so snapshots stay readable when fields are
+    added or reordered.
+    """
+    fetched_at = parse_timestamp(data.get("fetched_at"))
+    fields = data.get("fields")
+    feeds = data.get("feeds")
+    if fetched_at is None or not isinstance(fields, list) or not isinstance(feeds, dict):
+        return None
+
+    restored = {}
+    for language, feed in feeds.items():
+        rows = feed.get("warnings")
+        if not isinstance(rows, list):
+            return None
+        if (warnings := _load_warnings(fields, rows)) is None:
+            return None
+        restored[language] = {
+            "etag": feed.get("etag"),
+            "last_modified": feed.get("last_modified"),
+            "content_hash": feed.get("content_hash"),
+            "warnings": warnings,
+        }
+
+    return {"fetched_at": fetched_at, "feeds": restored}
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Build the Finnish place-name index shipped with the integration.
+
+Every region, municipality and sea area below is written to
+``custom_components/fmi_weather_warnings/places.json`` with its Finnish,
+Swedish and English names, the Finnish case forms used in warning texts and
+the English and Swedish adjective forms of the regions.
+The index holds each place with its parent and a sorted array of
+casefolded names pointing to it, so it is loaded without any processing
+beyond building a lookup table.
+
+Run this after editing the tables; ``--check`` exits with an error when the
+shipped index is out of date.
+
+Usage: python scripts/build_place_index.py [--check]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT = os.path.join(ROOT, 'custom_components', 'fmi_weather_warnings', 'places.json')
+INDEX_VERSION = 1
+# Words of a name, the same way the integration splits warning texts
+WORD_PATTERN = re.compile(r'\w+(?:-\w+)*')
+
+
+def cases(stem, ending):
+    """Return the local case forms of a Finnish oblique stem.
+
+    ``ending`` is the place's inessive or adessive ending (``ssa``, ``ssä``,
+    ``lla`` or ``llä``), which decides both the case set and the vowel.
+    """
+    vowel = ending[-1]
+    if ending.startswith('ss'):
+        return [stem + 'ss' + vowel, stem + 'st' + vowel]
+    return [stem + 'll' + vowel, stem + 'lt' + vowel, stem + 'lle']
+
+
+# Regions: key, names in Finnish, Swedish and English, then the Finnish forms
+REGIONS = [
+    ('uusimaa', ['Uusimaa', 'Nyland'],
+     ['Uudenmaan', 'Uudellamaalla', 'Uudeltamaalta', 'Uudellemaalle']),
+    ('varsinais-suomi', ['Varsinais-Suomi', 'Egentliga Finland', 'Southwest Finland', 'Finland Proper'],
+     ['Varsinais-Suomen', 'Varsinais-Suomessa', 'Varsinais-Suomesta', 'Varsinais-Suomeen']),
+    ('satakunta', ['Satakunta'],
+     ['Satakunnan', 'Satakunnassa', 'Satakunnasta', 'Satakuntaan']),
+    ('kanta-häme', ['Kanta-Häme', 'Egentliga Tavastland', 'Tavastia Proper'],
+     ['Kanta-Hämeen', 'Kanta-Hämeessä', 'Kanta-Hämeestä', 'Kanta-Hämeeseen']),
+    ('pirkanmaa', ['Pirkanmaa', 'Birkaland'],
+     ['Pirkanmaan', *cases('Pirkanmaa', 'lla')]),
+    ('päijät-häme', ['Päijät-Häme', 'Päijänne-Tavastland', 'Päijänne Tavastia'],
+     ['Päijät-Hämeen', 'Päijät-Hämeessä', 'Päijät-Hämeestä', 'Päijät-Hämeeseen']),
+    ('kymenlaakso', ['Kymenlaakso', 'Kymmenedalen'],
+     ['Kymenlaakson', *cases('Kymenlaakso', 'ssa'), 'Kymenlaaksoon']),
+    ('etelä-karjala', ['Etelä-Karjala', 'Södra Karelen', 'South Karelia'],
+     ['Etelä-Karjalan', *cases('Etelä-Karjala', 'ssa'), 'Etelä-Karjalaan']),
+    ('etelä-savo', ['Etelä-Savo', 'Södra Savolax', 'South Savo'],
+     ['Etelä-Savon', *cases('Etelä-Savo', 'ssa'), 'Etelä-Savoon']),
+    ('pohjois-savo', ['Pohjois-Savo', 'Norra Savolax', 'North Savo'],
+     ['Pohjois-Savon', *cases('Pohjois-Savo', 'ssa'), 'Pohjois-Savoon']),
+    ('pohjois-karjala', ['Pohjois-Karjala', 'Norra Karelen', 'North Karelia'],
+     ['Pohjois-Karjalan', *cases('Pohjois-Karjala', 'ssa'), 'Pohjois-Karjalaan']),
+    ('keski-suomi', ['Keski-Suomi', 'Mellersta Finland', 'Central Finland'],
+     ['Keski-Suomen', 'Keski-Suomessa', 'Keski-Suomesta', 'Keski-Suomeen']),
+    ('etelä-pohjanmaa', ['Etelä-Pohjanmaa', 'Södra Österbotten', 'South Ostrobothnia'],
+     ['Etelä-Pohjanmaan', *cases('Etelä-Pohjanmaa', 'lla')]),
+    ('pohjanmaa', ['Pohjanmaa', 'Österbotten', 'Ostrobothnia'],
+     ['Pohjanmaan', *cases('Pohjanmaa', 'lla')]),
+    ('keski-pohjanmaa', ['Keski-Pohjanmaa', 'Mellersta Österbotten', 'Central Ostrobothnia'],
+     ['Keski-Pohjanmaan', *cases('Keski-Pohjanmaa', 'lla')]),
+    ('pohjois-pohjanmaa', ['Pohjois-Pohjanmaa', 'Norra Österbotten', 'North Ostrobothnia'],
+     ['Pohjois-Pohjanmaan', *cases('Pohjois-Pohjanmaa', 'lla')]),
+    ('kainuu', ['Kainuu', 'Kajanaland'],
+     ['Kainuun', *cases('Kainuu', 'ssa'), 'Kainuuseen']),
+    ('lappi', ['Lappi', 'Lappland', 'Lapland'],
+     ['Lapin', *cases('Lapi', 'ssa'), 'Lappiin']),
+    ('ahvenanmaa', ['Ahvenanmaa', 'Åland', 'Åland Islands', 'Aland'],
+     ['Ahvenanmaan', *cases('Ahvenanmaa', 'lla')]),
+]
+
+# English and Swedish forms of the region names: adjectives such as "Northern
+# Ostrobothnia" and "österbottniska", and Swedish genitives such as
+# "Österbottens".  Every form starting with a direction is listed, so the
+# longest name wins over the bare region it ends with.
+REGION_FORMS = {
+    'uusimaa': ['Nylands', 'nyländska'],
+    'varsinais-suomi': ['Southwestern Finland', 'South-West Finland', 'Egentliga Finlands'],
+    'kanta-häme': ['Egentliga Tavastlands'],
+    'pirkanmaa': ['Birkalands'],
+    'päijät-häme': ['Päijänne-Tavastlands'],
+    'kymenlaakso': ['Kymmenedalens', 'Kymi Valley'],
+    'etelä-karjala': ['Southern Karelia', 'South Karelian', 'Southern Karelian',
+                      'Södra Karelens', 'sydkarelska'],
+    'etelä-savo': ['South Savonia', 'Southern Savonia', 'Southern Savo'],
+    'pohjois-savo': ['North Savonia', 'Northern Savonia', 'Northern Savo'],
+    'pohjois-karjala': ['Northern Karelia', 'North Karelian', 'Northern Karelian',
+                        'Norra Karelens', 'nordkarelska'],
+    'keski-suomi': ['Mellersta Finlands'],
+    'etelä-pohjanmaa': ['Southern Ostrobothnia', 'South Ostrobothnian', 'Southern Ostrobothnian',
+                        'Södra Österbottens', 'sydösterbottniska'],
+    'pohjanmaa': ['Ostrobothnian', 'Österbottens', 'österbottniska'],
+    'keski-pohjanmaa': ['Middle Ostrobothnia', 'Central Ostrobothnian',
+                        'Mellersta Österbottens', 'mellanösterbottniska'],
+    'pohjois-pohjanmaa': ['Northern Ostrobothnia', 'North Ostrobothnian', 'Northern Ostrobothnian',
+                          'Norra Österbottens', 'nordösterbottniska'],
+    'kainuu': ['Kajanalands'],
+    'lappi': ['Finnish Lapland', 'Lapplands', 'lappländska'],
+    'ahvenanmaa': ['Ålands', 'åländska'],
+}
+
+# Municipalities: key, region, names, genitive, oblique stem and ending, illative
+MUNICIPALITIES = [
+    ('helsinki', 'uusimaa', ['Helsinki', 'Helsingfors'], 'Helsingin', 'Helsingi', 'ssä', 'Helsinkiin'),
+    ('espoo', 'uusimaa', ['Espoo', 'Esbo'], 'Espoon', 'Espoo', 'ssa', 'Espooseen'),
+    ('vantaa', 'uusimaa', ['Vantaa', 'Vanda'], 'Vantaan', 'Vantaa', 'lla', None),
+    ('porvoo', 'uusimaa', ['Porvoo', 'Borgå'], 'Porvoon', 'Porvoo', 'ssa', 'Porvooseen'),
+    ('kerava', 'uusimaa', ['Kerava', 'Kervo'], 'Keravan', 'Kerava', 'lla', None),
+    ('järvenpää', 'uusimaa', ['Järvenpää', 'Träskända'], 'Järvenpään', 'Järvenpää', 'ssä', 'Järvenpäähän'),
+    ('tuusula', 'uusimaa', ['Tuusula', 'Tusby'], 'Tuusulan', 'Tuusula', 'ssa', 'Tuusulaan'),
+    ('kirkkonummi', 'uusimaa', ['Kirkkonummi', 'Kyrkslätt'], 'Kirkkonummen', 'Kirkkonumme', 'lla', None),
+    ('nurmijärvi', 'uusimaa', ['Nurmijärvi'], 'Nurmijärven', 'Nurmijärve', 'llä', None),
+    ('hyvinkää', 'uusimaa', ['Hyvinkää', 'Hyvinge'], 'Hyvinkään', 'Hyvinkää', 'llä', None),
+    ('lohja', 'uusimaa', ['Lohja', 'Lojo'], 'Lohjan', 'Lohja', 'lla', None),
+    ('vihti', 'uusimaa', ['Vihti', 'Vichtis'], 'Vihdin', 'Vihdi', 'ssä', 'Vihtiin'),
+    ('raasepori', 'uusimaa', ['Raasepori', 'Raseborg'], 'Raaseporin', 'Raasepori', 'ssa', 'Raaseporiin'),
+    ('hanko', 'uusimaa', ['Hanko', 'Hangö'], 'Hangon', 'Hango', 'ssa', 'Hankoon'),
+    ('sipoo', 'uusimaa', ['Sipoo', 'Sibbo'], 'Sipoon', 'Sipoo', 'ssa', 'Sipooseen'),
+    ('mäntsälä', 'uusimaa', ['Mäntsälä'], 'Mäntsälän', 'Mäntsälä', 'ssä', 'Mäntsälään'),
+    ('loviisa', 'uusimaa', ['Loviisa', 'Lovisa'], 'Loviisan', 'Loviisa', 'ssa', 'Loviisaan'),
+    ('turku', 'varsinais-suomi', ['Turku', 'Åbo'], 'Turun', 'Turu', 'ssa', 'Turkuun'),
+    ('salo', 'varsinais-suomi', ['Salo'], 'Salon', 'Salo', 'ssa', 'Saloon'),
+    ('raisio', 'varsinais-suomi', ['Raisio', 'Reso'], 'Raision', 'Raisio', 'ssa', 'Raisioon'),
+    ('kaarina', 'varsinais-suomi', ['Kaarina'], 'Kaarinan', 'Kaarina', 'ssa', 'Kaarinaan'),
+    ('naantali', 'varsinais-suomi', ['Naantali', 'Nådendal'], 'Naantalin', 'Naantali', 'ssa', 'Naantaliin'),
+    ('uusikaupunki', 'varsinais-suomi', ['Uusikaupunki', 'Nystad'], 'Uudenkaupungin', None, None,
+     ['Uudessakaupungissa', 'Uudestakaupungista', 'Uuteenkaupunkiin']),
+    ('pori', 'satakunta', ['Pori', 'Björneborg'], 'Porin', 'Pori', 'ssa', 'Poriin'),
+    ('rauma', 'satakunta', ['Rauma', 'Raumo'], 'Rauman', 'Rauma', 'lla', None),
+    ('kankaanpää', 'satakunta', ['Kankaanpää'], 'Kankaanpään', 'Kankaanpää', 'ssä', 'Kankaanpäähän'),
+    ('hämeenlinna', 'kanta-häme', ['Hämeenlinna', 'Tavastehus'], 'Hämeenlinnan', 'Hämeenlinna', 'ssa', 'Hämeenlinnaan'),
+    ('riihimäki', 'kanta-häme', ['Riihimäki'], 'Riihimäen', 'Riihimäe', 'llä', None),
+    ('forssa', 'kanta-häme', ['Forssa'], 'Forssan', 'Forssa', 'ssa', 'Forssaan'),
+    ('tampere', 'pirkanmaa', ['Tampere', 'Tammerfors'], 'Tampereen', 'Tamperee', 'lla', None),
+    ('nokia', 'pirkanmaa', ['Nokia'], 'Nokian', 'Nokia', 'lla', None),
+    ('ylöjärvi', 'pirkanmaa', ['Ylöjärvi'], 'Ylöjärven', 'Ylöjärve', 'llä', None),
+    ('kangasala', 'pirkanmaa', ['Kangasala'], 'Kangasalan', 'Kangasa', 'lla', None),
+    ('lempäälä', 'pirkanmaa', ['Lempäälä'], 'Lempäälän', 'Lempäälä', 'ssä', 'Lempäälään'),
+    ('pirkkala', 'pirkanmaa', ['Pirkkala', 'Birkala'], 'Pirkkalan', 'Pirkkala', 'ssa', 'Pirkkalaan'),
+    ('valkeakoski', 'pirkanmaa', ['Valkeakoski'], 'Valkeakosken', 'Valkeakoske', 'lla', None),
+    ('sastamala', 'pirkanmaa', ['Sastamala'], 'Sastamalan', 'Sastamala', 'ssa', 'Sastamalaan'),
+    ('lahti', 'päijät-häme', ['Lahti', 'Lahtis'], 'Lahden', 'Lahde', 'ssa', 'Lahteen'),
+    ('heinola', 'päijät-häme', ['Heinola'], 'Heinolan', 'Heinola', 'ssa', 'Heinolaan'),
+    ('hollola', 'päijät-häme', ['Hollola'], 'Hollolan', 'Hollola', 'ssa', 'Hollolaan'),
+    ('kouvola', 'kymenlaakso', ['Kouvola'], 'Kouvolan', 'Kouvola', 'ssa', 'Kouvolaan'),
+    ('kotka', 'kymenlaakso', ['Kotka'], 'Kotkan', 'Kotka', 'ssa', 'Kotkaan'),
+    ('hamina', 'kymenlaakso', ['Hamina', 'Fredrikshamn'], 'Haminan', 'Hamina', 'ssa', 'Haminaan'),
+    ('lappeenranta', 'etelä-karjala', ['Lappeenranta', 'Villmanstrand'], 'Lappeenrannan', 'Lappeenranna', 'ssa', 'Lappeenrantaan'),
+    ('imatra', 'etelä-karjala', ['Imatra'], 'Imatran', 'Imatra', 'lla', None),
+    ('mikkeli', 'etelä-savo', ['Mikkeli'], 'Mikkelin', 'Mikkeli', 'ssä', 'Mikkeliin'),
+    ('savonlinna', 'etelä-savo', ['Savonlinna', 'Nyslott'], 'Savonlinnan', 'Savonlinna', 'ssa', 'Savonlinnaan'),
+    ('pieksämäki', 'etelä-savo', ['Pieksämäki'], 'Pieksämäen', 'Pieksämäe', 'llä', None),
+    ('kuopio', 'pohjois-savo', ['Kuopio'], 'Kuopion', 'Kuopio', 'ssa', 'Kuopioon'),
+    ('iisalmi', 'pohjois-savo', ['Iisalmi', 'Idensalmi'], 'Iisalmen', 'Iisalme', 'lla', None),
+    ('varkaus', 'pohjois-savo', ['Varkaus'], 'Varkauden', 'Varkaude', 'ssa', 'Varkauteen'),
+    ('siilinjärvi', 'pohjois-savo', ['Siilinjärvi'], 'Siilinjärven', 'Siilinjärve', 'llä', None),
+    ('joensuu', 'pohjois-karjala', ['Joensuu'], 'Joensuun', 'Joensuu', 'ssa', 'Joensuuhun'),
+    ('kitee', 'pohjois-karjala', ['Kitee'], 'Kiteen', 'Kitee', 'llä', None),
+    ('lieksa', 'pohjois-karjala', ['Lieksa'], 'Lieksan', 'Lieksa', 'ssa', 'Lieksaan'),
+    ('nurmes', 'pohjois-karjala', ['Nurmes'], 'Nurmeksen', 'Nurmekse', 'ssa', 'Nurmekseen'),
+    ('ilomantsi', 'pohjois-karjala', ['Ilomantsi'], 'Ilomantsin', 'Ilomantsi', 'ssa', 'Ilomantsiin'),
+    ('jyväskylä', 'keski-suomi', ['Jyväskylä'], 'Jyväskylän', 'Jyväskylä', 'ssä', 'Jyväskylään'),
+    ('äänekoski', 'keski-suomi', ['Äänekoski'], 'Äänekosken', 'Äänekoske', 'lla', None),
+    ('jämsä', 'keski-suomi', ['Jämsä'], 'Jämsän', 'Jämsä', 'ssä', 'Jämsään'),
+    ('seinäjoki', 'etelä-pohjanmaa', ['Seinäjoki'], 'Seinäjoen', 'Seinäjoe', 'lla', None),
+    ('lapua', 'etelä-pohjanmaa', ['Lapua', 'Lappo'], 'Lapuan', 'Lapua', 'lla', None),
+    ('kauhajoki', 'etelä-pohjanmaa', ['Kauhajoki'], 'Kauhajoen', 'Kauhajoe', 'lla', None),
+    ('kurikka', 'etelä-pohjanmaa', ['Kurikka'], 'Kurikan', 'Kurika', 'ssa', 'Kurikkaan'),
+    ('vaasa', 'pohjanmaa', ['Vaasa', 'Vasa'], 'Vaasan', 'Vaasa', 'ssa', 'Vaasaan'),
+    ('mustasaari', 'pohjanmaa', ['Mustasaari', 'Korsholm'], 'Mustasaaren', 'Mustasaare', 'ssa', 'Mustasaareen'),
+    ('pietarsaari', 'pohjanmaa', ['Pietarsaari', 'Jakobstad'], 'Pietarsaaren', 'Pietarsaare', 'ssa', 'Pietarsaareen'),
+    ('närpiö', 'pohjanmaa', ['Närpiö', 'Närpes'], 'Närpiön', 'Närpiö', 'ssä', 'Närpiöön'),
+    ('kristiinankaupunki', 'pohjanmaa', ['Kristiinankaupunki', 'Kristinestad'], 'Kristiinankaupungin',
+     'Kristiinankaupungi', 'ssa', 'Kristiinankaupunkiin'),
+    ('kokkola', 'keski-pohjanmaa', ['Kokkola', 'Karleby'], 'Kokkolan', 'Kokkola', 'ssa', 'Kokkolaan'),
+    ('oulu', 'pohjois-pohjanmaa', ['Oulu', 'Uleåborg'], 'Oulun', 'Oulu', 'ssa', 'Ouluun'),
+    ('raahe', 'pohjois-pohjanmaa', ['Raahe', 'Brahestad'], 'Raahen', 'Raahe', 'ssa', 'Raaheen'),
+    ('ylivieska', 'pohjois-pohjanmaa', ['Ylivieska'], 'Ylivieskan', 'Ylivieska', 'ssa', 'Ylivieskaan'),
+    ('kempele', 'pohjois-pohjanmaa', ['Kempele'], 'Kempeleen', 'Kempelee', 'ssä', 'Kempeleeseen'),
+    ('kuusamo', 'pohjois-pohjanmaa', ['Kuusamo'], 'Kuusamon', 'Kuusamo', 'ssa', 'Kuusamoon'),
+    ('pudasjärvi', 'pohjois-pohjanmaa', ['Pudasjärvi'], 'Pudasjärven', 'Pudasjärve', 'llä', None),
+    ('kajaani', 'kainuu', ['Kajaani', 'Kajana'], 'Kajaanin', 'Kajaani', 'ssa', 'Kajaaniin'),
+    ('sotkamo', 'kainuu', ['Sotkamo'], 'Sotkamon', 'Sotkamo', 'ssa', 'Sotkamoon'),
+    ('kuhmo', 'kainuu', ['Kuhmo'], 'Kuhmon', 'Kuhmo', 'ssa', 'Kuhmoon'),
+    ('suomussalmi', 'kainuu', ['Suomussalmi'], 'Suomussalmen', 'Suomussalme', 'lla', None),
+    ('rovaniemi', 'lappi', ['Rovaniemi'], 'Rovaniemen', 'Rovanieme', 'llä', None),
+    ('kemi', 'lappi', ['Kemi'], 'Kemin', 'Kemi', 'ssä', 'Kemiin'),
+    ('tornio', 'lappi', ['Tornio', 'Torneå'], 'Tornion', 'Tornio', 'ssa', 'Tornioon'),
+    ('kemijärvi', 'lappi', ['Kemijärvi'], 'Kemijärven', 'Kemijärve', 'llä', None),
+    ('sodankylä', 'lappi', ['Sodankylä'], 'Sodankylän', 'Sodankylä', 'ssä', 'Sodankylään'),
+    ('inari', 'lappi', ['Inari', 'Enare'], 'Inarin', 'Inari', 'ssa', 'Inariin'),
+    ('kittilä', 'lappi', ['Kittilä'], 'Kittilän', 'Kittilä', 'ssä', 'Kittilään'),
+    ('utsjoki', 'lappi', ['Utsjoki'], 'Utsjoen', 'Utsjoe', 'lla', None),
+    ('enontekiö', 'lappi', ['Enontekiö', 'Enontekis'], 'Enontekiön', 'Enontekiö', 'llä', None),
+    ('muonio', 'lappi', ['Muonio'], 'Muonion', 'Muonio', 'ssa', 'Muonioon'),
+    ('salla', 'lappi', ['Salla'], 'Sallan', 'Salla', 'ssa', 'Sallaan'),
+    ('maarianhamina', 'ahvenanmaa', ['Maarianhamina', 'Mariehamn'], 'Maarianhaminan', 'Maarianhamina', 'ssa', 'Maarianhaminaan'),
+]
+
+# Sea areas of the FMI marine warnings: key, names, genitive, oblique stem and ending
+SEA_AREAS = [
+    ('bothnian-bay', ['Perämeri', 'Bottenviken', 'Bothnian Bay'], 'Perämeren', 'Perämere', 'llä'),
+    ('quark', ['Merenkurkku', 'Kvarken', 'Norra Kvarken', 'The Quark', 'Quark'], 'Merenkurkun', 'Merenkurku', 'ssa'),
+    ('bothnian-sea', ['Selkämeri', 'Bottenhavet', 'Bothnian Sea'], 'Selkämeren', 'Selkämere', 'llä'),
+    ('sea-of-aland', ['Ahvenanmeri', 'Ålands hav', 'Sea of Åland', 'Åland Sea'], 'Ahvenanmeren', 'Ahvenanmere', 'llä'),
+    ('archipelago-sea', ['Saaristomeri', 'Skärgårdshavet', 'Archipelago Sea'], 'Saaristomeren', 'Saaristomere', 'llä'),
+    ('northern-baltic', ['Pohjois-Itämeri', 'Norra Östersjön', 'Northern Baltic', 'Northern Baltic Proper'],
+     'Pohjois-Itämeren', 'Pohjois-Itämere', 'llä'),
+    ('gulf-of-finland', ['Suomenlahti', 'Finska viken', 'Gulf of Finland'], 'Suomenlahden', 'Suomenlahde', 'lla'),
+]
+
+
+def places():
+    """Yield the ID, parent ID and every name form of each place."""
+    for key, names, forms in REGIONS:
+        yield f'region:{key}', None, [*names, *forms, *REGION_FORMS.get(key, [])]
+    for key, region, names, genitive, stem, ending, illative in MUNICIPALITIES:
+        forms = [*names, genitive]
+        if stem is None:
+            # Compound names inflect both parts and list their forms instead
+            forms.extend(illative)
+        else:
+            forms.extend(cases(stem, ending))
+            if illative:
+                forms.append(illative)
+        yield f'municipality:{key}', f'region:{region}', forms
+    for key, names, genitive, stem, ending in SEA_AREAS:
+        yield f'sea:{key}', None, [*names, genitive, *cases(stem, ending)]
+
+
+def build_index():
+    """Return the index as written to ``places.json``."""
+    ids = []
+    parents = []
+    names = {}
+    for place_id, parent, forms in places():
+        position = len(ids)
+        ids.append(place_id)
+        parents.append(parent)
+        for form in forms:
+            name = ' '.join(WORD_PATTERN.findall(form.casefold()))
+            if names.setdefault(name, position) != position:
+                raise ValueError(f'{form!r} names both {ids[names[name]]} and {place_id}')
+    positions = {place_id: position for position, place_id in enumerate(ids)}
+    return {
+        'version': INDEX_VERSION,
+        'places': [
+            [place_id, positions[parent] if parent else None]
+            for place_id, parent in zip(ids, parents)
+        ],
+        'names': sorted([name, position] for name, position in names.items()),
+    }
+
+
+def dump(index):
+    """Return the index as compact JSON, one name per line for readable diffs."""
+    lines = ['{', f'"version": {index["version"]},', '"places": [']
+    lines.append(',\n'.join(json.dumps(place, ensure_ascii=False) for place in index['places']))
+    lines.append('],')
+    lines.append('"names": [')
+    lines.append(',\n'.join(json.dumps(name, ensure_ascii=False) for name in index['names']))
+    lines.append(']')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    """Write the index, or check that the shipped one is up to date."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--check', action='store_true', help='only compare with the shipped index')
+    args = parser.parse_args()
+
+    content = dump(build_index())
+    if args.check:
+        with open(OUTPUT, encoding='utf-8') as file:
+            if file.read() != content:
+                sys.exit(f'{OUTPUT} is out of date, run {sys.argv[0]}')
+        return
+    with open(OUTPUT, 'w', encoding='utf-8') as file:
+        file.write(content)
+    index = json.loads(content)
+    print(f"Wrote {len(index['places'])} places and {len(index['names'])} names to {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
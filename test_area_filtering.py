@@ -10,6 +10,7 @@ import os
 sys.path.insert(0, '/workspaces/fmi-weather-warnings/custom_components/fmi_weather_warnings')
 
 from coordinator import FMIWeatherWarningsCoordinator
+from feed import FMIFeedService
 from const import CONF_AREA
 
 # Set up logging to see debug messages
@@ -32,6 +33,7 @@ async def test_area_filtering():
     """Test area filtering with different configurations."""
     
     mock_hass = MockHomeAssistant()
+    feed = FMIFeedService(mock_hass)
     
     # Test cases
     test_cases = [
@@ -47,7 +49,7 @@ async def test_area_filtering():
         print(f"\n=== Testing with area: '{area}' ===")
         
         entry = MockConfigEntry(area)
-        coordinator = FMIWeatherWarningsCoordinator(mock_hass, entry)
+        coordinator = FMIWeatherWarningsCoordinator(mock_hass, entry, feed)
         
         try:
             # Create a mock session that returns sample data
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Test the precompiled area matcher against the original substring loop."""
+
+from fmi_weather_warnings.matcher import STRIP_SUFFIXES, MultiAreaMatcher, parse_areas
+from fmi_weather_warnings.model import make_warning
+
+# Finnish case endings the original loop appended to the configured area
+APPEND_SUFFIXES = ("ssa", "ssä", "sta", "stä", "an", "än", "la", "lä")
+
+SAMPLE_FIELDS = [
+    {"title": "Weather warning for Uusimaa", "area": "Uusimaa", "summary": "Strong winds expected in the region"},
+    {"title": "Snow warning", "area": "Southern Finland", "summary": "Heavy snowfall expected in Helsinki, Espoo, and surrounding areas"},
+    {"title": "Ice warning", "area": "", "summary": "Slippery conditions in Turku and nearby municipalities"},
+    {"title": "Wind warning", "area": "Lappi", "summary": "Strong winds in northern Finland"},
+    {"title": "Temperature warning", "area": "Helsingin seutu", "summary": "Very cold weather expected"},
+    {"title": "Flood warning", "area": "Oulussa", "summary": "Rising water levels"},
+    {"title": "", "area": "", "summary": ""},
+]
+SAMPLE_WARNINGS = [
+    make_warning({"id": str(index), **fields}) for index, fields in enumerate(SAMPLE_FIELDS)
+]
+
+TEST_AREAS = ["", "Helsinki", "Uusimaa", "Turku", "Lapland", "Lappi", "Oulu", "Helsingin", "Tampereella"]
+
+
+def area_variants(area):
+    """Return the area and the Finnish suffix variants the original loop tried."""
+    variants = [area]
+    for suffix in STRIP_SUFFIXES:
+        if area.endswith(suffix) and len(area) > len(suffix) + 2:
+            variant = area[: -len(suffix)]
+            if variant not in variants:
+                variants.append(variant)
+    for suffix in APPEND_SUFFIXES:
+        if area + suffix not in variants:
+            variants.append(area + suffix)
+    return variants
+
+
+def legacy_matches(area, warning):
+    """Return the result of the original per-warning matching loop."""
+    if not area:
+        return True
+    area_desc = warning.area.lower()
+    title_lower = warning.title.lower()
+    summary_lower = warning.summary.lower()
+    if not area_desc and not title_lower and not summary_lower:
+        return True
+    search_text = f"{area_desc} {title_lower} {summary_lower}"
+    return any(variant in search_text for variant in area_variants(area.lower()))
+
+
+def matches(area, warning):
+    """Return True if the matcher includes the warning for an entry with this area."""
+    return "entry" in MultiAreaMatcher({"entry": area}).match(warning)
+
+
+def test_matcher_agrees_with_legacy_loop():
+    """The compiled matcher gives the same result as the substring loop."""
+    for area in TEST_AREAS:
+        for warning in SAMPLE_WARNINGS:
+            assert matches(area, warning) == legacy_matches(area, warning), (area, warning)
+
+
+def test_matcher_variants():
+    """Suffix variants are matched in both directions."""
+    assert matches("Oulu", SAMPLE_WARNINGS[5])
+    assert matches("Helsingin", SAMPLE_WARNINGS[4])
+    assert matches("Helsingin", make_warning({"id": "x", "summary": "kova tuuli helsingissä"}))
+    assert not matches("Tampereella", SAMPLE_WARNINGS[0])
+
+
+def test_empty_area_matches_everything():
+    """Without a configured area every warning is included."""
+    assert all(matches("", warning) for warning in SAMPLE_WARNINGS)
+
+
+def test_multi_area_matcher_agrees_with_legacy_loop():
+    """One pass over all areas gives the same entries as the loop per area."""
+    areas = {f"entry_{index}": area for index, area in enumerate(TEST_AREAS + ["Ou", "Helsingissä"])}
+    engine = MultiAreaMatcher(areas)
+
+    for warning, entry_ids in zip(SAMPLE_WARNINGS, engine.match_all(SAMPLE_WARNINGS)):
+        expected = {entry_id for entry_id, area in areas.items() if legacy_matches(area, warning)}
+        assert entry_ids == expected, (warning, entry_ids, expected)
+
+
+def test_entry_with_several_areas_matches_any_of_them():
+    """An entry with a list of areas matches the union of its areas, once."""
+    route = ["Helsinki", "Tampere", "Oulu"]
+    engine = MultiAreaMatcher({"route": route, "lappi": "Lapland", "all": []})
+
+    for warning, entry_ids in zip(SAMPLE_WARNINGS, engine.match_all(SAMPLE_WARNINGS)):
+        expected = any(legacy_matches(area, warning) for area in route)
+        assert ("route" in entry_ids) == expected, (warning, entry_ids)
+        assert "all" in entry_ids
+
+    # Keyed by area, the same matcher tells which areas a warning concerns
+    per_area = MultiAreaMatcher({area: area for area in route})
+    for warning, areas in zip(SAMPLE_WARNINGS, per_area.match_all(SAMPLE_WARNINGS)):
+        assert areas == {area for area in route if legacy_matches(area, warning)}
+
+
+def test_parse_areas():
+    """Comma separated areas are split, trimmed and deduplicated."""
+    assert parse_areas("Helsinki, Tampere,,oulu , helsinki") == ["Helsinki", "Tampere", "oulu"]
+    assert parse_areas(["Lapland"]) == ["Lapland"]
+    assert parse_areas("") == []
+    assert parse_areas(None) == []
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Test that sensor attributes are only rebuilt when the warnings change."""
+
+from fmi_weather_warnings.attributes import AttributeCache, attribute_fields, build_attributes
+from fmi_weather_warnings.model import Severity, Warning
+
+WARNINGS = [
+    Warning(
+        id="1",
+        fingerprint=1234,
+        title="Wind warning",
+        severity=Severity.MODERATE,
+        area="Uusimaa",
+        polygons=(((60.0, 24.0), (60.5, 24.0), (60.5, 25.0)),),
+    ),
+    Warning(id="2", title="Snow warning", summary="Heavy snowfall"),
+]
+
+
+def test_build_attributes_copies_known_keys_only():
+    """Internal fields such as fingerprints and polygons are not exposed."""
+    rss_fields = {"link": "", "published": "", "summary": "", "area": ""}
+    assert build_attributes(WARNINGS) == {
+        "warnings": [
+            {**rss_fields, "title": "Wind warning", "severity": "Moderate", "area": "Uusimaa"},
+            {**rss_fields, "title": "Snow warning", "summary": "Heavy snowfall"},
+        ]
+    }
+    # Enum values are exposed as plain strings
+    assert type(build_attributes(WARNINGS)["warnings"][0]["severity"]) is str
+
+
+def test_compact_attributes():
+    """Compact mode only keeps IDs, severity, event and validity."""
+    assert build_attributes(WARNINGS, attribute_fields("compact")) == {
+        "warnings": [{"id": "1", "severity": "Moderate"}, {"id": "2"}]
+    }
+
+
+def test_area_counts():
+    """Entries with several areas get the number of warnings per area."""
+    counts = {"Helsinki": 2, "Oulu": 0}
+    attributes = build_attributes(WARNINGS, attribute_fields("compact"), area_counts=counts)
+    assert attributes["areas"] == counts
+    assert "areas" not in build_attributes(WARNINGS)
+
+
+def test_payload_rebuilt_once_per_version():
+    """Repeated reads of the same version return the same object."""
+    cache = AttributeCache(build_attributes)
+
+    first = cache.get(1, WARNINGS)
+    for _ in range(100):
+        assert cache.get(1, WARNINGS) is first
+    assert cache.builds == 1
+
+    second = cache.get(2, WARNINGS[:1])
+    assert second is not first
+    assert len(second["warnings"]) == 1
+    for _ in range(100):
+        cache.get(2, WARNINGS[:1])
+    assert cache.builds == 2
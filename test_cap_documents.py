@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Test parsing full CAP documents, their LRU cache and fetching them for the feed."""
+
+import asyncio
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import FakeResponse
+from fmi_weather_warnings import feed as feed_module
+from fmi_weather_warnings.cap import (
+    CapFormatError,
+    LRUCache,
+    enrich_warning,
+    parse_cap_document,
+)
+from fmi_weather_warnings.const import CAP_FETCH_CONCURRENCY, FMI_RSS_FEED
+from fmi_weather_warnings.model import Warning
+from fmi_weather_warnings.rss import parse_feed
+from fmi_weather_warnings.sensor import WarningEntityManager
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'cap_alert.xml')
+FEED_FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+FEED_URL = FMI_RSS_FEED.format(language="en-GB")
+NOW = datetime(2025, 11, 15, 8, tzinfo=timezone.utc)
+UUSIMAA = ((59.8, 23.4), (59.8, 26.6), (60.8, 26.6), (60.8, 23.4), (59.8, 23.4))
+
+
+def load_document():
+    with open(FIXTURE, 'rb') as fixture:
+        return parse_cap_document(fixture.read())
+
+
+def test_parse_cap_document():
+    """Areas of every info block are combined without duplicates."""
+    document = load_document()
+
+    assert document["languages"] == ["en-GB", "fi-FI"]
+    assert len(document["polygons"]) == 2
+    assert document["polygons"][0] == UUSIMAA
+    assert document["geocodes"] == ["1", "091"]
+    assert document["parameters"] == {
+        "awareness_level": "2; yellow; Moderate",
+        "awareness_type": "1; Wind",
+    }
+    assert document["expires"] == datetime(2025, 11, 16, 1, tzinfo=timezone.utc)
+
+    with pytest.raises(CapFormatError):
+        parse_cap_document(b"<rss/>")
+    with pytest.raises(CapFormatError):
+        parse_cap_document(b"<alert>")
+
+
+def test_enrich_warning():
+    """Only polygons and geocodes the RSS item lacks are added."""
+    warning = Warning(id="1", polygons=(UUSIMAA,), geocodes=("1",))
+    enriched = enrich_warning(warning, load_document())
+
+    assert len(enriched.polygons) == 2
+    assert enriched.geocodes == ("1", "091")
+    assert dict(enriched.parameters)["awareness_type"] == "1; Wind"
+    # The RSS warning is left as it was and remembered
+    assert warning.geocodes == ("1",)
+    assert enriched.derived_from == (warning,)
+
+
+def test_lru_cache():
+    """The least recently used entry goes first, and entries can be evicted."""
+    cache = LRUCache(2)
+    cache.put(("a", 1), "A")
+    cache.put(("b", 1), "B")
+    assert cache.get(("a", 1)) == "A"
+    cache.put(("c", 1), "C")
+
+    assert cache.get(("b", 1)) is None
+    assert len(cache) == 2
+    assert cache.evict(lambda key, _value: key[0] == "a") == 1
+    assert cache.get(("a", 1)) is None
+    assert cache.get(("c", 1)) == "C"
+
+
+def load_feed():
+    with open(FEED_FIXTURE, 'rb') as fixture:
+        return fixture.read()
+
+
+def document_responses(warnings, response=FakeResponse):
+    """Return a response for the CAP document of each warning, expiring with it."""
+    with open(FIXTURE, 'rb') as fixture:
+        content = fixture.read()
+    return {
+        warning.link: [
+            response(body=re.sub(
+                rb'<expires>[^<]*</expires>',
+                b'<expires>%s</expires>' % warning.expires.isoformat().encode(),
+                content,
+            ))
+        ]
+        for warning in warnings
+    }
+
+
+def enriching_harness(feed_harness, monkeypatch, feeds, response=FakeResponse):
+    """Return a harness whose entry asks for the CAP documents of the feed."""
+    monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: NOW)
+    responses = document_responses(parse_feed(feeds[0]), response)
+    responses[FEED_URL] = [FakeResponse(body=feed) for feed in feeds]
+    harness = feed_harness(responses)
+    harness.register(cap_documents=True)
+    return harness
+
+
+def document_requests(harness):
+    return [url for url in harness.session.requests if url != FEED_URL]
+
+
+async def poll(harness, now=NOW):
+    """Run a scheduled poll, whichever timer is armed."""
+    await harness.feed._async_scheduled_refresh(now)
+
+
+def test_documents_fetched_for_new_or_changed_warnings_only(feed_harness, monkeypatch):
+    """Each poll downloads the documents of the warnings that changed since the last one."""
+    recorded = load_feed()
+    # The Uusimaa wind warning is upgraded from Moderate to Severe
+    first, rest = recorded.split(b'<cap:severity>Moderate<', 1)
+    upgraded = first + b'<cap:severity>Severe<' + rest
+    harness = enriching_harness(feed_harness, monkeypatch, [recorded, upgraded])
+    feed = harness.feed
+
+    async def scenario():
+        await poll(harness)
+        assert len(document_requests(harness)) == 6
+        assert all(warning.derived_from for warning in feed.warnings)
+        assert feed.warnings[0].polygons
+
+        await poll(harness)
+        assert document_requests(harness)[6:] == [feed.warnings[0].link]
+        assert feed.warnings[0].severity == "Severe"
+
+        # An unchanged feed needs no documents at all
+        await poll(harness)
+
+    asyncio.run(scenario())
+    assert len(document_requests(harness)) == 7
+    assert feed.cap_fetches == 7
+    assert feed.async_diagnostics()["cap_documents"]["cached"] == 7
+
+
+def test_document_downloads_are_limited(feed_harness, monkeypatch):
+    """Only a few documents are downloaded at a time."""
+    active = []
+    peak = []
+
+    class SlowResponse(FakeResponse):
+        async def __aenter__(self):
+            active.append(self)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            return self
+
+        async def __aexit__(self, *_exc):
+            active.remove(self)
+            return False
+
+    harness = enriching_harness(feed_harness, monkeypatch, [load_feed()], SlowResponse)
+    asyncio.run(poll(harness))
+
+    assert len(document_requests(harness)) == 6
+    assert max(peak) == CAP_FETCH_CONCURRENCY
+
+
+def test_documents_evicted_with_their_warning(feed_harness, monkeypatch):
+    """Documents are dropped when their warning expires or leaves the feed."""
+    recorded = load_feed()
+    items = re.findall(rb'\s*<item>.*?</item>', recorded, re.DOTALL)
+    without_last = recorded.replace(items[-1], b'')
+    harness = enriching_harness(feed_harness, monkeypatch, [recorded, without_last])
+    feed = harness.feed
+
+    def cached():
+        return sorted(key[0][-4:] for key in feed._cap_documents._entries)
+
+    async def scenario():
+        await poll(harness)
+        assert cached() == ["0001", "0002", "0003", "0004", "0005", "0006"]
+
+        # Warning 0003 expires at 10:00 UTC
+        later = NOW + timedelta(hours=3)
+        monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: later)
+        await feed._async_boundary_refresh(later)
+        assert cached() == ["0001", "0002", "0004", "0005", "0006"]
+
+        await poll(harness, later)
+        assert cached() == ["0001", "0002", "0004", "0005"]
+
+    asyncio.run(scenario())
+
+
+def test_enrichment_is_no_change_for_text_entries(feed_harness, monkeypatch):
+    """Entries that do not use the CAP documents see no change when others do."""
+    monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: NOW)
+    responses = document_responses(parse_feed(load_feed()))
+    responses[FEED_URL] = [FakeResponse(body=load_feed())]
+    harness = feed_harness(responses)
+    hass = harness.feed.hass
+    written = []
+
+    def add_entities(entities):
+        for entity in entities:
+            entity.hass = hass
+            entity.async_write_ha_state = lambda entity=entity: written.append(entity.warning_id)
+
+    async def scenario():
+        coordinator = harness.add_entry("text", area="")
+        await poll(harness)
+        manager = WarningEntityManager(hass, coordinator, harness.entries["text"], add_entities)
+        manager.async_sync()
+        coordinator.async_add_listener(manager.async_sync)
+        warnings = coordinator.data["warnings"] + coordinator.data["upcoming"]
+        assert len(warnings) == 6
+        version = coordinator.warnings_version
+
+        harness.add_entry("enriched", area="", cap_documents=True)
+        await poll(harness)
+
+        assert len(document_requests(harness)) == 6
+        assert all(warning.derived_from for warning in harness.feed.warnings)
+        current = coordinator.data["warnings"] + coordinator.data["upcoming"]
+        assert all(a is b for a, b in zip(current, warnings))
+        assert coordinator.warnings_version == version
+        assert hass.events == []
+        assert written == []
+
+    asyncio.run(scenario())
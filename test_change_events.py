@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Test the warning change events across a sequence of recorded feeds."""
+
+import asyncio
+import os
+import re
+import types
+from datetime import datetime, timezone
+
+import pytest
+
+from fmi_weather_warnings import coordinator as coordinator_module
+from fmi_weather_warnings.changes import filter_change_event
+from fmi_weather_warnings.coordinator import FMIWeatherWarningsCoordinator
+from fmi_weather_warnings.rss import parse_feed
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+ITEM_PATTERN = re.compile(rb'\s*<item>.*?</item>', re.DOTALL)
+# Warnings 0001, 0002, 0006 and the 0007 issued later are in effect
+NOW = datetime(2025, 11, 15, 10, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def frozen_time(monkeypatch):
+    monkeypatch.setattr(coordinator_module.dt_util, "utcnow", lambda: NOW)
+
+
+def load_fixture():
+    with open(FIXTURE, 'rb') as fixture:
+        return fixture.read()
+
+
+def feed_snapshots():
+    """Return consecutive versions of the feed, as the FMI would publish them."""
+    recorded = load_fixture()
+    items = ITEM_PATTERN.findall(recorded)
+
+    # The Uusimaa wind warning is upgraded from Moderate to Severe
+    upgraded = recorded.replace(
+        items[0], items[0].replace(b'<cap:severity>Moderate<', b'<cap:severity>Severe<')
+    )
+    # The last warning is cancelled and a new one issued in its place
+    issued = items[1].replace(b'.0002', b'.0007').replace(
+        b'<cap:severity>Severe<', b'<cap:severity>Minor<'
+    )
+    replaced = upgraded.replace(items[-1], issued)
+
+    return [recorded, recorded, upgraded, upgraded, replaced, replaced]
+
+
+class ReplayFeed:
+    """Feed service serving one recorded feed version per refresh."""
+
+    def __init__(self, contents):
+        self.contents = iter(contents)
+        self.content = None
+        self.version = 0
+        self.warnings = []
+
+    async def async_get_warnings(self):
+        content = next(self.contents)
+        if content != self.content:
+            self.content = content
+            known = {warning.id: warning for warning in self.warnings}
+            self.warnings = parse_feed(content, known)
+            self.version += 1
+        return self.warnings
+
+    def async_warnings_for(self, _entry_id):
+        return self.warnings
+
+
+def replay(attribute_mode="full"):
+    """Refresh a coordinator through every feed version and collect its events."""
+    events = []
+    hass = types.SimpleNamespace(
+        bus=types.SimpleNamespace(async_fire=lambda event_type, data: events.append(data))
+    )
+    entry = types.SimpleNamespace(
+        entry_id="entry", data={"area": "", "attribute_mode": attribute_mode}, options={}
+    )
+    contents = feed_snapshots()
+    coordinator = FMIWeatherWarningsCoordinator(hass, entry, ReplayFeed(contents))
+
+    async def refresh_all():
+        for _ in contents:
+            await coordinator.async_refresh()
+            assert coordinator.last_update_success
+
+    asyncio.run(refresh_all())
+    return events
+
+
+def test_events_fire_once_per_change():
+    """Only feed versions that change a warning fire an event."""
+    events = replay()
+
+    assert len(events) == 2
+    upgrade, replacement = events
+    assert upgrade["updated"][0]["severity"] == "Severe"
+    assert upgrade["added"] == upgrade["removed"] == []
+    assert [warning["id"] for warning in replacement["added"]] == [
+        "2.49.0.1.246.0.0.2025.11.15.06.00.01.0007"
+    ]
+    assert [warning["id"] for warning in replacement["removed"]] == [
+        "2.49.0.1.246.0.0.2025.11.15.03.00.00.0006"
+    ]
+    assert replacement["updated"] == []
+
+
+def test_compact_events_leave_out_the_text():
+    """Compact attribute mode keeps the warning text out of the events too."""
+    warning = replay("compact")[0]["updated"][0]
+    assert set(warning) == {"id", "severity", "event", "effective", "expires"}
+
+
+def test_filter_by_severity_and_event():
+    """Subscribers only see the warnings they asked for."""
+    events = replay()
+
+    severe = [filter_change_event(event, severities=["Severe"]) for event in events]
+    assert severe[0]["updated"][0]["severity"] == "Severe"
+    # The replacement only involves Minor and Moderate warnings
+    assert severe[1] is None
+
+    wind = [
+        filter_change_event(event, events=["wind warning for sea areas"]) for event in events
+    ]
+    assert wind[0] is None
+    assert [warning["severity"] for warning in wind[1]["added"]] == ["Minor"]
+    assert wind[1]["removed"] == []
+
+    assert filter_change_event(events[0], entry_id="other") is None
+    assert filter_change_event(events[0], entry_id="entry") == events[0]
@@ -0,0 +1,55 @@
+"""Tests for the options flow of FMI Weather Warnings."""
+
+import asyncio
+import types
+
+from fmi_weather_warnings.config_flow import FMIWeatherWarningsOptionsFlow
+
+
+def options_step(data, user_input=None):
+    """Run the options step of an entry created with ``data``."""
+    entry = types.SimpleNamespace(entry_id="entry", data=data, options={})
+    flow = FMIWeatherWarningsOptionsFlow(entry)
+    return asyncio.run(flow.async_step_init(user_input))
+
+
+def form_defaults(result):
+    """Return the fields of a form with their defaults."""
+    return {
+        key.schema: key.default() if key.default else None
+        for key in result["data_schema"].schema
+    }
+
+
+def test_form_offers_the_area_of_the_filter_mode():
+    """Text entries change their area, location entries their coordinates."""
+    text = form_defaults(options_step({"area": "Uusimaa", "min_severity": "Moderate"}))
+    location = form_defaults(
+        options_step({"filter_mode": "location", "latitude": 60.17, "longitude": 24.94})
+    )
+
+    assert text["area"] == "Uusimaa"
+    assert text["min_severity"] == "Moderate"
+    assert "latitude" not in text
+    assert location["latitude"] == 60.17
+    assert location["longitude"] == 24.94
+    assert "area" not in location
+
+
+def test_submitted_areas_are_normalized():
+    """Blanks and repeated areas are dropped from the saved options."""
+    result = options_step({"area": "Uusimaa"}, {"area": " Uusimaa ,Lapland, uusimaa"})
+
+    assert result["type"] == "create_entry"
+    assert result["data"]["area"] == "Uusimaa, Lapland"
+
+
+def test_minimum_interval_above_maximum_is_rejected():
+    """The form is shown again with an error instead of saving the options."""
+    result = options_step(
+        {"area": "Uusimaa"},
+        {"area": "Uusimaa", "min_scan_interval": 600, "max_scan_interval": 300},
+    )
+
+    assert result["type"] == "form"
+    assert result["errors"] == {"base": "invalid_scan_interval"}
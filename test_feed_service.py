@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Test the shared feed service's poll timer against a stand-in session."""
+
+import asyncio
+import os
+import threading
+from datetime import datetime, timezone
+
+from conftest import FakeResponse
+from fmi_weather_warnings.const import FMI_RSS_FEED
+from fmi_weather_warnings.matcher import MultiAreaMatcher
+from fmi_weather_warnings.pipeline import match_warnings, run_pipeline
+from fmi_weather_warnings.rss import parse_feed
+from fmi_weather_warnings.snapshot import dump_snapshot
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+FEED_URL = FMI_RSS_FEED.format(language="en-GB")
+
+
+def load_fixture():
+    with open(FIXTURE, 'rb') as fixture:
+        return fixture.read()
+
+
+def test_scheduled_polls_fetch_and_rearm(feed_harness):
+    """Every poll fetches the feed and arms the next one."""
+    harness = feed_harness({FEED_URL: [FakeResponse(body=load_fixture())]})
+
+    async def scenario():
+        coordinator = harness.register(areas=["Uusimaa"])
+        assert [timer[0] for timer in harness.armed()] == [0]
+
+        await harness.fire()
+        assert harness.session.requests == [FEED_URL]
+        assert coordinator.refreshes == 1
+        assert len(harness.feed.warnings) == 6
+
+        await harness.fire()
+        assert len(harness.session.requests) == 2
+        assert len(harness.armed()) == 1
+
+    asyncio.run(scenario())
+
+
+def count_pipeline_runs(monkeypatch):
+    """Count the pipeline runs of the feed service; return the list of runs."""
+    from fmi_weather_warnings import feed as feed_module
+
+    runs = []
+
+    def counting_run_pipeline(*args):
+        runs.append(args)
+        return run_pipeline(*args)
+
+    monkeypatch.setattr(feed_module, "run_pipeline", counting_run_pipeline)
+    return runs
+
+
+def test_not_modified_feed_is_not_processed_again(feed_harness, monkeypatch):
+    """A 304 to the validators of the last body keeps the warnings as they are."""
+    runs = count_pipeline_runs(monkeypatch)
+    validators = {"ETag": '"v1"', "Last-Modified": "Sat, 15 Nov 2025 10:00:00 GMT"}
+    harness = feed_harness(
+        {FEED_URL: [FakeResponse(body=load_fixture(), headers=validators), FakeResponse(304)]}
+    )
+
+    async def scenario():
+        harness.register(areas=["Uusimaa"])
+        await harness.fire()
+        version = harness.feed.version
+        await harness.fire()
+        assert harness.feed.version == version
+        assert len(harness.feed.warnings) == 6
+
+    asyncio.run(scenario())
+
+    assert len(runs) == 1
+    assert harness.feed.not_modified_hits == 1
+    assert harness.feed.hash_skip_hits == 0
+    assert harness.session.headers == [
+        {},
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Sat, 15 Nov 2025 10:00:00 GMT"},
+    ]
+
+
+def test_identical_feed_body_is_not_processed_again(feed_harness, monkeypatch):
+    """A server ignoring the validators resends the body, which is recognised by its hash."""
+    runs = count_pipeline_runs(monkeypatch)
+    harness = feed_harness({FEED_URL: [FakeResponse(body=load_fixture())]})
+
+    async def scenario():
+        harness.register(areas=["Uusimaa"])
+        await harness.fire()
+        version = harness.feed.version
+        await harness.fire()
+        assert harness.feed.version == version
+        assert len(harness.feed.warnings) == 6
+
+    asyncio.run(scenario())
+
+    assert len(runs) == 1
+    assert harness.feed.hash_skip_hits == 1
+    assert harness.feed.not_modified_hits == 0
+    # Without validators the requests are unconditional
+    assert harness.session.headers == [{}, {}]
+
+
+def test_poll_during_startup_rematch_still_fetches(feed_harness, monkeypatch):
+    """A poll firing while the restored warnings are matched is not lost."""
+    from fmi_weather_warnings import feed as feed_module
+
+    # Hold the matching of the restored warnings until the poll has fired
+    matching = threading.Event()
+    release = threading.Event()
+
+    def held_match_warnings(*args):
+        matching.set()
+        release.wait(5)
+        return match_warnings(*args)
+
+    monkeypatch.setattr(feed_module, "match_warnings", held_match_warnings)
+    snapshot = dump_snapshot(
+        {"en-GB": {"warnings": parse_feed(load_fixture()), "content_hash": "restored"}},
+        datetime.now(timezone.utc),
+    )
+    harness = feed_harness({FEED_URL: [FakeResponse(body=load_fixture())]}, snapshot)
+
+    async def scenario():
+        await harness.feed.async_load()
+        coordinator = harness.register(areas=["Uusimaa"])
+
+        # The entry's first refresh only rematches the fresh snapshot
+        first_refresh = asyncio.ensure_future(coordinator.async_refresh())
+        while not matching.is_set():
+            await asyncio.sleep(0.001)
+
+        poll = asyncio.ensure_future(harness.fire())
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(first_refresh, poll)
+
+        assert harness.session.requests == [FEED_URL]
+        assert len(harness.armed()) == 1
+
+    asyncio.run(scenario())
+
+
+def test_failed_poll_keeps_polling(feed_harness, monkeypatch):
+    """Polls keep being armed while the feed cannot be fetched."""
+    from fmi_weather_warnings import feed as feed_module
+
+    monkeypatch.setattr(feed_module, "FETCH_RETRIES", 0)
+    harness = feed_harness({FEED_URL: [FakeResponse(status=500)]})
+
+    async def scenario():
+        harness.register(areas=["Uusimaa"])
+        await harness.fire()
+        await harness.fire()
+        assert len(harness.session.requests) == 2
+        assert len(harness.armed()) == 1
+
+    asyncio.run(scenario())
+
+
+def test_areas_are_counted_in_the_executor(feed_harness, monkeypatch):
+    """Entries with several areas get their counts without matching on the loop."""
+    from fmi_weather_warnings import feed as feed_module
+
+    now = datetime(2025, 11, 15, 10, 30, tzinfo=timezone.utc)
+    monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: now)
+    threads = []
+    match_areas = MultiAreaMatcher.match_areas
+
+    def recording_match_areas(self, warning):
+        threads.append(threading.current_thread())
+        return match_areas(self, warning)
+
+    monkeypatch.setattr(MultiAreaMatcher, "match_areas", recording_match_areas)
+    harness = feed_harness({FEED_URL: [FakeResponse(body=load_fixture())]})
+
+    async def scenario():
+        coordinator = harness.add_entry("route", area="Uusimaa, Lapland")
+        await harness.fire()
+        return coordinator.data
+
+    data = asyncio.run(scenario())
+
+    assert data["area_counts"] == {"Uusimaa": 1, "Lapland": 0}
+    assert [warning.id[-4:] for warning in data["upcoming"]] == ["0005"]
+    assert threads and threading.main_thread() not in threads
+
+
+def test_options_rematch_the_fetched_feed(feed_harness, monkeypatch):
+    """Changing the areas or filters matches the cached feed again without fetching."""
+    from fmi_weather_warnings import feed as feed_module
+
+    now = datetime(2025, 11, 15, 10, 30, tzinfo=timezone.utc)
+    monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: now)
+    harness = feed_harness({FEED_URL: [FakeResponse(body=load_fixture())]})
+
+    async def scenario():
+        coordinator = harness.add_entry(area="Uusimaa")
+        await harness.fire()
+        active = [[warning.id[-4:] for warning in coordinator.data["warnings"]]]
+
+        entry = harness.entries["entry"]
+        entry.options = {"area": "Oulu"}
+        await coordinator.async_apply_options(entry)
+        active.append([warning.id[-4:] for warning in coordinator.data["warnings"]])
+
+        entry.options = {"area": "", "min_severity": "Severe"}
+        await coordinator.async_apply_options(entry)
+        active.append([warning.id[-4:] for warning in coordinator.data["warnings"]])
+        return active
+
+    active = asyncio.run(scenario())
+
+    assert active == [["0001"], ["0006"], ["0002"]]
+    assert harness.session.requests == [FEED_URL]
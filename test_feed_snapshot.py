@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Test the compact on-disk snapshot of the parsed feed."""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from fmi_weather_warnings import feed as feed_module
+from fmi_weather_warnings.const import SNAPSHOT_MAX_AGE
+from fmi_weather_warnings.model import Severity, Warning
+from fmi_weather_warnings.rss import parse_feed
+from fmi_weather_warnings.snapshot import dump_snapshot, load_snapshot
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+FETCHED_AT = datetime(2025, 11, 15, 8, tzinfo=timezone.utc)
+
+
+def load_fixture():
+    with open(FIXTURE, 'rb') as fixture:
+        return fixture.read()
+
+
+def test_snapshot_round_trip():
+    """Warnings survive a trip through JSON unchanged."""
+    warnings = parse_feed(load_fixture())
+    feeds = {
+        "en-GB": {
+            "warnings": warnings,
+            "etag": '"abc"',
+            "last_modified": "Sat, 15 Nov 2025 06:00:01 GMT",
+            "content_hash": "ff",
+        },
+        "fi-FI": {"warnings": []},
+    }
+
+    snapshot = load_snapshot(json.loads(json.dumps(dump_snapshot(feeds, FETCHED_AT))))
+
+    assert snapshot["fetched_at"] == FETCHED_AT
+    restored = snapshot["feeds"]["en-GB"]
+    assert restored["warnings"] == warnings
+    assert restored["etag"] == '"abc"'
+    assert restored["content_hash"] == "ff"
+    assert snapshot["feeds"]["fi-FI"]["warnings"] == []
+    # Restored warnings are recognised as unchanged by the parser
+    known = {warning.id: warning for warning in restored["warnings"]}
+    reparsed = parse_feed(load_fixture(), known)
+    assert all(a is b for a, b in zip(reparsed, restored["warnings"]))
+
+
+def test_snapshot_rows_follow_stored_fields():
+    """Rows are read by the stored field names, not the current field order."""
+    data = {
+        "fetched_at": FETCHED_AT.isoformat(),
+        "fields": ["severity", "id", "unknown"],
+        "feeds": {"en-GB": {"warnings": [["Moderate", "1", None]]}},
+    }
+    assert load_snapshot(data)["feeds"]["en-GB"]["warnings"] == [
+        Warning(id="1", severity=Severity.MODERATE)
+    ]
+
+
+def test_incomplete_snapshot_is_ignored():
+    """Snapshots without a timestamp or warning IDs are not used."""
+    assert load_snapshot({}) is None
+    data = {
+        "fetched_at": FETCHED_AT.isoformat(),
+        "fields": ["title"],
+        "feeds": {"en-GB": {"warnings": [["x"]]}},
+    }
+    assert load_snapshot(data) is None
+
+
+def test_stale_snapshot_is_ignored_at_load(feed_harness, monkeypatch):
+    """Only snapshots younger than the maximum age are restored."""
+    monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: FETCHED_AT)
+    feeds = {"en-GB": {"warnings": parse_feed(load_fixture()), "content_hash": "ff"}}
+
+    def load(age):
+        snapshot = dump_snapshot(feeds, FETCHED_AT - timedelta(seconds=age))
+        harness = feed_harness(snapshot=json.loads(json.dumps(snapshot)))
+        asyncio.run(harness.feed.async_load())
+        return harness.feed
+
+    recent = load(SNAPSHOT_MAX_AGE)
+    assert len(recent.warnings) == 6
+    assert recent.fetched_at == FETCHED_AT - timedelta(seconds=SNAPSHOT_MAX_AGE)
+
+    stale = load(SNAPSHOT_MAX_AGE + 1)
+    assert stale.warnings == []
+    assert stale.fetched_at is None
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Test fetch retries, jittered backoff and the circuit breaker."""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import FakeResponse
+from fmi_weather_warnings import feed as feed_module
+from fmi_weather_warnings.const import (
+    BREAKER_FAILURE_THRESHOLD,
+    FMI_RSS_FEED,
+    SNAPSHOT_MAX_AGE,
+)
+from fmi_weather_warnings.retry import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    async_retry,
+    backoff_delay,
+)
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+FEED_URL = FMI_RSS_FEED.format(language="en-GB")
+
+
+def load_fixture():
+    with open(FIXTURE, 'rb') as fixture:
+        return fixture.read()
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Flaky:
+    """Callable that fails a number of times before succeeding."""
+
+    def __init__(self, failures, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("unavailable")
+        return "ok"
+
+
+def run_retry(call, retries=2, is_retryable=lambda err: isinstance(err, ConnectionError)):
+    """Run async_retry with a recording sleep and fixed jitter."""
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    result = asyncio.run(
+        async_retry(call, retries, 2, 5, is_retryable, sleep=sleep, rng=lambda: 0.5)
+    )
+    return result, delays
+
+
+def test_backoff_is_exponential_capped_and_jittered():
+    """Delays double per attempt up to the cap, scaled by the jitter."""
+    assert [backoff_delay(n, 2, 30, rng=lambda: 1.0) for n in range(6)] == [2, 4, 8, 16, 30, 30]
+    assert backoff_delay(2, 2, 30, rng=lambda: 0.25) == 2
+
+
+def test_retry_until_success():
+    """Retryable failures are retried with backoff in between."""
+    call = Flaky(2)
+    assert run_retry(call) == ("ok", [1.0, 2.0])
+    assert call.calls == 3
+
+
+def test_retry_gives_up():
+    """Too many failures, or a failure that is not retryable, are raised."""
+    call = Flaky(3)
+    with pytest.raises(ConnectionError):
+        run_retry(call)
+    assert call.calls == 3
+
+    call = Flaky(1, error=ValueError)
+    with pytest.raises(ValueError):
+        run_retry(call)
+    assert call.calls == 1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """The breaker opens after repeated failures and lets one trial through."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=300, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED and breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+    assert breaker.as_dict()["seconds_until_retry"] == 300
+
+    # A failed trial reopens the breaker for another full timeout
+    clock.now = 300
+    assert breaker.allow_request() and breaker.state == STATE_HALF_OPEN
+    breaker.record_failure()
+    clock.now = 500
+    assert not breaker.allow_request()
+
+    clock.now = 600
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.as_dict() == {
+        "state": STATE_CLOSED,
+        "consecutive_failures": 0,
+        "total_failures": 3,
+        "total_successes": 1,
+        "rejected_requests": 2,
+        "seconds_until_retry": None,
+    }
+
+
+def no_backoff(monkeypatch):
+    """Retry the feed service's fetches without waiting."""
+    monkeypatch.setattr(feed_module, "FETCH_BACKOFF_BASE", 0)
+    monkeypatch.setattr(feed_module, "FETCH_BACKOFF_MAX", 0)
+
+
+def test_feed_retries_transient_errors(feed_harness, monkeypatch):
+    """Server errors and connection errors from FMI are retried within a poll."""
+    no_backoff(monkeypatch)
+    harness = feed_harness({
+        FEED_URL: [
+            FakeResponse(503),
+            feed_module.ClientError("connection reset"),
+            FakeResponse(body=load_fixture()),
+        ],
+    })
+
+    async def scenario():
+        coordinator = harness.register()
+        await harness.fire()
+        assert coordinator.last_exception is None
+
+    asyncio.run(scenario())
+    assert len(harness.session.requests) == 3
+    assert len(harness.feed.warnings) == 6
+    assert harness.feed.breaker.as_dict()["state"] == STATE_CLOSED
+
+
+def test_feed_opens_breaker_after_repeated_failures(feed_harness, monkeypatch):
+    """Errors that are not transient are not retried, and they open the breaker."""
+    no_backoff(monkeypatch)
+    harness = feed_harness({FEED_URL: [FakeResponse(404)]})
+
+    async def scenario():
+        coordinator = harness.register()
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            await harness.fire()
+            assert isinstance(coordinator.last_exception, feed_module.FeedFetchError)
+            assert not coordinator.last_exception.retryable
+        assert len(harness.session.requests) == BREAKER_FAILURE_THRESHOLD
+        assert harness.feed.breaker.state == STATE_OPEN
+
+        # While the breaker is open, polls make no requests
+        await harness.fire()
+        assert len(harness.session.requests) == BREAKER_FAILURE_THRESHOLD
+        assert "paused" in str(coordinator.last_exception)
+
+    asyncio.run(scenario())
+
+
+def test_last_warnings_served_until_stale(feed_harness, monkeypatch):
+    """Failing polls keep the last warnings until they are too old to serve."""
+    no_backoff(monkeypatch)
+    fetched_at = datetime(2025, 11, 15, 10, tzinfo=timezone.utc)
+    clock = [fetched_at]
+    monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: clock[0])
+    # Every wakeup is a poll, not a refresh at a warning boundary
+    monkeypatch.setattr(feed_module, "next_boundary", lambda *_args: None)
+    harness = feed_harness({FEED_URL: [FakeResponse(body=load_fixture()), FakeResponse(500)]})
+
+    async def scenario():
+        coordinator = harness.register()
+        await harness.fire()
+        assert coordinator.last_exception is None
+
+        clock[0] = fetched_at + timedelta(seconds=SNAPSHOT_MAX_AGE)
+        await harness.fire()
+        assert coordinator.last_exception is None
+        assert len(harness.feed.warnings) == 6
+        assert harness.feed.fetched_at == fetched_at
+
+        clock[0] = fetched_at + timedelta(seconds=SNAPSHOT_MAX_AGE + 1)
+        await harness.fire()
+        assert isinstance(coordinator.last_exception, feed_module.UpdateFailed)
+
+    asyncio.run(scenario())
+    # Both failing polls retried the fetch
+    assert len(harness.session.requests) == 1 + 2 * (feed_module.FETCH_RETRIES + 1)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Test geometric area matching against the offline feed fixture."""
+
+import os
+
+from fmi_weather_warnings.geo import GeoMatcher, PolygonIndex, point_in_polygon
+from fmi_weather_warnings.rss import parse_feed
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+
+HELSINKI = (60.17, 24.94)
+ROVANIEMI = (66.50, 25.73)
+KUOPIO = (62.89, 27.68)
+
+
+def load_warnings():
+    """Return the warnings of the recorded feed."""
+    with open(FIXTURE, 'rb') as fixture:
+        return parse_feed(fixture.read())
+
+
+def test_point_in_polygon():
+    """Concave polygons are handled by the exact test."""
+    # An L-shaped polygon; (1.5, 1.5) is inside its bounding box but not in it
+    polygon = [(0, 0), (0, 2), (1, 2), (1, 1), (2, 1), (2, 0), (0, 0)]
+    assert point_in_polygon(0.5, 1.5, polygon)
+    assert point_in_polygon(1.5, 0.5, polygon)
+    assert not point_in_polygon(1.5, 1.5, polygon)
+    assert not point_in_polygon(3, 3, polygon)
+
+
+def test_fixture_polygons_and_geocodes():
+    """The parser exposes CAP polygons and geocodes."""
+    warnings = load_warnings()
+    assert warnings[0].polygons[0][0] == (59.80, 23.40)
+    assert warnings[0].geocodes == ("1",)
+    assert warnings[1].geocodes == ("SEA-GOF",)
+
+
+def test_polygon_index_query():
+    """Points only match the warnings whose polygons contain them."""
+    warnings = load_warnings()
+    index = PolygonIndex(warnings)
+
+    assert index.query(*HELSINKI) == {0, 1}
+    assert index.query(*ROVANIEMI) == {4}
+    assert index.query(*KUOPIO) == set()
+
+
+def test_geo_matcher():
+    """Locations and geocodes are matched in one pass over the feed."""
+    warnings = load_warnings()
+    matcher = GeoMatcher(
+        {"helsinki": HELSINKI, "rovaniemi": ROVANIEMI, "kuopio": KUOPIO},
+        {"pirkanmaa": "6"},
+    )
+
+    matches = matcher.match_all(warnings)
+
+    assert matches == [
+        {"helsinki"},
+        {"helsinki"},
+        set(),
+        {"pirkanmaa"},
+        {"rovaniemi"},
+        set(),
+    ]
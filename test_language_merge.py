@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Test merging the language versions of the feed by CAP identifier."""
+
+import asyncio
+import os
+from dataclasses import replace
+from datetime import datetime, timezone
+
+from conftest import FakeResponse
+from fmi_weather_warnings import feed as feed_module
+from fmi_weather_warnings.const import FMI_RSS_FEED
+from fmi_weather_warnings.matcher import MultiAreaMatcher
+from fmi_weather_warnings.merge import localize, merge_feeds
+from fmi_weather_warnings.model import Severity, Warning
+from fmi_weather_warnings.sensor import WarningEntityManager
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+NOW = datetime(2025, 11, 15, 10, 30, tzinfo=timezone.utc)
+
+
+def make_feeds():
+    english = [
+        Warning(id="1", title="Wind warning", area="Uusimaa", severity=Severity.MODERATE),
+        Warning(id="2", title="Snow warning", area="Lapland", severity=Severity.MINOR),
+    ]
+    swedish = [
+        Warning(id="1", title="Varning för vind", area="Nyland", severity=Severity.MODERATE),
+    ]
+    return {"en-GB": english, "sv-FI": swedish}
+
+
+def test_merge_by_identifier():
+    """Language versions of a warning become one warning with translations."""
+    merged = merge_feeds(make_feeds())
+
+    assert [warning.id for warning in merged] == ["1", "2"]
+    assert merged[0].title == "Wind warning"
+    assert merged[0].translations["sv-FI"] == {
+        "title": "Varning för vind",
+        "link": "",
+        "summary": "",
+        "area": "Nyland",
+    }
+    assert localize(merged[0], "sv-FI").title == "Varning för vind"
+    # Missing translations fall back to the preferred language
+    assert localize(merged[1], "sv-FI").title == "Snow warning"
+
+
+def test_unchanged_warnings_are_reused():
+    """A warning whose language versions are unchanged keeps its record."""
+    feeds = make_feeds()
+    merged = merge_feeds(feeds)
+    previous = {warning.id: warning for warning in merged}
+
+    feeds["en-GB"][1] = replace(feeds["en-GB"][1], severity=Severity.MODERATE)
+    remerged = merge_feeds(feeds, previous)
+
+    assert remerged[0] is merged[0]
+    assert remerged[1] is not merged[1]
+
+
+def test_area_matching_covers_every_language():
+    """Areas are matched against the text of all languages at once."""
+    merged = merge_feeds(make_feeds())
+    matcher = MultiAreaMatcher({"en": "Uusimaa", "sv": "Nyland"})
+
+    assert matcher.match(merged[0]) == {"en", "sv"}
+    assert matcher.match(merged[1]) == set()
+
+
+def test_new_language_is_no_change_for_other_entries(feed_harness, monkeypatch):
+    """Merging in the feed of a new entry's language leaves other entries alone."""
+    monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: NOW)
+    with open(FIXTURE, 'rb') as fixture:
+        english = fixture.read()
+    swedish = english.replace(b"warning", b"varning").replace(b"en-GB", b"sv-FI")
+    harness = feed_harness({
+        FMI_RSS_FEED.format(language="en-GB"): [FakeResponse(body=english)],
+        FMI_RSS_FEED.format(language="sv-FI"): [FakeResponse(body=swedish)],
+    })
+    hass = harness.feed.hass
+    written = []
+
+    def add_entities(entities):
+        for entity in entities:
+            entity.hass = hass
+            entity.async_write_ha_state = lambda entity=entity: written.append(entity.warning_id)
+
+    async def scenario():
+        coordinator = harness.add_entry("english", area="Uusimaa")
+        await coordinator.async_refresh()
+        manager = WarningEntityManager(
+            hass, coordinator, harness.entries["english"], add_entities
+        )
+        manager.async_sync()
+        coordinator.async_add_listener(manager.async_sync)
+        warnings = coordinator.data["warnings"]
+        assert len(warnings) == 1
+        version = coordinator.warnings_version
+
+        await harness.add_entry("swedish", language="sv-FI").async_refresh()
+        await harness.feed._async_scheduled_refresh(NOW)
+
+        assert all(warning.translations for warning in harness.feed.warnings)
+        assert all(a is b for a, b in zip(coordinator.data["warnings"], warnings))
+        assert coordinator.warnings_version == version
+        assert hass.events == []
+        assert written == []
+
+    asyncio.run(scenario())
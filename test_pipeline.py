@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Test the feed pipeline and that running it keeps the event loop responsive."""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+
+from conftest import FakeResponse
+from fmi_weather_warnings.const import FMI_RSS_FEED
+from fmi_weather_warnings.geo import GeoMatcher
+from fmi_weather_warnings.matcher import MultiAreaMatcher
+from fmi_weather_warnings.metrics import PollMetrics
+from fmi_weather_warnings.pipeline import PipelineResult, run_pipeline
+from fmi_weather_warnings.rss import parse_feed
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+FEED_URL = FMI_RSS_FEED.format(language="en-GB")
+
+# Longest the event loop may go without running a callback, in seconds, as
+# asyncio's debug mode reports slower callbacks
+LOOP_BLOCK_THRESHOLD = 0.1
+HEARTBEAT_INTERVAL = 0.001
+
+
+def load_fixture(copies=1):
+    """Return the fixture with ``copies`` copies of its items, each with its own IDs."""
+    with open(FIXTURE, 'rb') as fixture:
+        content = fixture.read()
+    if copies == 1:
+        return content
+    head, _, rest = content.partition(b'<item>')
+    items, _, tail = rest.rpartition(b'</item>')
+    items = b'<item>' + items + b'</item>'
+    return head + b''.join(
+        items.replace(b'2.49.0.1.246.0.0.', b'2.49.0.1.246.%d.0.' % copy)
+        for copy in range(copies)
+    ) + tail
+
+
+def make_matchers():
+    """Return text and geo matchers for a few config entries."""
+    return (
+        MultiAreaMatcher({"uusimaa": "Uusimaa", "lappi": "Lapland", "all": ""}),
+        GeoMatcher({"helsinki": (60.17, 24.94)}, {"pirkanmaa": "6"}),
+    )
+
+
+def run(content, previous=None):
+    """Run the pipeline for a single English feed."""
+    previous = previous or PipelineResult({"en-GB": []}, [], [], [], [], 0, {})
+    return run_pipeline(
+        {"en-GB": content} if content is not None else {},
+        previous.feeds,
+        previous.merged,
+        previous.warnings,
+        previous.matches,
+        previous.area_matches,
+        *make_matchers(),
+    )
+
+
+def test_pipeline_parses_and_matches():
+    """Bytes go in, parsed warnings and their matching entries come out."""
+    result = run(load_fixture())
+
+    assert result.warnings == parse_feed(load_fixture())
+    assert result.changed == len(result.warnings) == 6
+    assert result.matches[0] == {"uusimaa", "all", "helsinki"}
+    assert all("all" in entry_ids for entry_ids in result.matches)
+
+
+def test_pipeline_reuses_unchanged_warnings():
+    """Reprocessing the same feed keeps every warning and match object."""
+    first = run(load_fixture())
+    second = run(load_fixture(), first)
+
+    assert second.changed == 0
+    assert all(a is b for a, b in zip(second.warnings, first.warnings))
+    assert all(a is b for a, b in zip(second.matches, first.matches))
+
+
+def test_pipeline_metrics():
+    """Parse and match times are measured and recorded in the poll metrics."""
+    result = run(load_fixture())
+    assert result.parse_seconds > 0
+    assert result.match_seconds > 0
+
+    metrics = PollMetrics()
+    metrics.record_fetch(0.25, 9783)
+    metrics.record_pipeline(
+        result.parse_seconds, result.match_seconds, len(result.warnings), result.changed
+    )
+    metrics.record_fetch(0.1, 0)
+
+    data = metrics.as_dict()
+    assert data["fetch_ms"] == 100
+    assert data["bytes_received"] == 0
+    assert data["total_bytes_received"] == 9783
+    assert data["polls"] == 2
+    assert data["parse_ms"] == round(result.parse_seconds * 1000, 3)
+    assert data["warnings"] == data["changed"] == 6
+
+
+async def _max_loop_lag(awaitable):
+    """Await ``awaitable`` and return the longest the event loop stalled meanwhile."""
+    task = asyncio.ensure_future(awaitable)
+    lag = 0.0
+    while not task.done():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lag = max(lag, time.perf_counter() - start - HEARTBEAT_INTERVAL)
+    await task
+    return lag
+
+
+def test_refresh_does_not_block_the_loop(feed_harness, monkeypatch):
+    """A poll of a large feed, from the fetch to every entry's data, keeps the loop responsive."""
+    from fmi_weather_warnings import feed as feed_module
+
+    now = datetime(2025, 11, 15, 10, 30, tzinfo=timezone.utc)
+    monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: now)
+    harness = feed_harness({FEED_URL: [FakeResponse(body=load_fixture(copies=300))]})
+
+    async def scenario():
+        coordinators = [
+            harness.add_entry("uusimaa", area="Uusimaa"),
+            harness.add_entry("route", area="Tampere, Oulu, Rovaniemi"),
+            harness.add_entry("all", area=""),
+        ]
+        lag = await _max_loop_lag(harness.fire())
+        return lag, coordinators
+
+    lag, coordinators = asyncio.run(scenario())
+
+    assert len(harness.feed.warnings) == 1800
+    assert all(coordinator.last_update_success for coordinator in coordinators)
+    assert coordinators[1].data["area_counts"] == {"Tampere": 0, "Oulu": 300, "Rovaniemi": 0}
+    assert lag < LOOP_BLOCK_THRESHOLD
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test the Finnish place-name index and matching areas through it."""
+
+import os
+import subprocess
+import sys
+
+from fmi_weather_warnings.matcher import MultiAreaMatcher
+from fmi_weather_warnings.model import make_warning
+from fmi_weather_warnings.places import place_index
+
+BUILD_SCRIPT = os.path.join(os.path.dirname(__file__), 'scripts', 'build_place_index.py')
+
+
+def warning(area, summary=""):
+    return make_warning({"id": area, "title": f"Wind warning: {area}", "area": area, "summary": summary})
+
+
+def test_index_is_up_to_date():
+    """The shipped index matches the tables it is built from."""
+    subprocess.run([sys.executable, BUILD_SCRIPT, '--check'], check=True)
+
+
+def test_resolve_names_forms_and_aliases():
+    """Inflected Finnish forms and Swedish and English names share one ID."""
+    places = place_index()
+    assert places is place_index()
+
+    assert places.resolve("Tampere") == "municipality:tampere"
+    assert places.resolve("tampereella") == "municipality:tampere"
+    assert places.resolve("Helsingfors") == "municipality:helsinki"
+    assert places.resolve("Uudellamaalla") == "region:uusimaa"
+    assert places.resolve("Lapland") == places.resolve("Lappi") == "region:lappi"
+    assert places.resolve("Gulf of  Finland") == "sea:gulf-of-finland"
+    assert places.resolve("Oulunkylä") is None
+
+    assert places.lineage("municipality:espoo") == ["municipality:espoo", "region:uusimaa"]
+    assert places.lineage("sea:quark") == ["sea:quark"]
+
+
+def test_longest_name_wins():
+    """Names of several words are taken whole, not as their last word."""
+    matcher = MultiAreaMatcher(
+        {"pohjanmaa": "Österbotten", "vaasa": "Vaasa", "oulu": "Oulu"}, place_index()
+    )
+    # Norra Österbotten is Oulu's region, not Österbotten
+    assert matcher.match(warning("Norra Österbotten", "Hårda vindar  i Vasa")) == {"oulu", "vaasa"}
+    assert matcher.match(warning("Pohjanmaa")) == {"pohjanmaa", "vaasa"}
+    assert matcher.match(warning("Pohjois-Pohjanmaalla")) == {"oulu"}
+
+
+def test_adjective_forms_name_their_own_region():
+    """English and Swedish adjective forms do not fall through to the region they end with."""
+    places = place_index()
+    assert places.resolve("Northern Ostrobothnia") == "region:pohjois-pohjanmaa"
+    assert places.resolve("Ostrobothnian") == "region:pohjanmaa"
+    assert places.resolve("österbottniska") == "region:pohjanmaa"
+    assert places.resolve("Norra Österbottens") == "region:pohjois-pohjanmaa"
+
+    matcher = MultiAreaMatcher(
+        {"pohjanmaa": "Pohjanmaa", "vaasa": "Vaasa", "oulu": "Oulu"}, place_index()
+    )
+    assert matcher.match(warning("Northern Ostrobothnia")) == {"oulu"}
+    assert matcher.match(warning("Southern Ostrobothnia")) == set()
+    assert matcher.match(warning("Kust", "Hårda vindar vid den österbottniska kusten")) == {
+        "pohjanmaa", "vaasa"
+    }
+    assert matcher.match(warning("Kust", "Hårda vindar vid den nordösterbottniska kusten")) == {
+        "oulu"
+    }
+
+
+def test_hyphenated_compounds_name_each_place():
+    """Compounds of place names match each place, but compound place names stay whole."""
+    matcher = MultiAreaMatcher(
+        {"helsinki": "Helsinki", "vantaa": "Vantaa", "pohjanmaa": "Pohjanmaa"}, place_index()
+    )
+    assert matcher.match(warning("Airports", "Fog at Helsinki-Vantaa")) == {
+        "helsinki", "vantaa"
+    }
+    assert matcher.match(warning("Lentoasemat", "Sumua Helsinki-Vantaalla")) == {
+        "helsinki", "vantaa"
+    }
+    assert matcher.match(warning("Etelä-Pohjanmaa")) == set()
+    assert matcher.match(warning("Etelä-Pohjanmaan ja Pohjanmaan rannikko")) == {"pohjanmaa"}
+
+
+def test_municipality_matches_its_region():
+    """A municipality matches warnings for its region, but not the other way."""
+    matcher = MultiAreaMatcher(
+        {"espoo": "Espoo", "uusimaa": "Uusimaa", "sea": "Suomenlahti"}, place_index()
+    )
+    region, town, sea = matcher.match_all([
+        warning("Uusimaa"),
+        warning("Southern Finland", "Slippery in Espoo"),
+        warning("Gulf of Finland"),
+    ])
+    assert region == {"espoo", "uusimaa"}
+    assert town == {"espoo"}
+    assert sea == {"sea"}
+
+
+def test_whole_names_only():
+    """Indexed areas no longer match longer words that merely start with them."""
+    oulu = warning("Helsinki", "Strong winds in Oulunkylä")
+    assert MultiAreaMatcher({"oulu": "Oulu"}, place_index()).match(oulu) == set()
+    # The suffix stemming without the index does
+    assert MultiAreaMatcher({"oulu": "Oulu"}).match(oulu) == {"oulu"}
+
+    # Areas the index does not know still match by their stem
+    assert MultiAreaMatcher({"x": "Nuuksio"}, place_index()).match(
+        warning("Uusimaa", "Nuuksiossa kova tuuli")
+    ) == {"x"}
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Test the adaptive poll scheduler and refreshes at warning boundaries with a fake clock."""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+
+from conftest import FakeResponse
+from fmi_weather_warnings import feed as feed_module
+from fmi_weather_warnings.const import FMI_RSS_FEED
+from fmi_weather_warnings.model import Warning
+from fmi_weather_warnings.rss import parse_timestamp
+from fmi_weather_warnings.scheduler import PollScheduler, next_boundary
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+FEED_URL = FMI_RSS_FEED.format(language="en-GB")
+# The Uusimaa wind warning is in effect from 10:00 to 01:00 UTC
+WIND_WARNING = "2.49.0.1.246.0.0.2025.11.15.06.00.01.0001"
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self, now=1_763_193_600.0):  # 2025-11-15T08:00:00+00:00
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def test_backoff_while_unchanged_and_reset_on_change():
+    """Unchanged polls double the interval up to the maximum."""
+    clock = FakeClock()
+    scheduler = PollScheduler(60, 900, initial_interval=300, clock=clock)
+
+    assert [scheduler.record_poll(False) for _ in range(4)] == [600, 900, 900, 900]
+    assert scheduler.record_poll(True) == 60
+    assert scheduler.record_poll(False) == 120
+
+    clock.advance(100)
+    assert scheduler.next_wakeup() == (20, True)
+
+
+def test_bounds_are_applied_to_current_interval():
+    """Tightening the bounds clamps the current interval."""
+    scheduler = PollScheduler(60, 900, initial_interval=900, clock=FakeClock())
+    scheduler.set_bounds(30, 120)
+    assert scheduler.interval == 120
+
+
+def test_tighter_bounds_bring_the_next_poll_forward():
+    """A poll scheduled past the new maximum happens within it instead."""
+    clock = FakeClock()
+    scheduler = PollScheduler(60, 900, initial_interval=450, clock=clock)
+    scheduler.record_poll(False)  # next poll in 900 s
+    clock.advance(100)
+
+    scheduler.set_bounds(60, 300)
+    assert scheduler.next_wakeup() == (200, True)
+
+    # Looser bounds leave the pending poll alone
+    scheduler.set_bounds(60, 900)
+    assert scheduler.next_wakeup() == (200, True)
+
+
+def test_local_refresh_at_warning_boundary():
+    """A warning boundary before the next poll wakes up without a fetch."""
+    clock = FakeClock()
+    scheduler = PollScheduler(60, 900, initial_interval=450, clock=clock)
+    scheduler.record_poll(False)  # next poll in 900 s
+
+    now = datetime.fromtimestamp(clock(), timezone.utc)
+    warnings = [
+        Warning(
+            id="1",
+            effective=parse_timestamp("2025-11-15T07:00:00+00:00"),
+            expires=parse_timestamp("2025-11-15T10:05:00+02:00"),
+        ),
+        Warning(id="2", effective=parse_timestamp("2025-11-15T08:20:00+00:00")),
+    ]
+    boundary = next_boundary(warnings, now)
+    assert boundary == parse_timestamp("2025-11-15T08:05:00+00:00")
+    assert scheduler.next_wakeup(boundary) == (300, False)
+
+    # Boundaries after the next poll do not cause a local refresh
+    clock.advance(300)
+    now = datetime.fromtimestamp(clock(), timezone.utc)
+    boundary = next_boundary(warnings, now)
+    assert boundary == parse_timestamp("2025-11-15T08:20:00+00:00")
+    assert scheduler.next_wakeup(boundary) == (600, True)
+
+    # Once every boundary has passed only polls remain
+    clock.advance(900)
+    now = datetime.fromtimestamp(clock(), timezone.utc)
+    assert next_boundary(warnings, now) is None
+    assert scheduler.next_wakeup(None) == (0, True)
+
+
+def test_warning_boundaries_without_a_fetch(feed_harness, monkeypatch):
+    """Warnings become active and expire on time without refetching or reindexing."""
+    clock = [datetime(2025, 11, 15, 9, tzinfo=timezone.utc)]
+    monkeypatch.setattr(feed_module.dt_util, "utcnow", lambda: clock[0])
+    with open(FIXTURE, 'rb') as fixture:
+        harness = feed_harness({FEED_URL: [FakeResponse(body=fixture.read())]})
+    coordinator = harness.add_entry(area="Uusimaa")
+    indexed = []
+    index = coordinator._async_index_warnings
+
+    def counting_index(*args):
+        indexed.append(args)
+        index(*args)
+
+    coordinator._async_index_warnings = counting_index
+
+    async def boundary(now):
+        clock[0] = now
+        await harness.feed._async_boundary_refresh(now)
+        return coordinator.data
+
+    async def scenario():
+        await harness.fire()
+        data = coordinator.data
+        assert data["warnings"] == []
+        assert [warning.id for warning in data["upcoming"]] == [WIND_WARNING]
+
+        data = await boundary(datetime(2025, 11, 15, 10, tzinfo=timezone.utc))
+        assert [warning.id for warning in data["warnings"]] == [WIND_WARNING]
+        assert data["upcoming"] == []
+        assert data["added"] == {WIND_WARNING}
+
+        data = await boundary(datetime(2025, 11, 16, 1, tzinfo=timezone.utc))
+        assert data["warnings"] == data["upcoming"] == []
+        assert data["removed"] == {WIND_WARNING}
+
+    asyncio.run(scenario())
+
+    assert harness.session.requests == [FEED_URL]
+    assert harness.feed.version == 1
+    assert len(indexed) == 1
+    events = [data for _, data in harness.feed.hass.events]
+    assert [[warning["id"] for warning in event["added"]] for event in events] == [
+        [WIND_WARNING],
+        [],
+    ]
+    assert [[warning["id"] for warning in event["removed"]] for event in events] == [
+        [],
+        [WIND_WARNING],
+    ]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test the streaming FMI RSS/CAP parser against the recorded feed fixture."""
+
+import os
+from datetime import datetime, timezone
+
+from fmi_weather_warnings.model import Severity, Urgency, Warning
+from fmi_weather_warnings.rss import FeedFormatError, parse_feed, parse_timestamp
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'rss_en-GB.xml')
+
+
+def load_fixture():
+    """Return the recorded feed as bytes."""
+    with open(FIXTURE, 'rb') as fixture:
+        return fixture.read()
+
+
+def test_parse_feed_fields():
+    """All items are parsed with their RSS and CAP fields."""
+    warnings = parse_feed(load_fixture())
+
+    assert len(warnings) == 6
+
+    warning = warnings[0]
+    assert warning.title == "Yellow wind warning for land areas: Uusimaa"
+    assert warning.published == "Sat, 15 Nov 2025 06:00:01 GMT"
+    assert warning.summary.startswith("Wind gusts of 20-25 m/s")
+    assert warning.event == "Wind warning for land areas"
+    assert warning.severity is Severity.MODERATE
+    assert warning.certainty == "Likely"
+    assert warning.urgency is Urgency.EXPECTED
+    assert warning.effective == datetime(2025, 11, 15, 10, tzinfo=timezone.utc)
+    assert warning.expires == datetime(2025, 11, 16, 1, tzinfo=timezone.utc)
+    assert warning.sender == "https://www.fmi.fi"
+    # CAP description is kept apart from the RSS description (summary)
+    assert warning.description.startswith("Wind gusts of 20-25 m/s are expected during")
+    assert warning.area == "Uusimaa FMI region 1"
+
+    # Optional CAP fields are None when the item does not have them
+    assert warnings[1].instruction is None
+
+
+def test_parse_feed_area_fallback():
+    """Items without CAP area fields fall back to title and summary."""
+    content = b"""<rss version="2.0"><channel><item>
+        <title>Wind warning for Helsinki</title>
+        <description>Strong winds</description>
+    </item></channel></rss>"""
+
+    warnings = parse_feed(content)
+
+    assert warnings == [Warning(
+        id="|",
+        fingerprint=warnings[0].fingerprint,
+        title="Wind warning for Helsinki",
+        summary="Strong winds",
+        area="wind warning for helsinki strong winds",
+    )]
+
+
+def test_parse_feed_reuses_unchanged_items():
+    """Unchanged items keep their previous warning, changed ones are reparsed."""
+    content = load_fixture()
+    previous = {warning.id: warning for warning in parse_feed(content)}
+    assert "2.49.0.1.246.0.0.2025.11.15.06.00.01.0001" in previous
+
+    changed = content.replace(b"Wind gusts of 20-25 m/s are expected during", b"Wind gusts of 25-30 m/s are expected during")
+    warnings = parse_feed(changed, previous)
+
+    assert warnings[0] is not previous[warnings[0].id]
+    assert warnings[0].description.startswith("Wind gusts of 25-30 m/s")
+    assert all(warning is previous[warning.id] for warning in warnings[1:])
+
+
+def test_parse_timestamp():
+    """CAP timestamps become timezone-aware datetimes."""
+    assert parse_timestamp("2025-11-15T12:00:00+02:00") == datetime(
+        2025, 11, 15, 10, tzinfo=timezone.utc
+    )
+    # Timestamps without an offset are taken to be UTC
+    assert parse_timestamp("2025-11-15T12:00:00").tzinfo == timezone.utc
+    assert parse_timestamp("2025-11-15T10:00:00Z") == datetime(
+        2025, 11, 15, 10, tzinfo=timezone.utc
+    )
+    assert parse_timestamp("") is None
+    assert parse_timestamp("tomorrow") is None
+
+
+def test_parse_feed_rejects_unexpected_formats():
+    """Atom feeds and broken XML are left to the feedparser fallback."""
+    for content in (b'<feed xmlns="http://www.w3.org/2005/Atom"></feed>', b'<rss><channel>'):
+        try:
+            parse_feed(content)
+        except FeedFormatError:
+            continue
+        raise AssertionError(f"FeedFormatError not raised for {content!r}")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Test setting up the per-warning entities of a config entry."""
+
+import asyncio
+import types
+
+import pytest
+
+from fmi_weather_warnings import sensor as sensor_module
+from fmi_weather_warnings.attributes import attribute_fields
+from fmi_weather_warnings.const import CONF_WARNING_ENTITIES, DOMAIN
+from fmi_weather_warnings.model import make_warning
+from fmi_weather_warnings.sensor import WarningEntityManager
+
+ACTIVE_ID = "2.49.0.1.246.0.0.2025.11.15.06.00.01.0001"
+EXPIRED_ID = "2.49.0.1.246.0.0.2025.11.14.18.00.00.0005"
+
+
+class FakeRegistry:
+    """Entity registry holding (entity ID, config entry ID, unique ID) rows."""
+
+    def __init__(self, rows):
+        self.entries = {
+            entity_id: types.SimpleNamespace(
+                entity_id=entity_id, config_entry_id=config_entry_id, unique_id=unique_id
+            )
+            for entity_id, config_entry_id, unique_id in rows
+        }
+        self.removed = []
+
+    def async_get(self, entity_id):
+        return self.entries.get(entity_id)
+
+    def async_remove(self, entity_id):
+        self.removed.append(entity_id)
+        del self.entries[entity_id]
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = FakeRegistry([
+        ("sensor.active_warnings", "entry", "entry_active_warnings"),
+        ("sensor.fetch_time", "entry", "entry_fetch_time"),
+        ("sensor.wind_warning", "entry", f"entry_{ACTIVE_ID}"),
+        ("sensor.expired_warning", "entry", f"entry_{EXPIRED_ID}"),
+        ("sensor.other_warning", "other", f"other_{EXPIRED_ID}"),
+    ])
+    monkeypatch.setattr(sensor_module.er, "async_get", lambda _hass: registry)
+    monkeypatch.setattr(
+        sensor_module.er,
+        "async_entries_for_config_entry",
+        lambda registry, entry_id: [
+            entity_entry
+            for entity_entry in registry.entries.values()
+            if entity_entry.config_entry_id == entry_id
+        ],
+    )
+    return registry
+
+
+def set_up(warning_entities):
+    """Set up the sensor platform of an entry with one active warning."""
+    coordinator = types.SimpleNamespace(
+        data={"warnings": [make_warning({"id": ACTIVE_ID, "title": "Wind warning"})]},
+        last_update_success=True,
+        language="en-GB",
+        attribute_fields=attribute_fields("full"),
+        config_version=0,
+        warnings_version=1,
+        async_add_listener=lambda _listener: lambda: None,
+    )
+    entry = types.SimpleNamespace(
+        entry_id="entry",
+        data={CONF_WARNING_ENTITIES: warning_entities},
+        options={},
+        async_on_unload=lambda _unsub: None,
+    )
+    hass = types.SimpleNamespace(data={DOMAIN: {"entry": coordinator}})
+    added = []
+
+    def add_entities(entities, _update_before_add=False):
+        added.extend(entities)
+
+    asyncio.run(sensor_module.async_setup_entry(hass, entry, add_entities))
+    return added
+
+
+def test_entities_of_expired_warnings_are_removed_at_setup(registry):
+    """Warnings that ended while Home Assistant was stopped leave no entity behind."""
+    added = set_up(warning_entities=True)
+
+    assert registry.removed == ["sensor.expired_warning"]
+    assert [entity.unique_id for entity in added] == [
+        "entry_active_warnings",
+        f"entry_{ACTIVE_ID}",
+    ]
+
+
+def test_warning_entities_removed_when_turned_off(registry):
+    """Turning the warning entities off removes them with the next setup."""
+    set_up(warning_entities=False)
+
+    assert registry.removed == ["sensor.wind_warning", "sensor.expired_warning"]
+    assert set(registry.entries) == {
+        "sensor.active_warnings",
+        "sensor.fetch_time",
+        "sensor.other_warning",
+    }
+
+
+def test_entities_follow_the_warnings(registry):
+    """Entities come and go with their warning, and only changed ones write state."""
+    wind = make_warning({"id": "wind", "title": "Wind warning", "severity": "Moderate"})
+    rain = make_warning({"id": "rain", "title": "Rain warning", "severity": "Minor"})
+    snow = make_warning({"id": "snow", "title": "Snow warning", "severity": "Minor"})
+    coordinator = types.SimpleNamespace(
+        data={"warnings": [wind, rain, snow]},
+        last_update_success=True,
+        language="en-GB",
+        attribute_fields=attribute_fields("full"),
+        config_version=0,
+    )
+    entry = types.SimpleNamespace(entry_id="entry", data={}, options={})
+    added = []
+    written = []
+
+    def add_entities(entities):
+        # Home Assistant adds the entities to the registry and writes their state
+        for entity in entities:
+            entity.hass = object()
+            entity.entity_id = f"sensor.{entity.warning_id}_warning"
+            entity.async_write_ha_state = lambda entity=entity: written.append(entity.warning_id)
+            registry.entries[entity.entity_id] = types.SimpleNamespace(
+                entity_id=entity.entity_id, config_entry_id="entry", unique_id=entity.unique_id
+            )
+            added.append(entity.warning_id)
+
+    manager = WarningEntityManager(object(), coordinator, entry, add_entities)
+    manager.async_sync()
+    assert added == ["wind", "rain", "snow"]
+    assert written == []
+
+    # The rain warning is upgraded, the snow warning ends and a storm warning is issued
+    heavy_rain = make_warning({"id": "rain", "title": "Rain warning", "severity": "Severe"})
+    storm = make_warning({"id": "storm", "title": "Storm warning", "severity": "Severe"})
+    coordinator.data = {"warnings": [wind, heavy_rain, storm]}
+    added.clear()
+    manager.async_sync()
+
+    assert added == ["storm"]
+    assert registry.removed == ["sensor.snow_warning"]
+    assert written == ["rain"]
+    assert manager._entities["rain"].native_value == "Severe"
+
+    # Every entity writes its state when the warnings become unavailable
+    coordinator.last_update_success = False
+    added.clear()
+    written.clear()
+    manager.async_sync()
+    assert sorted(written) == ["rain", "storm", "wind"]
+    assert added == []
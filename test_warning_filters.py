@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the severity, urgency, certainty and event filters applied before matching."""
+
+from fmi_weather_warnings.filters import MultiWarningFilter, WarningFilter, warning_filter
+from fmi_weather_warnings.geo import GeoMatcher
+from fmi_weather_warnings.matcher import MultiAreaMatcher
+from fmi_weather_warnings.model import make_warning
+from fmi_weather_warnings.pipeline import match_warnings
+
+
+def make_warnings():
+    """Return warnings of different severities for Uusimaa."""
+    return [
+        make_warning({
+            "id": "wind", "event": "Wind warning for land areas", "area": "Uusimaa",
+            "severity": "Moderate", "urgency": "Expected", "certainty": "Likely",
+            "translations": {
+                "en-GB": {"event": "Wind warning for land areas", "area": "Uusimaa"},
+                "fi-FI": {"event": "Maa-alueiden tuulivaroitus", "area": "Uusimaa"},
+            },
+        }),
+        make_warning({
+            "id": "fire", "event": "Forest fire warning", "area": "Uusimaa",
+            "severity": "Severe", "urgency": "Immediate", "certainty": "Observed",
+        }),
+        make_warning({
+            "id": "traffic", "event": "Traffic weather", "area": "Uusimaa",
+            "severity": "Minor", "urgency": "Future", "certainty": "Possible",
+        }),
+    ]
+
+
+def test_rejection_reasons():
+    """Warnings below a minimum, or with an unwanted event, are rejected."""
+    wind, fire, traffic = make_warnings()
+
+    severe = WarningFilter(min_severity="Severe")
+    assert severe.rejection(wind) == "severity"
+    assert severe.accepts(fire)
+
+    assert WarningFilter(min_urgency="Expected").rejection(traffic) == "urgency"
+    assert WarningFilter(min_certainty="Likely").rejection(traffic) == "certainty"
+    assert WarningFilter(min_certainty="Likely").accepts(wind)
+
+    # Events are compared case-insensitively in every language
+    allow = warning_filter({"allow_events": "forest fire warning, maa-alueiden tuulivaroitus"})
+    assert allow.accepts(wind) and allow.accepts(fire)
+    assert allow.rejection(traffic) == "event"
+    deny = warning_filter({"deny_events": "Traffic weather"})
+    assert deny.rejection(traffic) == "event"
+    assert deny.accepts(wind)
+
+    # The defaults of the config flow filter nothing
+    assert not warning_filter({"min_severity": "any", "allow_events": ""})
+
+    stats = severe.stats(make_warnings())
+    assert stats == {
+        "evaluated": 3,
+        "passed": 1,
+        "rejected": {"severity": 2, "urgency": 0, "certainty": 0, "event": 0},
+        "pass_ratio": 0.333,
+    }
+
+
+def test_match_warnings_excludes_rejected_entries():
+    """Entries never match warnings their filter rejects."""
+    warnings = make_warnings()
+    matcher = MultiAreaMatcher({"severe": "Uusimaa", "all": "Uusimaa"})
+    geo_matcher = GeoMatcher({}, {})
+    prefilter = MultiWarningFilter({
+        "severe": WarningFilter(min_severity="Severe"),
+        "all": WarningFilter(),
+    })
+
+    matches, area_matches = match_warnings(matcher, geo_matcher, warnings, prefilter)
+    assert matches == [
+        frozenset({"all"}),
+        frozenset({"severe", "all"}),
+        frozenset({"all"}),
+    ]
+    assert area_matches[0] == {("all", "Uusimaa")}
+    # Without filters every entry matches
+    matches, _ = match_warnings(matcher, geo_matcher, warnings)
+    assert matches == [frozenset({"severe", "all"})] * 3
+
+
+def test_match_warnings_skips_warnings_nobody_wants():
+    """Warnings every entry rejects are not matched at all."""
+    warnings = make_warnings()
+
+    class CountingMatcher(MultiAreaMatcher):
+        matched = []
+
+        def match_all_areas(self, warnings):
+            self.matched.extend(warning.id for warning in warnings)
+            return super().match_all_areas(warnings)
+
+    matcher = CountingMatcher({"a": "Uusimaa", "b": ""})
+    prefilter = MultiWarningFilter({
+        "a": WarningFilter(min_severity="Severe"),
+        "b": WarningFilter(deny_events=frozenset({"wind warning for land areas"})),
+    })
+
+    matches, _ = match_warnings(matcher, GeoMatcher({}, {}), warnings, prefilter)
+    assert CountingMatcher.matched == ["fire", "traffic"]
+    assert matches == [frozenset(), frozenset({"a", "b"}), frozenset({"b"})]